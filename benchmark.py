@@ -0,0 +1,991 @@
+"""
+BeeGame - Banco de pruebas de rendimiento (sin interfaz gráfica).
+Genera escenarios reproducibles y mide los motores de decisión.
+
+Uso:
+    python benchmark.py modos --profundidad 2 --semillas 5
+    python benchmark.py tt --profundidad 3
+    python benchmark.py poda --profundidad 3
+    python benchmark.py profundizacion --deadlines 50 200 1000
+    python benchmark.py ordenacion --profundidad 3 --semillas 8
+    python benchmark.py paralelo --procesos 1 2 4 8 16
+    python benchmark.py arbol --turnos 8 --profundidad 4 5
+    python benchmark.py muestreo --muestras 2 4 8 --profundidad 4
+    python benchmark.py azar --profundidad 4 --pesticidas 0 2
+    python benchmark.py mcts --iteraciones 250 1000 4000
+    python benchmark.py heuristica --filas 30 --columnas 30 --flores 200
+    python benchmark.py cache --rondas 2 --max-entradas 50000
+    python benchmark.py tablero --tamaños 9 100 --densidad 0.15   (requiere numpy)
+    python benchmark.py copias --tamaños 9 100 --copias 200
+    python benchmark.py bitboard --tamaños 9 16 32
+    python benchmark.py indice --tamaños 50 100 200
+    python benchmark.py limpieza --tamaños 50 200 --muertes 0 5
+    python benchmark.py disperso --tamaños 500 2000 --flores 5000
+    python benchmark.py ruta --tamaños 50 200 --ruido 0.5 2
+    python benchmark.py jps --tamaños 100 500 --densidades 0 0.1 0.3
+    python benchmark.py rutas --tamaños 9 30 100 --partidas 10
+    python benchmark.py jugadas --tamaños 50 100 200 --profundidad 3
+    python benchmark.py reduccion --profundidad 4 --semillas 5 --k 4
+"""
+
+import argparse
+import copy
+import os
+import pickle
+import random
+import time
+import tracemalloc
+
+from src.board import Board
+from src.board_disperso import BoardDisperso
+from src.bee import Bee
+from src.humanidad import Humanidad
+from src.chance_events import ChanceEvents
+from src.expectimax import ExpectimaxAI, GameState
+from src.zobrist import TablaTransposicion
+from src.ordenacion import OrdenadorAcciones
+from src.paralelo import BusquedaParalela
+from src.arbol import ArbolBusqueda
+from src.muestreo import MuestreoAzar
+from src.mcts import MCTSAI
+from src.heuristica import Heuristica
+from src.cache_evaluacion import CacheEvaluacion
+from src.bitboard import Bitboard, codificar
+from src.campos import TablaVecinos
+from src.rutas import MatrizRutas, PilotoAbeja, PlanificadorRecorrido
+from src.reduccion import ReductorObstaculos
+
+
+def crear_escenario(semilla, filas=9, columnas=9, num_flores=12, num_obstaculos=2, clase_tablero=Board):
+    """Crea un estado inicial reproducible equivalente al de la GUI."""
+    random.seed(semilla)
+    tablero = clase_tablero(filas, columnas)
+    tablero.inicializar_tablero(num_flores=num_flores, num_obstaculos=num_obstaculos)
+
+    pos_abeja = (tablero.pos_colmena[0] - 1, tablero.pos_colmena[1])
+    return GameState(tablero, Bee(vida=50), pos_abeja, Humanidad(), ChanceEvents(), 1)
+
+
+def medir_decision(ai, estado, semilla):
+    """Ejecuta una decisión de la Humanidad y retorna (accion, valor, nodos, segundos)."""
+    random.seed(semilla)
+    inicio = time.perf_counter()
+    accion = ai.get_mejor_accion_humanidad(estado)
+    segundos = time.perf_counter() - inicio
+    return accion, ai.valor_mejor_accion, ai.nodos_explorados, segundos
+
+
+def comparar_modos(args):
+    """Compara el modo 'deshacer' con el modo de referencia 'clonar'."""
+    print(f"{'semilla':>7} {'nodos':>8} {'clonar(ms)':>11} {'deshacer(ms)':>13} {'x':>6}  valores")
+    for semilla in range(args.semillas):
+        resultados = {}
+        for modo in ExpectimaxAI.MODOS:
+            estado = crear_escenario(semilla, args.filas, args.columnas)
+            ai = ExpectimaxAI(max_depth=args.profundidad, modo=modo)
+            resultados[modo] = medir_decision(ai, estado, semilla)
+
+        _, v_ref, nodos, t_ref = resultados['clonar']
+        _, v_rap, _, t_rap = resultados['deshacer']
+        coincide = "OK" if v_ref == v_rap else f"DIFERENTE ({v_ref} != {v_rap})"
+        print(f"{semilla:>7} {nodos:>8} {t_ref * 1000:>11.1f} {t_rap * 1000:>13.1f} "
+              f"{t_ref / max(t_rap, 1e-9):>6.1f}  {coincide}")
+
+
+def comparar_tabla_transposicion(args):
+    """Nodos explorados y tiempo con y sin tabla de transposición (mismos valores)."""
+    print(f"{'semilla':>7} {'nodos':>8} {'nodos TT':>9} {'aciertos':>9} {'ms':>8} {'ms TT':>8}  valores")
+    totales = [0, 0, 0.0, 0.0]
+    for semilla in range(args.semillas):
+        estado = crear_escenario(semilla, args.filas, args.columnas)
+        ai = ExpectimaxAI(max_depth=args.profundidad, poda=args.poda)
+        _, v_base, n_base, t_base = medir_decision(ai, estado, semilla)
+
+        tabla = TablaTransposicion(args.capacidad)
+        ai = ExpectimaxAI(max_depth=args.profundidad, tabla_transposicion=tabla, poda=args.poda)
+        _, v_tt, n_tt, t_tt = medir_decision(ai, estado, semilla)
+
+        for i, medida in enumerate((n_base, n_tt, t_base, t_tt)):
+            totales[i] += medida
+        coincide = "OK" if v_base == v_tt else f"DIFERENTE ({v_base} != {v_tt})"
+        print(f"{semilla:>7} {n_base:>8} {n_tt:>9} {tabla.tasa_aciertos() * 100:>8.0f}% "
+              f"{t_base * 1000:>8.1f} {t_tt * 1000:>8.1f}  {coincide}")
+    print(f"{'total':>7} {totales[0]:>8} {totales[1]:>9} {'':>9} {totales[2] * 1000:>8.1f} {totales[3] * 1000:>8.1f}")
+
+
+def comparar_poda(args):
+    """Nodos explorados con y sin poda alfa-beta/Star1 sobre las mismas semillas."""
+    print(f"{'semilla':>7} {'nodos':>8} {'nodos poda':>11} {'%':>5} {'ms':>8} {'ms poda':>8}  decision")
+    for semilla in range(args.semillas):
+        estado = crear_escenario(semilla, args.filas, args.columnas)
+        a_base, v_base, n_base, t_base = medir_decision(ExpectimaxAI(max_depth=args.profundidad), estado, semilla)
+        ai = ExpectimaxAI(max_depth=args.profundidad, poda=True)
+        a_poda, v_poda, n_poda, t_poda = medir_decision(ai, estado, semilla)
+
+        coincide = "OK" if (a_base, v_base) == (a_poda, v_poda) else f"DIFERENTE ({a_base} != {a_poda})"
+        print(f"{semilla:>7} {n_base:>8} {n_poda:>11} {n_poda / n_base * 100:>4.0f}% "
+              f"{t_base * 1000:>8.1f} {t_poda * 1000:>8.1f}  {coincide}")
+
+
+def medir_profundizacion(args):
+    """Latencia real y profundidad alcanzada por la búsqueda anytime según el presupuesto."""
+    print(f"{'deadline':>8} {'semilla':>7} {'prof':>5} {'nodos':>8} {'ms':>8}  accion")
+    for deadline in args.deadlines:
+        for semilla in range(args.semillas):
+            estado = crear_escenario(semilla, args.filas, args.columnas)
+            ai = ExpectimaxAI(max_depth=args.profundidad, tabla_transposicion=TablaTransposicion(), poda=True)
+            random.seed(semilla)
+            inicio = time.perf_counter()
+            accion = ai.get_mejor_accion_humanidad(estado, deadline_ms=deadline)
+            ms = (time.perf_counter() - inicio) * 1000
+            print(f"{deadline:>8} {semilla:>7} {ai.profundidad_alcanzada:>5} {ai.nodos_explorados:>8} {ms:>8.1f}  {accion}")
+
+
+def comparar_ordenacion(args):
+    """Nodos necesarios para llegar a la misma decisión con y sin ordenación de jugadas."""
+    print(f"{'semilla':>7} {'aleatorio':>10} {'ordenado':>9} {'%':>5}  decision")
+    total_base = total_orden = 0
+    for semilla in range(args.semillas):
+        estado = crear_escenario(semilla, args.filas, args.columnas)
+        _, v_base, n_base, _ = medir_decision(ExpectimaxAI(max_depth=args.profundidad, poda=True), estado, semilla)
+
+        ordenador = OrdenadorAcciones(determinista=True)
+        ai = ExpectimaxAI(max_depth=args.profundidad, poda=True, ordenador=ordenador)
+        _, v_orden, n_orden, _ = medir_decision(ai, estado, semilla)
+
+        total_base += n_base
+        total_orden += n_orden
+        coincide = "OK" if v_base == v_orden else f"DIFERENTE ({v_base} != {v_orden})"
+        print(f"{semilla:>7} {n_base:>10} {n_orden:>9} {n_orden / n_base * 100:>4.0f}%  {coincide}")
+    print(f"{'total':>7} {total_base:>10} {total_orden:>9} {total_orden / total_base * 100:>4.0f}%")
+
+
+def medir_paralelo(args):
+    """Aceleración de la búsqueda paralela en la raíz según el número de procesos."""
+    estados = [crear_escenario(s, args.filas, args.columnas) for s in range(args.semillas)]
+    # Con más procesos que núcleos la aceleración medida no dice nada del reparto
+    print(f"núcleos disponibles: {os.cpu_count()}")
+    print(f"{'procesos':>8} {'ms':>9} {'aceleracion':>11} {'prof':>5}  decisiones")
+    referencia = None
+    for num in args.procesos:
+        busqueda = BusquedaParalela(max_depth=args.profundidad, num_procesos=num)
+        # Calentamos el pool para no medir el arranque de los procesos
+        busqueda.get_mejor_accion_humanidad(estados[0], deadline_ms=args.deadline)
+
+        inicio = time.perf_counter()
+        decisiones = []
+        profundidades = []
+        for semilla, estado in enumerate(estados):
+            random.seed(semilla)
+            accion = busqueda.get_mejor_accion_humanidad(estado, deadline_ms=args.deadline)
+            decisiones.append((accion, busqueda.valor_mejor_accion))
+            profundidades.append(busqueda.profundidad_alcanzada)
+        ms = (time.perf_counter() - inicio) * 1000
+        busqueda.cerrar()
+
+        if referencia is None:
+            referencia = (ms, decisiones)
+        coincide = "OK" if decisiones == referencia[1] else "DIFERENTES"
+        print(f"{num:>8} {ms:>9.1f} {referencia[0] / ms:>10.2f}x {min(profundidades):>5}  {coincide}")
+
+
+def simular_turno(modelo, estado, accion_humanidad, rng):
+    """
+    Avanza un turno completo con la semántica del motor: jugada de la Humanidad,
+    clima sorteado (solo en los turnos con evento) y una jugada de la Abeja al azar.
+    """
+    estado, _ = modelo._aplicar_accion_humanidad(estado, accion_humanidad)
+    if estado.eventos_azar.debe_activar_evento(estado.turno):
+        climas, probabilidades = zip(*modelo._escenarios_clima(estado))
+        estado, _ = modelo._aplicar_evento_clima(estado, rng.choices(climas, probabilidades)[0])
+    acciones = modelo._get_acciones_abeja(estado)
+    if acciones:
+        estado, _ = modelo._aplicar_accion_abeja(estado, rng.choice(sorted(acciones)))
+    return estado
+
+
+def medir_arbol(args):
+    """
+    Partida simulada con el motor de la GUI (TT, poda, ordenación y profundización
+    iterativa), con y sin reutilización del árbol: nodos y tiempo por turno,
+    nodos promovidos, aciertos del árbol y si la decisión coincide.
+    """
+    for profundidad in args.profundidad:
+        print(f"profundidad {profundidad}")
+        print(f"{'semilla':>7} {'turno':>5} {'nodos':>8} {'nodos arbol':>12} {'ms':>8} {'ms arbol':>9} "
+              f"{'promovidos':>10} {'aciertos':>9}  decision")
+        totales = [0, 0, 0.0, 0.0]
+        promociones = fallidas = 0
+        for semilla in range(args.semillas):
+            modelo = ExpectimaxAI(modo='clonar')
+            motores = {}
+            for con_arbol in (False, True):
+                arbol = ArbolBusqueda(args.max_nodos) if con_arbol else None
+                motores[con_arbol] = ExpectimaxAI(max_depth=profundidad, tabla_transposicion=TablaTransposicion(),
+                                                  poda=True, ordenador=OrdenadorAcciones(determinista=True),
+                                                  arbol=arbol)
+            arbol = motores[True].arbol
+
+            rng = random.Random(semilla)
+            estado = crear_escenario(semilla, args.filas, args.columnas)
+            for turno in range(args.turnos):
+                if modelo._es_terminal(estado):
+                    break
+                acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja, barajar=False)
+                if not acciones:
+                    break
+                resultados = {}
+                for con_arbol, ai in motores.items():
+                    inicio = time.perf_counter()
+                    # Sin límite real: todas las iteraciones se completan y los nodos son comparables
+                    accion = ai.get_mejor_accion_humanidad(estado, acciones, deadline_ms=10 ** 7)
+                    resultados[con_arbol] = (accion, ai.valor_mejor_accion, ai.nodos_explorados,
+                                             time.perf_counter() - inicio)
+
+                (a_base, v_base, n_base, t_base), (a_arbol, v_arbol, n_arbol, t_arbol) = resultados[False], resultados[True]
+                totales[0] += n_base
+                totales[1] += n_arbol
+                totales[2] += t_base
+                totales[3] += t_arbol
+                if a_base == a_arbol and v_base == v_arbol:
+                    coincide = "OK"
+                elif v_base == v_arbol:
+                    coincide = "EMPATE"
+                else:
+                    coincide = f"DIFERENTE ({v_base} != {v_arbol})"
+                print(f"{semilla:>7} {turno:>5} {n_base:>8} {n_arbol:>12} {t_base * 1000:>8.1f} {t_arbol * 1000:>9.1f} "
+                      f"{arbol.nodos_promovidos:>10} {arbol.tasa_aciertos() * 100:>8.0f}%  {coincide}")
+                estado = simular_turno(modelo, estado, a_base, rng)
+            promociones += arbol.promociones
+            fallidas += arbol.promociones_fallidas
+
+        print(f"{'total':>7} {'':>5} {totales[0]:>8} {totales[1]:>12} {totales[2] * 1000:>8.1f} {totales[3] * 1000:>9.1f}"
+              f"  nodos {totales[1] / max(totales[0], 1) * 100:.0f}%,"
+              f" promociones con éxito {(promociones - fallidas) / max(promociones, 1) * 100:.0f}%")
+
+
+def comparar_muestreo(args):
+    """
+    Modelo exacto de clima frente a nodos de azar muestreados (clima + reproducción).
+    El estado raíz empieza en cada turno de `--turnos`: solo hay nodos que muestrear
+    si el calendario de eventos cae dentro del horizonte.
+    """
+    print(f"{'semilla':>7} {'turno':>5} {'k':>6} {'nodos':>8} {'ms':>8} {'valor':>9} {'muestras':>9} "
+          f"{'var media':>10} {'var max':>9}  accion")
+    for semilla in range(args.semillas):
+        for turno in args.turnos:
+            estado = crear_escenario(semilla, args.filas, args.columnas)
+            estado.turno = turno
+            ai = ExpectimaxAI(max_depth=args.profundidad, tabla_transposicion=TablaTransposicion(), poda=True)
+            accion, valor, nodos, segundos = medir_decision(ai, estado, semilla)
+            print(f"{semilla:>7} {turno:>5} {'exacto':>6} {nodos:>8} {segundos * 1000:>8.1f} {valor:>9.1f} "
+                  f"{'':>9} {'':>10} {'':>9}  {accion}")
+
+            for k in args.muestras:
+                muestreo = MuestreoAzar(muestras=k, tolerancia=args.tolerancia)
+                ai = ExpectimaxAI(max_depth=args.profundidad, tabla_transposicion=TablaTransposicion(), poda=True,
+                                  muestreo=muestreo)
+                accion, valor, nodos, segundos = medir_decision(ai, estado, semilla)
+                # Sin nodos muestreados la fila repetiría la exacta: no mediría nada
+                assert muestreo.muestras_por_nodo() > 0, (
+                    f"ningún nodo de azar muestreado desde el turno {turno} a profundidad {args.profundidad}")
+                print(f"{semilla:>7} {turno:>5} {k:>6} {nodos:>8} {segundos * 1000:>8.1f} {valor:>9.1f} "
+                      f"{muestreo.muestras_por_nodo():>9.2f} {muestreo.varianza_promedio():>10.2f} "
+                      f"{muestreo.varianza_maxima:>9.2f}  {accion}")
+
+
+def comparar_fusion_azar(args):
+    """Nodos con los tres climas enumerados frente a climas equivalentes fusionados (mismo valor)."""
+    print(f"{'semilla':>7} {'turno':>5} {'pest':>4} {'nodos':>8} {'fusion':>8} {'%':>5}  valores")
+    for semilla in range(args.semillas):
+        for turno in args.turnos:
+            for pesticidas in args.pesticidas:
+                estado = crear_escenario(semilla, args.filas, args.columnas)
+                estado.turno = turno
+                for _, flor in estado.tablero.flores[:pesticidas]:
+                    flor.aplicar_pesticida()
+
+                resultados = {}
+                for fusionar in (False, True):
+                    ai = ExpectimaxAI(max_depth=args.profundidad, tabla_transposicion=TablaTransposicion(),
+                                      poda=True, fusionar_azar=fusionar)
+                    resultados[fusionar] = medir_decision(ai, estado, semilla)
+
+                _, v_ref, n_ref, _ = resultados[False]
+                _, v_fus, n_fus, _ = resultados[True]
+                coincide = "OK" if abs(v_ref - v_fus) < 1e-6 else f"DIFERENTE ({v_ref} != {v_fus})"
+                print(f"{semilla:>7} {turno:>5} {pesticidas:>4} {n_ref:>8} {n_fus:>8} "
+                      f"{n_fus / n_ref * 100:>4.0f}%  {coincide}")
+
+
+def medir_mcts(args):
+    """
+    Decisión de MCTS según el presupuesto de iteraciones, frente a Expectimax como referencia.
+    La pérdida es el valor Expectimax de la jugada de MCTS menos el de la mejor jugada
+    (la Humanidad minimiza: 0 si elige una jugada óptima para la referencia).
+    """
+    print(f"{'semilla':>7} {'motor':>12} {'nodos':>8} {'prof':>5} {'ms':>8} {'valor':>9} {'pérdida':>8}  accion")
+    coincidencias = {iteraciones: 0 for iteraciones in args.iteraciones}
+    perdidas = {iteraciones: [] for iteraciones in args.iteraciones}
+    for semilla in range(args.semillas):
+        estado = crear_escenario(semilla, args.filas, args.columnas)
+        ai = ExpectimaxAI(max_depth=args.profundidad, tabla_transposicion=TablaTransposicion(), poda=True)
+        referencia, valor_referencia, nodos, segundos = medir_decision(ai, estado, semilla)
+        print(f"{semilla:>7} {'expectimax':>12} {nodos:>8} {args.profundidad:>5} {segundos * 1000:>8.1f} "
+              f"{valor_referencia:>9.1f} {0.0:>8.1f}  {referencia}")
+
+        for iteraciones in args.iteraciones:
+            mcts = MCTSAI(iteraciones=iteraciones, semilla=semilla)
+            accion, valor, nodos, segundos = medir_decision(mcts, estado, semilla)
+            coincidencias[iteraciones] += accion == referencia
+            # Valor de la jugada de MCTS para la referencia (la raíz con una sola jugada es exacta)
+            ai.get_mejor_accion_humanidad(estado, acciones=[accion])
+            perdida = ai.valor_mejor_accion - valor_referencia
+            perdidas[iteraciones].append(perdida)
+            print(f"{semilla:>7} {f'mcts {iteraciones}':>12} {nodos:>8} {mcts.profundidad_alcanzada:>5} "
+                  f"{segundos * 1000:>8.1f} {valor:>9.1f} {perdida:>8.1f}  {accion}")
+
+    for iteraciones, total in coincidencias.items():
+        print(f"mcts {iteraciones}: coincide con Expectimax en {total}/{args.semillas}, "
+              f"pérdida media {sum(perdidas[iteraciones]) / args.semillas:.1f}, "
+              f"máxima {max(perdidas[iteraciones]):.1f}")
+
+
+def comparar_heuristica(args):
+    """
+    Evaluación incremental (agregados del tablero y campos de distancia) frente al
+    recálculo completo a lo largo de partidas aleatorias: mismos agregados, mismo
+    valor salvo el redondeo de la suma de amenaza, y coste por evaluación.
+    """
+    incremental, referencia = Heuristica(incremental=True), Heuristica(incremental=False)
+    print(f"{'semilla':>7} {'evaluaciones':>12} {'us ref':>8} {'us inc':>8} {'x':>6} {'dif max':>9}  valores")
+    for semilla in range(args.semillas):
+        rng = random.Random(semilla)
+        modelo = ExpectimaxAI(modo='clonar')
+        estado = crear_escenario(semilla, args.filas, args.columnas, num_flores=args.flores)
+        t_ref = t_inc = 0.0
+        evaluaciones = 0
+        dif_max = 0.0
+        coincide = "OK"
+
+        for jugada in range(args.jugadas):
+            if modelo._es_terminal(estado):
+                break
+            # Ciclo completo con la semántica del motor: Humanidad, Entorno (clima + reproducción) y Abeja
+            acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja, barajar=False)
+            if acciones:
+                estado, _ = modelo._aplicar_accion_humanidad(estado, rng.choice(acciones))
+            estado, _ = modelo._aplicar_muestra_azar(estado, rng)
+            acciones = modelo._get_acciones_abeja(estado)
+            if acciones:
+                estado, _ = modelo._aplicar_accion_abeja(estado, rng.choice(acciones))
+
+            for _ in range(args.repeticiones):
+                inicio = time.perf_counter()
+                v_ref = referencia.evaluar(estado)
+                medio = time.perf_counter()
+                v_inc = incremental.evaluar(estado)
+                t_ref += medio - inicio
+                t_inc += time.perf_counter() - medio
+                evaluaciones += 1
+            dif_max = max(dif_max, abs(v_ref - v_inc))
+            if (abs(v_ref - v_inc) > 1e-9 * max(1.0, abs(v_ref)) or
+                    estado.tablero.agregados() != estado.tablero.calcular_agregados()):
+                coincide = f"DIFERENTE en la jugada {jugada} ({v_ref} != {v_inc})"
+
+        print(f"{semilla:>7} {evaluaciones:>12} {t_ref / evaluaciones * 1e6:>8.1f} "
+              f"{t_inc / evaluaciones * 1e6:>8.1f} {t_ref / max(t_inc, 1e-12):>6.2f} {dif_max:>9.1e}  {coincide}")
+
+
+def medir_cache_evaluacion(args):
+    """
+    Lote de decisiones repetido `rondas` veces con una caché de evaluación compartida
+    frente a la heurística sin caché: mismos valores, aciertos y desalojos por ronda.
+    """
+    cache = CacheEvaluacion(max_entradas=args.max_entradas, max_bytes=args.max_bytes)
+    print(f"{'ronda':>5} {'ms':>9} {'ms cache':>9} {'aciertos':>9} {'desalojos':>9} {'entradas':>9} {'KiB':>8}  valores")
+    for ronda in range(args.rondas):
+        t_base = t_cache = 0.0
+        coincide = "OK"
+        aciertos, fallos, desalojos = cache.aciertos, cache.fallos, cache.desalojos
+        for semilla in range(args.semillas):
+            estado = crear_escenario(semilla, args.filas, args.columnas)
+            ai = ExpectimaxAI(max_depth=args.profundidad, tabla_transposicion=TablaTransposicion(), poda=True)
+            _, v_base, _, segundos = medir_decision(ai, estado, semilla)
+            t_base += segundos
+
+            ai = ExpectimaxAI(max_depth=args.profundidad, heuristica=cache,
+                              tabla_transposicion=TablaTransposicion(), poda=True)
+            _, v_cache, _, segundos = medir_decision(ai, estado, semilla)
+            t_cache += segundos
+            if v_base != v_cache:
+                coincide = f"DIFERENTE en la semilla {semilla} ({v_base} != {v_cache})"
+
+        consultas = (cache.aciertos - aciertos) + (cache.fallos - fallos)
+        print(f"{ronda:>5} {t_base * 1000:>9.1f} {t_cache * 1000:>9.1f} "
+              f"{(cache.aciertos - aciertos) / max(consultas, 1) * 100:>8.0f}% {cache.desalojos - desalojos:>9} "
+              f"{cache.num_entradas():>9} {cache.bytes_usados / 1024:>8.0f}  {coincide}")
+
+
+def _cronometrar(funcion, repeticiones):
+    """Microsegundos por llamada."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1e6
+
+
+def comparar_tableros(args):
+    """
+    Board (listas de objetos) frente a BoardNumpy (arrays): copia del tablero,
+    consulta de obstáculo en todas las celdas, agregados desde cero y una
+    búsqueda en modo 'clonar' (debe dar el mismo valor con ambos).
+    """
+    from src.board_numpy import BoardNumpy
+
+    print(f"{'tamaño':>7} {'tablero':>10} {'copia(us)':>10} {'obst(us)':>9} {'agreg(us)':>10} {'busqueda(ms)':>13}  valores")
+    for lado in args.tamaños:
+        num_flores = max(1, int(lado * lado * args.densidad))
+        num_obstaculos = max(2, lado * lado // 50)
+        valores = {}
+        for clase in (Board, BoardNumpy):
+            estado = crear_escenario(0, lado, lado, num_flores, num_obstaculos, clase_tablero=clase)
+            tablero = estado.tablero
+            copia = _cronometrar(lambda: copy.deepcopy(tablero), args.repeticiones)
+            obstaculos = _cronometrar(lambda: [tablero.es_obstaculo(f, c) for f in range(lado) for c in range(lado)],
+                                      max(1, args.repeticiones // 10))
+            agregados = _cronometrar(tablero.calcular_agregados, args.repeticiones)
+
+            ai = ExpectimaxAI(max_depth=args.profundidad, modo='clonar')
+            _, valor, _, segundos = medir_decision(ai, estado, 0)
+            valores[clase] = valor
+            print(f"{lado:>7} {clase.__name__:>10} {copia:>10.1f} {obstaculos:>9.0f} {agregados:>10.1f} "
+                  f"{segundos * 1000:>13.1f}  {valor}")
+        coincide = "OK" if valores[Board] == valores[BoardNumpy] else "DIFERENTE"
+        print(f"{'':>7} {'':>10} valores {coincide}")
+
+
+def medir_copias(args):
+    """
+    Memoria y velocidad de `GameState.clonar` (copia explícita con configuración
+    compartida): KiB por estado copiado y copias por segundo.
+    """
+    print(f"{'tamaño':>7} {'flores':>7} {'KiB/estado':>11} {'copias/s':>10}")
+    for lado in args.tamaños:
+        num_flores = max(1, int(lado * lado * args.densidad))
+        estado = crear_escenario(0, lado, lado, num_flores, max(2, lado * lado // 50))
+
+        tracemalloc.start()
+        antes = tracemalloc.get_traced_memory()[0]
+        copias = [estado.clonar() for _ in range(args.copias)]
+        memoria = (tracemalloc.get_traced_memory()[0] - antes) / args.copias
+        tracemalloc.stop()
+        del copias
+
+        inicio = time.perf_counter()
+        for _ in range(args.copias):
+            estado.clonar()
+        por_segundo = args.copias / (time.perf_counter() - inicio)
+        print(f"{lado:>7} {num_flores:>7} {memoria / 1024:>11.1f} {por_segundo:>10.0f}")
+
+
+def comparar_bitboard(args):
+    """
+    Consultas sobre un `Bitboard` (construido una vez) frente a las del tablero:
+    jugadas de la Humanidad, vecinos de la abeja (buscando la tabla de su tamaño
+    frente a las máscaras que el tablero ya tiene) y consulta de obstáculo en todas las
+    celdas, en microsegundos por llamada. También el tamaño serializado de
+    `codificar` frente a `GameState.compactar`.
+    """
+    print(f"{'tamaño':>7} {'jugadas':>8} {'humanidad us':>13} {'bits us':>8} {'vecinos us':>11} {'bits us':>8} "
+          f"{'obstac. us':>11} {'bits us':>8} {'compactar B':>12} {'codificar B':>12}")
+    for lado in args.tamaños:
+        estado = crear_escenario(0, lado, lado, max(1, lado * lado // 7), max(2, lado * lado // 50))
+        tablero, humanidad, abeja, pos = estado.tablero, estado.humanidad, estado.abeja, estado.pos_abeja
+        celdas = [(f, c) for f in range(lado) for c in range(lado)]
+        bits = Bitboard.desde_tablero(tablero)
+
+        def medir(jugadas, vecinos, es_obstaculo):
+            return (_cronometrar(jugadas, args.repeticiones),
+                    _cronometrar(vecinos, args.repeticiones),
+                    _cronometrar(lambda: [es_obstaculo(f, c) for f, c in celdas], max(1, args.repeticiones // 10)))
+
+        tablero_us = medir(lambda: humanidad.obtener_acciones_validas(tablero, pos, barajar=False),
+                           lambda: list(TablaVecinos.para(lado, lado).vecinos(pos)), tablero.es_obstaculo)
+        bits_us = medir(lambda: bits.acciones_humanidad(pos, tablero.pos_colmena, humanidad.radio_pesticida,
+                                                        humanidad.radio_obstaculo),
+                        lambda: abeja.obtener_vecinos(tablero, pos), bits.es_obstaculo)
+
+        jugadas = len(humanidad.obtener_acciones_validas(tablero, pos, barajar=False))
+        print(f"{lado:>7} {jugadas:>8} {tablero_us[0]:>13.1f} {bits_us[0]:>8.1f} {tablero_us[1]:>11.2f} "
+              f"{bits_us[1]:>8.2f} {tablero_us[2]:>11.0f} {bits_us[2]:>8.0f} "
+              f"{len(pickle.dumps(estado.compactar())):>12} {len(pickle.dumps(codificar(estado))):>12}")
+
+
+def comparar_indice_espacial(args):
+    """
+    Jugadas de la Humanidad en tableros grandes (sin bitboard): índice espacial
+    frente al recorrido de todas las flores y celdas candidatas. Microsegundos
+    por llamada, promediando varias posiciones de la abeja.
+    """
+    print(f"{'tamaño':>7} {'flores':>7} {'jugadas':>8} {'recorrido us':>13} {'indice us':>10} {'x':>6}  iguales")
+    for lado in args.tamaños:
+        num_flores = max(1, int(lado * lado * args.densidad))
+        estado = crear_escenario(0, lado, lado, num_flores, max(2, lado * lado // 50))
+        tablero, humanidad = estado.tablero, estado.humanidad
+        rng = random.Random(0)
+        posiciones = [(rng.randrange(lado), rng.randrange(lado)) for _ in range(args.posiciones)]
+
+        iguales = all(humanidad._acciones_por_recorrido(tablero, pos) ==
+                      humanidad.obtener_acciones_validas(tablero, pos, barajar=False) for pos in posiciones)
+        jugadas = sum(len(humanidad.obtener_acciones_validas(tablero, pos, barajar=False))
+                      for pos in posiciones) / len(posiciones)
+        repeticiones = max(1, args.repeticiones // len(posiciones))
+        t_recorrido = _cronometrar(lambda: [humanidad._acciones_por_recorrido(tablero, pos)
+                                            for pos in posiciones], repeticiones) / len(posiciones)
+        t_indice = _cronometrar(lambda: [humanidad.obtener_acciones_validas(tablero, pos, barajar=False)
+                                         for pos in posiciones], repeticiones) / len(posiciones)
+        print(f"{lado:>7} {num_flores:>7} {jugadas:>8.1f} {t_recorrido:>13.1f} {t_indice:>10.1f} "
+              f"{t_recorrido / t_indice:>6.1f}  {'OK' if iguales else 'DIFERENTE'}")
+
+
+def medir_limpieza(args):
+    """
+    Coste por turno de `Board.incrementar_turno` (retirada de flores muertas)
+    matando `muertes` flores vivas al azar en cada turno.
+    """
+    print(f"{'tamaño':>7} {'flores':>7} {'muertes':>8} {'us/turno':>9}")
+    for lado in args.tamaños:
+        for muertes in args.muertes:
+            estado = crear_escenario(0, lado, lado, max(1, int(lado * lado * args.densidad)), 2)
+            tablero = estado.tablero
+            rng = random.Random(0)
+            flores = len(tablero.flores)
+            total = 0.0
+            for _ in range(args.turnos):
+                vivas = tablero.get_flores_vivas()
+                for _, flor in rng.sample(vivas, min(muertes, len(vivas))):
+                    flor.matar()
+                inicio = time.perf_counter()
+                tablero.incrementar_turno()
+                total += time.perf_counter() - inicio
+            print(f"{lado:>7} {flores:>7} {muertes:>8} {total / args.turnos * 1e6:>9.1f}")
+
+
+def comparar_disperso(args):
+    """
+    Memoria y tiempo de `inicializar_tablero` del tablero denso frente al
+    disperso por trozos, más el coste de consultar celdas al azar.
+    """
+    print(f"{'tamaño':>7} {'tablero':>14} {'init(ms)':>9} {'memoria(KiB)':>13} {'trozos':>7} {'get_celda(ns)':>14}")
+    for lado in args.tamaños:
+        for clase in (Board, BoardDisperso):
+            if clase is Board and lado > args.max_denso:
+                continue
+            random.seed(0)
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            tablero = clase(lado, lado)
+            tablero.inicializar_tablero(num_flores=args.flores, num_obstaculos=args.obstaculos)
+            ms = (time.perf_counter() - inicio) * 1000
+            memoria = tracemalloc.get_traced_memory()[0] / 1024
+            tracemalloc.stop()
+
+            rng = random.Random(1)
+            celdas = [(rng.randrange(lado), rng.randrange(lado)) for _ in range(args.consultas)]
+            inicio = time.perf_counter()
+            for f, c in celdas:
+                tablero.get_celda(f, c)
+            ns = (time.perf_counter() - inicio) / args.consultas * 1e9
+            trozos = tablero.num_trozos() if clase is BoardDisperso else "-"
+            print(f"{lado:>7} {clase.__name__:>14} {ms:>9.1f} {memoria:>13.0f} {trozos:>7} {ns:>14.0f}")
+
+
+def comparar_rutas(args):
+    """
+    Ruta de la esquina a la colmena: A* de referencia (copia el camino en cada
+    entrada) frente al A* con punteros al padre, y el descenso por el campo de
+    distancias de la colmena (`metodo="campo"`, con ruido < 1; se mide aparte el
+    cálculo del campo, que se reutiliza mientras no cambien los obstáculos).
+    """
+    print(f"{'tamaño':>7} {'ruido':>6} {'pasos':>6} {'referencia(ms)':>15} {'padres(ms)':>11} "
+          f"{'campo(ms)':>10} {'descenso(ms)':>13}")
+    for lado in args.tamaños:
+        estado = crear_escenario(0, lado, lado, max(1, lado * lado // 8), lado * lado // 5)
+        tablero, abeja = estado.tablero, estado.abeja
+        inicio = next((f, c) for f in range(lado) for c in range(lado) if tablero.es_transitable(f, c))
+        objetivo = tablero.pos_colmena
+        for ruido in args.ruido:
+            random.seed(0)
+            referencia = _cronometrar(lambda: abeja._a_star_referencia(tablero, inicio, objetivo, ruido),
+                                      args.repeticiones)
+            padres = _cronometrar(lambda: abeja._a_star(tablero, inicio, objetivo, ruido), args.repeticiones)
+            pasos = len(abeja._a_star(tablero, inicio, objetivo, ruido)) - 1
+            campo = descenso = "-"
+            if ruido < 1:
+                tablero._campo_colmena = None
+                campo = f"{_cronometrar(tablero.campo_colmena, 1) / 1000:.2f}"
+                descenso = _cronometrar(lambda: abeja.calcular_ruta_a_colmena(tablero, inicio, ruido, "campo"),
+                                        args.repeticiones)
+                descenso = f"{descenso / 1000:.3f}"
+            print(f"{lado:>7} {ruido:>6} {pasos:>6} {referencia / 1000:>15.2f} {padres / 1000:>11.2f} "
+                  f"{campo:>10} {descenso:>13}")
+
+
+def comparar_jps(args):
+    """
+    Jump Point Search frente a A* de la esquina a la colmena: celdas o puntos
+    de salto expandidos y latencia, por tamaño y densidad de obstáculos. Aparte,
+    el cálculo de las líneas de obstáculos (una vez mientras no cambien).
+    """
+    print(f"{'tamaño':>7} {'densidad':>9} {'pasos':>6} {'A* nodos':>9} {'A* ms':>8} {'JPS nodos':>10} "
+          f"{'JPS ms':>8} {'líneas ms':>10}")
+    for lado in args.tamaños:
+        for densidad in args.densidades:
+            random.seed(0)
+            tablero = BoardDisperso(lado, lado)
+            tablero.inicializar_tablero(num_flores=max(1, int(lado * lado * args.flores)),
+                                        num_obstaculos=int(lado * lado * densidad))
+            abeja = Bee(factor_a_star=args.ruido)
+            inicio = next((f, c) for f in range(lado) for c in range(lado) if tablero.es_transitable(f, c))
+            objetivo = tablero.pos_colmena
+            lineas_ms = _cronometrar(tablero.lineas_obstaculos, 1) / 1000
+            resultados = []
+            for buscar in (abeja._a_star, abeja._jps):
+                estadisticas = {}
+                random.seed(0)
+                ruta = buscar(tablero, inicio, objetivo, args.ruido, estadisticas)
+                ms = _cronometrar(lambda: buscar(tablero, inicio, objetivo, args.ruido), args.repeticiones) / 1000
+                resultados.append((len(ruta) - 1, estadisticas['expandidos'], ms))
+            (pasos, nodos_a, ms_a), (_, nodos_j, ms_j) = resultados
+            print(f"{lado:>7} {densidad:>9} {pasos:>6} {nodos_a:>9} {ms_a:>8.2f} {nodos_j:>10} "
+                  f"{ms_j:>8.2f} {lineas_ms:>10.2f}")
+
+
+def medir_rutas(args):
+    """
+    Matriz de rutas: construcción (un BFS por origen: colmena y flores vivas),
+    corrección tras cambiar un obstáculo frente a reconstruirla, y tiempo del
+    planificador de recorridos. Después, partidas de la abeja automática contra
+    una Humanidad al azar en el tablero de 9x9.
+    """
+    print(f"{'tamaño':>7} {'origenes':>9} {'construir ms':>13} {'corregir us':>12} {'reconstruir us':>15} "
+          f"{'planificar us':>14}")
+    for lado in args.tamaños:
+        estado = crear_escenario(0, lado, lado, max(1, lado * lado // 7), max(2, lado * lado // 20))
+        tablero, abeja, pos = estado.tablero, estado.abeja, estado.pos_abeja
+        origenes = [tablero.pos_colmena] + [p for p, _ in tablero.get_flores_vivas()][:63]
+
+        def construir():
+            matriz = MatrizRutas(tablero)
+            for origen in origenes:
+                matriz.campo(origen)
+            return matriz
+
+        construir_ms = _cronometrar(construir, 3) / 1000
+        tablero._rutas = construir()
+        rng = random.Random(0)
+        vacias = [(f, c) for f in range(lado) for c in range(lado) if tablero.get_celda(f, c) is None]
+        celdas = rng.sample(vacias, min(len(vacias), args.cambios))
+
+        inicio = time.perf_counter()
+        for celda in celdas:
+            tablero.colocar_obstaculo(*celda)
+            for origen in origenes:
+                tablero.matriz_rutas().campo(origen)
+            tablero.quitar_obstaculo(*celda)
+            for origen in origenes:
+                tablero.matriz_rutas().campo(origen)
+        corregir = (time.perf_counter() - inicio) / (2 * len(celdas)) * 1e6
+
+        planificador = PlanificadorRecorrido()
+        planificar = _cronometrar(lambda: planificador.planificar(tablero, abeja, pos), args.repeticiones)
+        print(f"{lado:>7} {len(origenes):>9} {construir_ms:>13.2f} {corregir:>12.1f} {construir_ms * 1000:>15.1f} "
+              f"{planificar:>14.1f}")
+
+    modelo = ExpectimaxAI()
+    print(f"\n{'semilla':>7} {'turnos':>7} {'miel':>5} {'recorridos':>11} {'us/decision':>12}")
+    for semilla in range(args.partidas):
+        rng = random.Random(semilla)
+        estado = crear_escenario(semilla)
+        piloto = PilotoAbeja()
+        turnos = recorridos = 0
+        segundos = 0.0
+        while not modelo._es_terminal(estado) and turnos < args.max_turnos:
+            acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja, barajar=False)
+            if acciones:
+                estado, _ = modelo._aplicar_accion_humanidad(estado, rng.choice(acciones))
+            climas, probabilidades = zip(*modelo._escenarios_clima(estado))
+            estado, _ = modelo._aplicar_evento_clima(estado, rng.choices(climas, probabilidades)[0])
+            inicio = time.perf_counter()
+            accion = piloto.siguiente_accion(estado)
+            segundos += time.perf_counter() - inicio
+            recorridos += accion[0] == 'descargar'
+            estado, _ = modelo._aplicar_accion_abeja(estado, accion)
+            turnos += 1
+        print(f"{semilla:>7} {turnos:>7} {estado.tablero.nectar_en_colmena:>5} {recorridos:>11} "
+              f"{segundos / max(1, turnos) * 1e6:>12.1f}")
+
+
+def comparar_jugadas(args):
+    """
+    Generador de jugadas de la Humanidad en tableros grandes: candidatas de la
+    colmena mantenidas por el tablero frente a recalcular los dos cuadrados en
+    cada llamada (y frente al recorrido de referencia), en microsegundos por
+    llamada. Después, una decisión de la Humanidad con poda usando cada vía.
+    """
+    print(f"{'tamaño':>7} {'jugadas':>8} {'recorrido us':>13} {'radio us':>9} {'generador us':>13} "
+          f"{'busq. radio ms':>15} {'busq. gen. ms':>14}  iguales")
+    generador = Humanidad.iterar_acciones
+    for lado in args.tamaños:
+        estado = crear_escenario(0, lado, lado, max(1, lado * lado // 7), max(2, lado * lado // 50))
+        tablero, humanidad = estado.tablero, estado.humanidad
+        rng = random.Random(0)
+        posiciones = [(rng.randrange(lado), rng.randrange(lado)) for _ in range(args.posiciones)]
+        posiciones = [pos for pos in posiciones if pos != tablero.pos_colmena]
+
+        iguales = all(humanidad._acciones_por_recorrido(tablero, pos) ==
+                      humanidad._acciones_por_radio(tablero, pos) ==
+                      humanidad.obtener_acciones_validas(tablero, pos, barajar=False) for pos in posiciones)
+        jugadas = sum(len(humanidad.obtener_acciones_validas(tablero, pos, barajar=False))
+                      for pos in posiciones) / len(posiciones)
+        repeticiones = max(1, args.repeticiones // len(posiciones))
+        tiempos = [_cronometrar(lambda: [funcion(tablero, pos) for pos in posiciones],
+                                repeticiones) / len(posiciones)
+                   for funcion in (humanidad._acciones_por_recorrido, humanidad._acciones_por_radio,
+                                   lambda t, pos: humanidad.obtener_acciones_validas(t, pos, barajar=False))]
+
+        decisiones = []
+        for iterar in (lambda self, t, pos: iter(self._acciones_por_radio(t, pos)), generador):
+            Humanidad.iterar_acciones = iterar
+            try:
+                decisiones.append(medir_decision(ExpectimaxAI(max_depth=args.profundidad, poda=True), estado, 0))
+            finally:
+                Humanidad.iterar_acciones = generador
+        (a_radio, v_radio, _, t_radio), (a_gen, v_gen, _, t_gen) = decisiones
+        iguales = iguales and (a_radio, v_radio) == (a_gen, v_gen)
+        print(f"{lado:>7} {jugadas:>8.1f} {tiempos[0]:>13.1f} {tiempos[1]:>9.1f} {tiempos[2]:>13.1f} "
+              f"{t_radio * 1000:>15.1f} {t_gen * 1000:>14.1f}  {'OK' if iguales else 'DIFERENTE'}")
+
+
+def comparar_reduccion(args):
+    """
+    Decisión de la Humanidad con poda sin reducir, con la reducción exacta y
+    con la top-k: nodos, milisegundos, jugadas por nodo MIN (recibidas ->
+    buscadas) y si el valor coincide con la búsqueda completa.
+    """
+    print(f"{'semilla':>7} {'modo':>8} {'nodos':>8} {'ms':>8} {'jugadas/MIN':>12}  valor")
+    totales = {}
+    for semilla in range(args.semillas):
+        estado = crear_escenario(semilla, args.filas, args.columnas)
+        base = None
+        for nombre, reductor in (('completa', None), ('exacto', ReductorObstaculos('exacto')),
+                                 ('top_k', ReductorObstaculos('top_k', args.k))):
+            ai = ExpectimaxAI(max_depth=args.profundidad, poda=True, reductor=reductor)
+            accion, valor, nodos, segundos = medir_decision(ai, estado, semilla)
+            if base is None:
+                base = valor
+            ramas = ""
+            if reductor is not None and reductor.nodos:
+                ramas = f"{reductor.jugadas / reductor.nodos:.1f} -> {reductor.representantes / reductor.nodos:.1f}"
+            coincide = "OK" if abs(valor - base) < 1e-9 else f"{valor - base:+.1f}"
+            print(f"{semilla:>7} {nombre:>8} {nodos:>8} {segundos * 1000:>8.1f} {ramas:>12}  {coincide}")
+            suma = totales.setdefault(nombre, [0, 0.0])
+            suma[0] += nodos
+            suma[1] += segundos
+    for nombre, (nodos, segundos) in totales.items():
+        print(f"{'total':>7} {nombre:>8} {nodos:>8} {segundos * 1000:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de BeeGame")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_modos = sub.add_parser("modos", help="Clonado profundo vs aplicar/deshacer en Expectimax")
+    p_modos.add_argument("--profundidad", type=int, default=2)
+    p_modos.add_argument("--semillas", type=int, default=5)
+    p_modos.add_argument("--filas", type=int, default=9)
+    p_modos.add_argument("--columnas", type=int, default=9)
+    p_modos.set_defaults(func=comparar_modos)
+
+    p_tt = sub.add_parser("tt", help="Efecto de la tabla de transposición Zobrist")
+    p_tt.add_argument("--profundidad", type=int, default=3)
+    p_tt.add_argument("--semillas", type=int, default=3)
+    p_tt.add_argument("--filas", type=int, default=9)
+    p_tt.add_argument("--columnas", type=int, default=9)
+    p_tt.add_argument("--capacidad", type=int, default=1 << 16)
+    p_tt.add_argument("--poda", action="store_true", help="Ambas búsquedas con poda alfa-beta/Star1")
+    p_tt.set_defaults(func=comparar_tabla_transposicion)
+
+    p_poda = sub.add_parser("poda", help="Búsqueda con poda alfa-beta/Star1 frente a la completa")
+    p_poda.add_argument("--profundidad", type=int, default=3)
+    p_poda.add_argument("--semillas", type=int, default=3)
+    p_poda.add_argument("--filas", type=int, default=9)
+    p_poda.add_argument("--columnas", type=int, default=9)
+    p_poda.set_defaults(func=comparar_poda)
+
+    p_prof = sub.add_parser("profundizacion", help="Profundización iterativa con límite de tiempo")
+    p_prof.add_argument("--deadlines", type=int, nargs="+", default=[50, 200, 1000])
+    p_prof.add_argument("--profundidad", type=int, default=6, help="Profundidad tope")
+    p_prof.add_argument("--semillas", type=int, default=3)
+    p_prof.add_argument("--filas", type=int, default=9)
+    p_prof.add_argument("--columnas", type=int, default=9)
+    p_prof.set_defaults(func=medir_profundizacion)
+
+    p_orden = sub.add_parser("ordenacion", help="Ordenación de jugadas (estática + historia + killers)")
+    p_orden.add_argument("--profundidad", type=int, default=3)
+    p_orden.add_argument("--semillas", type=int, default=8)
+    p_orden.add_argument("--filas", type=int, default=9)
+    p_orden.add_argument("--columnas", type=int, default=9)
+    p_orden.set_defaults(func=comparar_ordenacion)
+
+    p_par = sub.add_parser("paralelo", help="Búsqueda paralela en la raíz (pool de procesos)")
+    p_par.add_argument("--procesos", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    p_par.add_argument("--profundidad", type=int, default=4)
+    p_par.add_argument("--deadline", type=int, default=None, help="ms por decisión (profundización iterativa)")
+    p_par.add_argument("--semillas", type=int, default=4)
+    p_par.add_argument("--filas", type=int, default=9)
+    p_par.add_argument("--columnas", type=int, default=9)
+    p_par.set_defaults(func=medir_paralelo)
+
+    p_arbol = sub.add_parser("arbol", help="Reutilización del árbol de búsqueda entre turnos")
+    p_arbol.add_argument("--turnos", type=int, default=8)
+    p_arbol.add_argument("--profundidad", type=int, nargs="+", default=[4])
+    p_arbol.add_argument("--semillas", type=int, default=3)
+    p_arbol.add_argument("--max-nodos", type=int, default=200000)
+    p_arbol.add_argument("--filas", type=int, default=9)
+    p_arbol.add_argument("--columnas", type=int, default=9)
+    p_arbol.set_defaults(func=medir_arbol)
+
+    p_muestreo = sub.add_parser("muestreo", help="Nodos de azar por muestreo disperso (clima + reproducción)")
+    p_muestreo.add_argument("--muestras", type=int, nargs="+", default=[2, 4, 8], help="k máximo por nodo")
+    p_muestreo.add_argument("--tolerancia", type=float, default=1.0, help="Error estándar para parar antes")
+    p_muestreo.add_argument("--turnos", type=int, nargs="+", default=[3],
+                            help="Turno del estado raíz (debe alcanzar un turno con evento)")
+    p_muestreo.add_argument("--profundidad", type=int, default=4)
+    p_muestreo.add_argument("--semillas", type=int, default=3)
+    p_muestreo.add_argument("--filas", type=int, default=9)
+    p_muestreo.add_argument("--columnas", type=int, default=9)
+    p_muestreo.set_defaults(func=comparar_muestreo)
+
+    p_azar = sub.add_parser("azar", help="Fusión de resultados de azar equivalentes")
+    p_azar.add_argument("--turnos", type=int, nargs="+", default=[3, 4], help="Turno del estado raíz")
+    p_azar.add_argument("--pesticidas", type=int, nargs="+", default=[0, 2],
+                        help="Flores con pesticida (la lluvia solo cambia el tablero si hay alguna)")
+    p_azar.add_argument("--profundidad", type=int, default=4)
+    p_azar.add_argument("--semillas", type=int, default=2)
+    p_azar.add_argument("--filas", type=int, default=9)
+    p_azar.add_argument("--columnas", type=int, default=9)
+    p_azar.set_defaults(func=comparar_fusion_azar)
+
+    p_mcts = sub.add_parser("mcts", help="MCTS con nodos de azar según el presupuesto de iteraciones")
+    p_mcts.add_argument("--iteraciones", type=int, nargs="+", default=[250, 1000, 4000, 16000])
+    p_mcts.add_argument("--profundidad", type=int, default=4, help="Profundidad de la referencia Expectimax")
+    p_mcts.add_argument("--semillas", type=int, default=4)
+    p_mcts.add_argument("--filas", type=int, default=9)
+    p_mcts.add_argument("--columnas", type=int, default=9)
+    p_mcts.set_defaults(func=medir_mcts)
+
+    p_heur = sub.add_parser("heuristica", help="Heurística incremental frente al recálculo completo")
+    p_heur.add_argument("--jugadas", type=int, default=200)
+    p_heur.add_argument("--repeticiones", type=int, default=5, help="Evaluaciones por estado visitado")
+    p_heur.add_argument("--flores", type=int, default=12)
+    p_heur.add_argument("--semillas", type=int, default=3)
+    p_heur.add_argument("--filas", type=int, default=9)
+    p_heur.add_argument("--columnas", type=int, default=9)
+    p_heur.set_defaults(func=comparar_heuristica)
+
+    p_cache = sub.add_parser("cache", help="Caché LRU de evaluaciones en un lote repetido")
+    p_cache.add_argument("--rondas", type=int, default=2, help="Repeticiones del mismo lote")
+    p_cache.add_argument("--max-entradas", type=int, default=1 << 17)
+    p_cache.add_argument("--max-bytes", type=int, default=None)
+    p_cache.add_argument("--profundidad", type=int, default=4)
+    p_cache.add_argument("--semillas", type=int, default=4)
+    p_cache.add_argument("--filas", type=int, default=9)
+    p_cache.add_argument("--columnas", type=int, default=9)
+    p_cache.set_defaults(func=medir_cache_evaluacion)
+
+    p_tablero = sub.add_parser("tablero", help="Tablero de listas frente al de arrays de NumPy")
+    p_tablero.add_argument("--tamaños", type=int, nargs="+", default=[9, 100], help="Lado del tablero")
+    p_tablero.add_argument("--densidad", type=float, default=0.15, help="Fracción de celdas con flor")
+    p_tablero.add_argument("--repeticiones", type=int, default=200)
+    p_tablero.add_argument("--profundidad", type=int, default=2)
+    p_tablero.set_defaults(func=comparar_tableros)
+
+    p_copias = sub.add_parser("copias", help="Memoria y velocidad de la copia de estados")
+    p_copias.add_argument("--tamaños", type=int, nargs="+", default=[9, 100], help="Lado del tablero")
+    p_copias.add_argument("--densidad", type=float, default=0.15, help="Fracción de celdas con flor")
+    p_copias.add_argument("--copias", type=int, default=200)
+    p_copias.set_defaults(func=medir_copias)
+
+    p_bits = sub.add_parser("bitboard", help="Consultas con bitboard frente a las del tablero")
+    p_bits.add_argument("--tamaños", type=int, nargs="+", default=[9, 16, 32], help="Lado del tablero (<= 32)")
+    p_bits.add_argument("--repeticiones", type=int, default=2000)
+    p_bits.set_defaults(func=comparar_bitboard)
+
+    p_indice = sub.add_parser("indice", help="Índice espacial para las jugadas de la Humanidad")
+    p_indice.add_argument("--tamaños", type=int, nargs="+", default=[50, 100, 200], help="Lado del tablero")
+    p_indice.add_argument("--densidad", type=float, default=0.15, help="Fracción de celdas con flor")
+    p_indice.add_argument("--posiciones", type=int, default=20, help="Posiciones de la abeja")
+    p_indice.add_argument("--repeticiones", type=int, default=400)
+    p_indice.set_defaults(func=comparar_indice_espacial)
+
+    p_limpieza = sub.add_parser("limpieza", help="Retirada de flores muertas por turno")
+    p_limpieza.add_argument("--tamaños", type=int, nargs="+", default=[50, 200], help="Lado del tablero")
+    p_limpieza.add_argument("--densidad", type=float, default=0.15, help="Fracción de celdas con flor")
+    p_limpieza.add_argument("--muertes", type=int, nargs="+", default=[0, 5], help="Flores que mueren por turno")
+    p_limpieza.add_argument("--turnos", type=int, default=200)
+    p_limpieza.set_defaults(func=medir_limpieza)
+
+    p_disperso = sub.add_parser("disperso", help="Tablero denso frente al disperso por trozos en mapas grandes")
+    p_disperso.add_argument("--tamaños", type=int, nargs="+", default=[500, 2000], help="Lado del tablero")
+    p_disperso.add_argument("--flores", type=int, default=5000)
+    p_disperso.add_argument("--obstaculos", type=int, default=2000)
+    p_disperso.add_argument("--consultas", type=int, default=100000)
+    p_disperso.add_argument("--max-denso", type=int, default=2000, help="Lado máximo para medir el tablero denso")
+    p_disperso.set_defaults(func=comparar_disperso)
+
+    p_ruta = sub.add_parser("ruta", help="A* con punteros al padre y campo de distancias a la colmena")
+    p_ruta.add_argument("--tamaños", type=int, nargs="+", default=[50, 200], help="Lado del tablero")
+    p_ruta.add_argument("--ruido", type=float, nargs="+", default=[0.5, 2.0], help="factor_a_star")
+    p_ruta.add_argument("--repeticiones", type=int, default=20)
+    p_ruta.set_defaults(func=comparar_rutas)
+
+    p_jps = sub.add_parser("jps", help="Jump Point Search frente a A* en tableros abiertos")
+    p_jps.add_argument("--tamaños", type=int, nargs="+", default=[100, 500], help="Lado del tablero")
+    p_jps.add_argument("--densidades", type=float, nargs="+", default=[0.0, 0.1, 0.3],
+                       help="Fracción de celdas con obstáculo")
+    p_jps.add_argument("--flores", type=float, default=0.01, help="Fracción de celdas con flor")
+    p_jps.add_argument("--ruido", type=float, default=0.5, help="factor_a_star")
+    p_jps.add_argument("--repeticiones", type=int, default=3)
+    p_jps.set_defaults(func=comparar_jps)
+
+    p_rutas = sub.add_parser("rutas", help="Matriz de rutas, planificador de recorridos y abeja automática")
+    p_rutas.add_argument("--tamaños", type=int, nargs="+", default=[9, 30, 100], help="Lado del tablero")
+    p_rutas.add_argument("--cambios", type=int, default=50, help="Obstáculos colocados y retirados")
+    p_rutas.add_argument("--repeticiones", type=int, default=20)
+    p_rutas.add_argument("--partidas", type=int, default=5)
+    p_rutas.add_argument("--max-turnos", type=int, default=300)
+    p_rutas.set_defaults(func=medir_rutas)
+
+    p_jugadas = sub.add_parser("jugadas", help="Generador incremental de jugadas de la Humanidad")
+    p_jugadas.add_argument("--tamaños", type=int, nargs="+", default=[50, 100, 200], help="Lado del tablero (> 32)")
+    p_jugadas.add_argument("--posiciones", type=int, default=20, help="Posiciones de la abeja")
+    p_jugadas.add_argument("--profundidad", type=int, default=3)
+    p_jugadas.add_argument("--repeticiones", type=int, default=400)
+    p_jugadas.set_defaults(func=comparar_jugadas)
+
+    p_reduccion = sub.add_parser("reduccion", help="Reducción de obstáculos equivalentes en los nodos MIN")
+    p_reduccion.add_argument("--profundidad", type=int, default=4)
+    p_reduccion.add_argument("--semillas", type=int, default=5)
+    p_reduccion.add_argument("--k", type=int, default=4, help="Celdas al alcance de la abeja en el modo top-k")
+    p_reduccion.add_argument("--filas", type=int, default=9)
+    p_reduccion.add_argument("--columnas", type=int, default=9)
+    p_reduccion.set_defaults(func=comparar_reduccion)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
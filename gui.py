@@ -15,8 +15,15 @@ from src.bee import Bee
 from src.humanidad import Humanidad
 from src.chance_events import ChanceEvents
 from src.expectimax import ExpectimaxAI, GameState
+from src.zobrist import TablaTransposicion
+from src.ordenacion import OrdenadorAcciones
+from src.ponder import MotorPonderacion
+from src.paralelo import BusquedaParalela
+from src.mcts import MCTSAI
 from src.heuristica import Heuristica
+from src.cache_evaluacion import CacheEvaluacion
 from src.game_manager import GameManager
+from src.rutas import PilotoAbeja
 
 # === CONFIGURACIÓN Y CONSTANTES VISUALES ===
 
@@ -64,7 +71,7 @@ C_BOTON_BORDE = (200, 200, 200)
 class BeeGameGUI:
     """Clase principal que maneja la ventana, eventos y bucle del juego."""
 
-    def __init__(self, filas=9, columnas=9, nectar_objetivo=100):
+    def __init__(self, filas=9, columnas=9, nectar_objetivo=100, procesos_ia=1, mcts=False, piloto=False):
         pygame.init()
         self.clock = pygame.time.Clock()
 
@@ -87,6 +94,13 @@ class BeeGameGUI:
         self.filas_init = filas
         self.columnas_init = columnas
         self.nectar_objetivo_init = nectar_objetivo
+        # Procesos para la búsqueda de la Humanidad (1 = secuencial; ver BusquedaParalela)
+        self.procesos_ia = procesos_ia
+        # MCTS experimental: con el presupuesto por turno aún no coincide con Expectimax
+        # de forma fiable (ver `benchmark.py mcts`), así que solo entra en la rotación si se pide
+        self.mcts_habilitado = mcts
+        # Abeja automática (PilotoAbeja): activa desde el inicio con `piloto`, se alterna con la tecla P
+        self.piloto_inicial = piloto
         self._inicializar_juego()
 
     def _inicializar_fuentes(self):
@@ -106,6 +120,12 @@ class BeeGameGUI:
 
     def _inicializar_juego(self):
         """Reinicia todos los componentes y estados del juego."""
+        # Paramos la ponderación de la partida anterior antes de sustituir el estado
+        if hasattr(self, 'ponderacion'):
+            self.ponderacion.detener()
+        if getattr(self, 'busqueda_paralela', None) is not None:
+            self.busqueda_paralela.cerrar()
+
         # Entidades
         self.board = Board(self.filas_init, self.columnas_init)
         self.board.inicializar_tablero(num_flores=12, num_obstaculos=2)
@@ -120,7 +140,26 @@ class BeeGameGUI:
 
         # IAs
         self.heuristica = Heuristica()
-        self.ai = ExpectimaxAI(max_depth=2, heuristica=self.heuristica, nectar_objetivo=self.nectar_objetivo_init)
+        # Caché de hojas compartida por los motores del hilo principal (se conserva entre turnos)
+        self.cache_evaluacion = CacheEvaluacion(self.heuristica)
+        self.tabla_transposicion = TablaTransposicion()
+        # Profundización iterativa: max_depth es el tope y presupuesto_ia_ms el límite por turno
+        self.presupuesto_ia_ms = 300
+        self.ai = ExpectimaxAI(max_depth=4, heuristica=self.cache_evaluacion, nectar_objetivo=self.nectar_objetivo_init,
+                               tabla_transposicion=self.tabla_transposicion, poda=True,
+                               ordenador=OrdenadorAcciones())
+        # Opcional: la misma búsqueda repartida por acciones raíz entre procesos
+        self.busqueda_paralela = None
+        if self.procesos_ia > 1:
+            self.busqueda_paralela = BusquedaParalela(max_depth=4, heuristica=self.heuristica,
+                                                      nectar_objetivo=self.nectar_objetivo_init, poda=True,
+                                                      num_procesos=self.procesos_ia)
+        # Búsqueda especulativa de la respuesta de la Humanidad durante el turno del jugador
+        self.ponderacion = MotorPonderacion(max_depth=4, heuristica=self.heuristica,
+                                            nectar_objetivo=self.nectar_objetivo_init,
+                                            deadline_por_jugada_ms=self.presupuesto_ia_ms)
+        # Alternativa a Expectimax: MCTS con el mismo presupuesto de tiempo (el tope de iteraciones no limita)
+        self.mcts = MCTSAI(iteraciones=10 ** 6, heuristica=self.cache_evaluacion, nectar_objetivo=self.nectar_objetivo_init)
         self.q_agent = QLearningAI(alpha=0.5, gamma=0.9, epsilon=0.3)
 
         # Estado UI/Control
@@ -136,9 +175,11 @@ class BeeGameGUI:
 
         # Configuración IA
         self.usar_expectimax = True
+        self.usar_mcts = False
         self.usar_qlearning = False
         self.calculando_ia = False
         self.nodos_explorados = 0
+        self.profundidad_ia = 0
         self.tiempo_calculo_ia = 0
         self.ia_error = [0]
         self.error_semantic = [0]
@@ -150,6 +191,9 @@ class BeeGameGUI:
         self.timer_a_star = 0
         self.velocidad_a_star = 10
         self.factor_random = 0.5
+        self.piloto = PilotoAbeja()
+        self.piloto_activo = self.piloto_inicial
+        self.timer_piloto = 0
 
         self.mostrar_evento_clima = False
         self.mensaje_evento_clima = ""
@@ -158,6 +202,7 @@ class BeeGameGUI:
         self.mostrar_tooltip_clima = False
 
         self.botones = self._crear_rectangulos_botones()
+        self._iniciar_ponderacion()
 
     def _crear_rectangulos_botones(self):
         """Define la geometría de los botones."""
@@ -275,6 +320,32 @@ class BeeGameGUI:
         else:
             self.mensaje = "No se encontró ruta o ya estás en casa."
 
+    def alternar_piloto(self):
+        self.piloto_activo = not self.piloto_activo
+        self.timer_piloto = 0
+        self.mensaje = f"Abeja automática {'activada' if self.piloto_activo else 'desactivada'}."
+
+    def _jugar_piloto(self):
+        """Juega el turno de la abeja con la acción del piloto, con las mismas reglas que los botones."""
+        estado = GameState(self.board, self.abeja, self.pos_abeja,
+                           self.humanidad_agente, self.eventos_azar, self.turno)
+        tipo, destino = self.piloto.siguiente_accion(estado)
+        turno = self.turno
+        if tipo == 'mover':
+            self.mover_abeja(destino)
+        elif tipo == 'recoger':
+            self.celda_seleccionada = destino
+            self.recoger_nectar()
+        elif tipo == 'descargar':
+            miel = self.abeja.nectar_cargado
+            self.abeja.descargar_nectar_en_colmena(self.board, destino)
+            self.abeja.recuperar_energia_en_colmena(self.board, destino)
+            self.mensaje = f"¡En casa! Recuperado. Miel: +{miel}"
+            self.finalizar_turno_jugador()
+        # Si la acción no se pudo jugar (o es descansar) se descansa: el turno no se queda bloqueado
+        if self.turno == turno and not self.game_over:
+            self.accion_descansar()
+
     def finalizar_turno_jugador(self):
         self.turno_jugador = False
         self.turno_humanidad()
@@ -283,6 +354,7 @@ class BeeGameGUI:
 
     def turno_humanidad(self):
         if self.game_over: return
+        self.ponderacion.detener()
         self.turno += 1
 
         acciones = self.humanidad_agente.obtener_acciones_validas(self.board, self.pos_abeja)
@@ -293,6 +365,8 @@ class BeeGameGUI:
 
         if self.usar_expectimax:
             accion_realizada = self._ejecutar_logica_expectimax(acciones)
+        elif self.usar_mcts:
+            accion_realizada = self._ejecutar_logica_mcts(acciones)
         elif self.usar_qlearning:
             accion_realizada = self._ejecutar_logica_qlearning(acciones)
         else:
@@ -318,20 +392,18 @@ class BeeGameGUI:
         # Calculamos la valoración superficial (sin pensar) del estado actual
         valor_estatico = self.heuristica.evaluar(estado_base)
 
-        mejor_accion = None
-        peor_valor_para_abeja = float('inf')
-
-        for accion in acciones:
-            estado_sim = estado_base.clonar()
-            estado_sim.humanidad.ejecutar_accion(estado_sim.tablero, accion, estado_sim.pos_abeja)
-
-            valor = self.ai._expectimax(estado_sim, 0, 'CHANCE')
-
-            if valor < peor_valor_para_abeja:
-                peor_valor_para_abeja = valor
-                mejor_accion = accion
+        # Si la jugada del jugador fue ponderada, la respuesta ya está calculada
+        ponderado = self.ponderacion.consultar(estado_base)
+        if ponderado is not None and ponderado[0] in acciones:
+            mejor_accion, peor_valor_para_abeja, self.profundidad_ia = ponderado
+            self.nodos_explorados = 0
+        else:
+            motor = self.busqueda_paralela if self.busqueda_paralela is not None else self.ai
+            mejor_accion = motor.get_mejor_accion_humanidad(estado_base, acciones, deadline_ms=self.presupuesto_ia_ms)
+            peor_valor_para_abeja = motor.valor_mejor_accion
 
-        self.nodos_explorados = self.ai.nodos_explorados
+            self.nodos_explorados = motor.nodos_explorados
+            self.profundidad_ia = motor.profundidad_alcanzada
 
         if mejor_accion:
             self._aplicar_accion_humanidad(mejor_accion, "Expectimax")
@@ -344,6 +416,24 @@ class BeeGameGUI:
             return True
         return False
 
+    def _ejecutar_logica_mcts(self, acciones):
+        if not acciones: return False
+
+        estado_base = GameState(self.board, self.abeja, self.pos_abeja,
+                                self.humanidad_agente, self.eventos_azar, self.turno)
+        valor_estatico = self.heuristica.evaluar(estado_base)
+
+        mejor_accion = self.mcts.get_mejor_accion_humanidad(estado_base, acciones, deadline_ms=self.presupuesto_ia_ms)
+        self.nodos_explorados = self.mcts.nodos_explorados
+        self.profundidad_ia = self.mcts.profundidad_alcanzada
+
+        if mejor_accion:
+            self._aplicar_accion_humanidad(mejor_accion, "MCTS")
+            self.ia_error.append(abs(valor_estatico - self.mcts.valor_mejor_accion))
+            self._calcular_error_decision_humana(mejor_accion)
+            return True
+        return False
+
     def _ejecutar_logica_qlearning(self, acciones):
         self.nodos_explorados = 0
 
@@ -460,6 +550,14 @@ class BeeGameGUI:
             self.mensaje = msg
         else:
             self.turno_jugador = True
+            self._iniciar_ponderacion()
+
+    def _iniciar_ponderacion(self):
+        """Mientras el jugador piensa, precalculamos la respuesta de Expectimax a cada jugada."""
+        if self.usar_expectimax and not self.game_over:
+            estado = GameState(self.board, self.abeja, self.pos_abeja,
+                               self.humanidad_agente, self.eventos_azar, self.turno)
+            self.ponderacion.iniciar(estado)
 
     # === BUCLE PRINCIPAL Y EVENTOS ===
 
@@ -472,6 +570,8 @@ class BeeGameGUI:
                     running = False
                 elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                     running = False
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+                    self.alternar_piloto()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self._manejar_clic(event.button, pygame.mouse.get_pos())
 
@@ -484,6 +584,9 @@ class BeeGameGUI:
             pygame.display.flip()
             self.clock.tick(60)
 
+        self.ponderacion.detener()
+        if self.busqueda_paralela is not None:
+            self.busqueda_paralela.cerrar()
         pygame.quit()
         sys.exit()
 
@@ -515,10 +618,15 @@ class BeeGameGUI:
                         elif key == 'ir_a_la_colmena':
                             self.accion_volver_colmena_a_star()
                         elif key == 'cambiar_IA':
-                            self.usar_expectimax = not self.usar_expectimax
-                            self.usar_qlearning = not self.usar_expectimax
+                            # Rotación: Expectimax -> (MCTS ->) Q-Learning -> Expectimax
+                            if self.mcts_habilitado:
+                                self.usar_expectimax, self.usar_mcts, self.usar_qlearning = (
+                                    self.usar_qlearning, self.usar_expectimax, self.usar_mcts)
+                            else:
+                                self.usar_expectimax = not self.usar_expectimax
+                                self.usar_qlearning = not self.usar_expectimax
                             # Feedback visual inmediato o log
-                            self.mensaje = f"IA Cambiada a {'Expectimax' if self.usar_expectimax else 'Q-Learning'}"
+                            self.mensaje = f"IA Cambiada a {self._nombre_ia()}"
                         return
 
                 celda = self._obtener_coordenada_tablero(pos)
@@ -554,6 +662,13 @@ class BeeGameGUI:
                         self.abeja.recuperar_energia_en_colmena(self.board, self.pos_abeja)
                     self.finalizar_turno_jugador()
 
+        # Abeja automática: un turno cada `velocidad_a_star` fotogramas
+        elif self.piloto_activo and self.turno_jugador and not self.game_over:
+            self.timer_piloto += 1
+            if self.timer_piloto >= self.velocidad_a_star:
+                self.timer_piloto = 0
+                self._jugar_piloto()
+
         # Banner Clima
         if self.mostrar_evento_clima:
             self.timer_evento_clima += 1
@@ -823,15 +938,23 @@ class BeeGameGUI:
         pygame.draw.circle(self.screen, (150, 150, 255), self.help_clima_rect.center, 15)
         self.screen.blit(self.font_bold.render("?", True, (255, 255, 255)), (x + 319, y + 18))
 
+    def _nombre_ia(self):
+        if self.usar_expectimax: return "Expectimax"
+        if self.usar_mcts: return "MCTS"
+        return "Q-Learning"
+
     def dibujar_widget_ia(self, x, y):
         pygame.draw.rect(self.screen, (255, 255, 255), (x, y, 350, 70), border_radius=10)
-        t = "IA Expectimax" if self.usar_expectimax else "IA Q-Learning"
+        t = f"IA {self._nombre_ia()}"
         self.screen.blit(self.font_bold.render(t, True, C_TEXTO_PRINCIPAL), (x + 20, y+5))
 
         # Stats
         stats = f"Nodos: {self.nodos_explorados} | T: {self.tiempo_calculo_ia * 1000:.0f}ms | Err(IA): {mean(self.ia_error):.1f}"
         self.screen.blit(self.font_small.render(stats, True, C_TEXTO_SECUNDARIO), (x + 20, y + 32))
-        stats = f"Err(Sem): {mean(self.error_semantic):.1f}"
+        # La TT del motor secuencial no se usa si la búsqueda va por el pool de procesos
+        tt = "-" if self.busqueda_paralela is not None else f"{self.tabla_transposicion.tasa_aciertos() * 100:.0f}%"
+        stats = (f"Err(Sem): {mean(self.error_semantic):.1f} | TT: {tt}"
+                 f" | Prof: {self.profundidad_ia} | Pond: {self.ponderacion.aciertos}")
         self.screen.blit(self.font_small.render(stats, True, C_TEXTO_SECUNDARIO), (x + 20, y + 50))
 
     def dibujar_log(self, x, y):
@@ -0,0 +1,128 @@
+"""
+Reutilización del árbol de búsqueda entre turnos consecutivos.
+"""
+
+
+class ArbolBusqueda:
+    """
+    Árbol de búsqueda persistente entre turnos.
+
+    Cada nodo interno completado (MAX, MIN o CHANCE) se guarda por (hash, tipo)
+    con su profundidad restante, el tipo de cota de su valor y sus hijos: la
+    jugada o resultado de azar, el hash del hijo y el valor que devolvió.
+
+    Al empezar un turno, `promover(hash_raiz)` localiza el nodo del estado
+    observado (la jugada propia, el clima y la jugada de la abeja que realmente
+    ocurrieron: dos plies por debajo de cada respuesta a la jugada propia),
+    conserva solo el subárbol alcanzable desde él y descarta el resto.
+
+    No es una segunda tabla de transposición: los valores no cortan la
+    búsqueda en nodos internos. Se usan para
+        - explorar primero, en los nodos MAX/MIN guardados, la jugada que fue
+          mejor la vez anterior (el resto de valores suelen ser cotas de la
+          poda y no sirven para ordenar);
+        - saltarse en la raíz las iteraciones de profundización que el turno
+          anterior ya completó por debajo de ella (`resultado_raiz`).
+
+    Solo se guardan los nodos con profundidad restante >= `min_restante`: por
+    debajo, el coste de anotar y ordenar supera a lo que ahorra la ordenación.
+    La memoria está limitada a `max_nodos`: con el árbol lleno no se añaden
+    nodos nuevos hasta la siguiente promoción.
+    """
+
+    SIGUIENTE = {'MIN': 'CHANCE', 'CHANCE': 'MAX', 'MAX': 'MIN'}
+
+    def __init__(self, max_nodos=200000, min_restante=2):
+        self.max_nodos = max_nodos
+        # Las hojas no llevan hash: un nodo con restante 1 no sabría enlazar sus hijos
+        self.min_restante = max(2, min_restante)
+        self.nodos = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.descartados = 0
+        self.nodos_promovidos = 0
+        self.promociones = 0
+        self.promociones_fallidas = 0
+
+    def guardar(self, hash_nodo, tipo, restante, cota, hijos):
+        """`hijos`: lista de (jugada, hash_hijo, valor) en el orden en que se buscaron."""
+        clave = (hash_nodo, tipo)
+        previo = self.nodos.get(clave)
+        if previo is None:
+            if len(self.nodos) >= self.max_nodos:
+                self.descartados += 1
+                return
+        elif previo[0] > restante:
+            # Se conserva la información más profunda
+            return
+        self.nodos[clave] = (restante, cota, tuple(hijos))
+
+    def mejor_jugada(self, hash_nodo, tipo):
+        """Jugada con mejor valor guardado para el nodo (MAX o MIN), o None si no está en el árbol."""
+        nodo = self.nodos.get((hash_nodo, tipo))
+        if nodo is None or not nodo[2]:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return self._mejor(nodo[2], tipo)[0]
+
+    @staticmethod
+    def _mejor(hijos, tipo):
+        """A igual valor gana el hijo buscado antes (los siguientes pueden ser cotas)."""
+        if tipo == 'MAX':
+            return max(hijos, key=lambda hijo: hijo[2])
+        return min(hijos, key=lambda hijo: hijo[2])
+
+    def resultado_raiz(self, hash_nodo, tipo, acciones, exacto):
+        """
+        (restante, mejor_jugada, valor) del nodo si se guardó completo con valor
+        exacto (`exacto` es el código de cota exacta) y sus hijos son exactamente
+        `acciones`; si no, None.
+        """
+        nodo = self.nodos.get((hash_nodo, tipo))
+        if nodo is None or nodo[1] != exacto:
+            return None
+        restante, _, hijos = nodo
+        if not hijos or {jugada for jugada, _, _ in hijos} != set(acciones):
+            return None
+        jugada, _, valor = self._mejor(hijos, tipo)
+        return restante, jugada, valor
+
+    def promover(self, hash_raiz):
+        """
+        Conserva solo el subárbol que cuelga de los nodos con `hash_raiz`.
+        Retorna el número de nodos reutilizados (0 si el estado no estaba previsto).
+        """
+        pendientes = [(hash_raiz, tipo) for tipo in self.SIGUIENTE if (hash_raiz, tipo) in self.nodos]
+        conservados = {}
+        while pendientes:
+            clave = pendientes.pop()
+            if clave in conservados:
+                continue
+            nodo = self.nodos.get(clave)
+            if nodo is None:
+                continue
+            conservados[clave] = nodo
+            siguiente = self.SIGUIENTE[clave[1]]
+            pendientes.extend((hash_hijo, siguiente) for _, hash_hijo, _ in nodo[2])
+
+        self.nodos = conservados
+        self.promociones += 1
+        if not conservados:
+            self.promociones_fallidas += 1
+        self.nodos_promovidos = len(conservados)
+        return self.nodos_promovidos
+
+    def tasa_aciertos(self):
+        """Fracción de nodos MAX/MIN buscados cuyos hijos ya estaban en el árbol."""
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def tasa_promocion(self):
+        """Fracción de turnos en los que el árbol anterior contenía el estado observado."""
+        if not self.promociones:
+            return 0.0
+        return 1.0 - self.promociones_fallidas / self.promociones
+
+    def __len__(self):
+        return len(self.nodos)
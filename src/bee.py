@@ -1,31 +1,56 @@
 import heapq
 import random
+from .campos import DIRECCIONES, TablaVecinos
+from .config import ConfigAbeja, campo_config
 from .flower import Flower
 
 class Bee:
     """
     Representa a la abeja (MAX).
     Gestiona sus estadísticas vitales, inventario y movimiento.
+
+    Solo vida, energía y néctar cargado son estado propio; los máximos, costes
+    y el ruido de navegación viven en un `ConfigAbeja` compartido (se leen como
+    atributos de la abeja). `clonar` copia el estado y reutiliza la configuración.
     """
 
-    def __init__(self, vida=50, energia=60, capacidad_nectar=30, factor_a_star=0.5):
-        self.vida = vida
-        self.max_vida = vida
-        self.energia = energia
-        self.max_energia = energia
+    __slots__ = ('vida', 'energia', 'nectar_cargado', 'config')
+
+    max_vida = campo_config('max_vida')
+    max_energia = campo_config('max_energia')
+    capacidad_nectar = campo_config('capacidad_nectar')
+    daño_ataque = campo_config('daño_ataque')
+    coste_movimiento = campo_config('coste_movimiento')
+    coste_recoleccion = campo_config('coste_recoleccion')
+    nectar_por_flor = campo_config('nectar_por_flor')
+    factor_a_star = campo_config('factor_a_star')
+
+    def __init__(self, vida=50, energia=60, capacidad_nectar=30, factor_a_star=0.5, config=None):
+        if config is None:
+            # Costes y estadísticas por defecto
+            config = ConfigAbeja(max_vida=vida, max_energia=energia, capacidad_nectar=capacidad_nectar,
+                                 daño_ataque=10, coste_movimiento=5, coste_recoleccion=3, nectar_por_flor=10,
+                                 factor_a_star=factor_a_star)
+        self.config = config
+        self.vida = config.max_vida
+        self.energia = config.max_energia
 
         # Inventario
         self.nectar_cargado = 0
-        self.capacidad_nectar = capacidad_nectar
 
-        # Costes y estadísticas
-        self.daño_ataque = 10
-        self.coste_movimiento = 5
-        self.coste_recoleccion = 3
-        self.nectar_por_flor = 10
+    def clonar(self):
+        """Copia con el mismo estado mutable y la misma configuración (compartida)."""
+        copia = Bee.__new__(Bee)
+        copia.vida = self.vida
+        copia.energia = self.energia
+        copia.nectar_cargado = self.nectar_cargado
+        copia.config = self.config
+        return copia
+
+    __copy__ = clonar
 
-        # Navegación
-        self.factor_a_star = factor_a_star
+    def __deepcopy__(self, memo):
+        return self.clonar()
 
     def esta_viva(self):
         """Indica si la abeja tiene vida mayor a 0."""
@@ -57,6 +82,14 @@ class Bee:
         if self.energia > self.max_energia:
             self.energia = self.max_energia
 
+    def capturar_estado(self):
+        """Retorna una tupla compacta con las estadísticas mutables (para deshacer)."""
+        return (self.vida, self.energia, self.nectar_cargado)
+
+    def restaurar_estado(self, estado):
+        """Restaura un estado obtenido con `capturar_estado`."""
+        self.vida, self.energia, self.nectar_cargado = estado
+
     def es_movimiento_valido(self, tablero, inicio, destino):
         """
         Verifica si el movimiento es válido geométricamente (distancia 1).
@@ -78,25 +111,10 @@ class Bee:
         """
         Retorna coordenadas adyacentes válidas.
         """
-        fila_actual, col_actual = posicion
-        vecinos = []
-
-        # 8 direcciones posibles (cambios en fila y columna)
-        direcciones = [
-            (-1, -1), (-1, 0), (-1, 1),
-            (0, -1), (0, 1),
-            (1, -1), (1, 0), (1, 1)
-        ]
-
-        for delta_fila, delta_columna in direcciones:
-            nueva_fila = fila_actual + delta_fila
-            nueva_columna = col_actual + delta_columna
-
-            # Verificar que las nuevas coordenadas estén dentro del tablero
-            if 0 <= nueva_fila < tablero.filas and 0 <= nueva_columna < tablero.columnas:
-                vecinos.append((nueva_fila, nueva_columna))
-
-        return vecinos
+        mascaras = tablero.mascaras_bits()
+        if mascaras is not None:
+            return list(mascaras.lista_vecinos[posicion[0] * mascaras.columnas + posicion[1]])
+        return list(TablaVecinos.para(tablero.filas, tablero.columnas).vecinos(posicion))
 
     def aplicar_daño_por_flor(self, tablero, posicion):
         """Si la flor en la posición tiene pesticida, aplica daño a la abeja."""
@@ -175,16 +193,197 @@ class Bee:
             return True
         return False
 
-    def calcular_ruta_a_colmena(self, tablero, pos_actual, factor_aleatorio=None):
-        """Calcula ruta A* hacia la colmena."""
+    def calcular_ruta_a_colmena(self, tablero, pos_actual, factor_aleatorio=None, metodo="a_star", rng=None):
+        """
+        Calcula ruta hacia la colmena.
+        `metodo`: "a_star" (por defecto), "jps" o "campo". Con "campo" se baja por
+        el campo de distancias de la colmena (siempre un camino mínimo; el ruido
+        solo decide si los pasos empatados se eligen al azar o el primero), así
+        que con ruido >= 1 o desde una celda bloqueada se usa A*.
+        `rng` (opcional) genera el ruido y los desempates; por defecto, el
+        generador global de `random`.
+        """
         destino = tablero.pos_colmena
         ruido = self.factor_a_star if factor_aleatorio is None else factor_aleatorio
-        return self._a_star(tablero, pos_actual, destino, ruido)
+        if metodo == "campo" and ruido < 1 and tablero.es_transitable(pos_actual[0], pos_actual[1]):
+            return tablero.campo_colmena().ruta(pos_actual, rng=(rng or random) if ruido > 0 else None)
+        if metodo == "jps":
+            return self._jps(tablero, pos_actual, destino, ruido, rng=rng)
+        return self._a_star(tablero, pos_actual, destino, ruido, rng=rng)
 
-    def _a_star(self, tablero, inicio, objetivo, factor_ruido):
+    def _a_star(self, tablero, inicio, objetivo, factor_ruido, estadisticas=None, rng=None):
         """
         Algoritmo A* interno.
         Usa una cola de prioridad para encontrar el camino óptimo con ruido añadido.
+        La frontera guarda el padre de cada entrada (no el camino entero) y el
+        camino se reconstruye al llegar; los vecinos salen de la tabla precalculada.
+        Mismo orden de expansión y de consumo de números aleatorios que
+        `_a_star_referencia`, salvo empates exactos de prioridad (sin ruido),
+        que se deshacen por el padre en lugar de por el camino completo.
+        `estadisticas` (dict opcional) recibe el número de celdas expandidas y
+        `rng` (opcional) genera el ruido en lugar del generador global.
+        """
+        vecinos_de = TablaVecinos.para(tablero.filas, tablero.columnas).vecinos
+        es_transitable = tablero.es_transitable
+        uniform = (rng or random).uniform
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        # Cada elemento de frontera: (coste_total_estimado, pasos_g, posicion_actual, padre)
+        frontera = [(0, 0, inicio, None)]
+        padres = {}  # Posición expandida -> padre con el que se expandió
+
+        while frontera:
+            _, coste_g, actual, padre = heappop(frontera)
+
+            if actual in padres:
+                continue
+            padres[actual] = padre
+
+            if actual == objetivo:
+                if estadisticas is not None:
+                    estadisticas['expandidos'] = len(padres)
+                camino = [actual]
+                while padres[camino[-1]] is not None:
+                    camino.append(padres[camino[-1]])
+                camino.reverse()
+                return camino
+
+            nuevo_g = coste_g + 1
+            for vecino in vecinos_de(actual):
+                if vecino in padres:
+                    continue
+
+                # Bloquear obstaculos (excepto si es el destino final, por si acaso)
+                if not es_transitable(vecino[0], vecino[1]) and vecino != objetivo:
+                    continue
+
+                # Heurística: Distancia Chebyshev + ruido para simular comportamiento orgánico
+                h = max(abs(vecino[0] - objetivo[0]), abs(vecino[1] - objetivo[1]))
+                heappush(frontera, (nuevo_g + h + uniform(0, factor_ruido), nuevo_g, vecino, actual))
+
+        if estadisticas is not None:
+            estadisticas['expandidos'] = len(padres)
+        return []  # No se encontró ningún camino.
+
+    def _jps(self, tablero, inicio, objetivo, factor_ruido, estadisticas=None, rng=None):
+        """
+        Jump Point Search: A* sobre puntos de salto para la cuadrícula de 8
+        direcciones con coste uniforme (se permite cortar esquinas, como en `mover`).
+        Desde cada punto se avanza en línea recta o diagonal hasta una celda con
+        vecinos forzados (o el objetivo) y solo esas celdas entran en la frontera,
+        así que en zonas abiertas se expanden muchas menos celdas que con `_a_star`.
+        Los saltos rectos se resuelven con búsqueda binaria sobre los obstáculos
+        de la fila o columna (`Board.lineas_obstaculos`), no celda a celda.
+
+        El ruido se suma a la prioridad de cada punto de salto igual que en
+        `_a_star`: con ruido < 1 solo desempata entre caminos de la misma longitud.
+        El camino devuelto incluye todas las celdas intermedias.
+        """
+        if not tablero.es_transitable(objetivo[0], objetivo[1]):
+            # Los saltos asumen que el objetivo es una celda libre
+            return self._a_star(tablero, inicio, objetivo, factor_ruido, estadisticas, rng)
+
+        lineas = tablero.lineas_obstaculos()
+        libre = lineas.libre
+        salto_recto = lineas.salto_recto
+        uniform = (rng or random).uniform
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        def saltar(f, c, df, dc):
+            """Primer punto de salto avanzando en la dirección (df, dc), o None."""
+            if not (df and dc):
+                return salto_recto(f, c, df, dc, objetivo)
+            while True:
+                f += df
+                c += dc
+                if not libre(f, c):
+                    return None
+                if (f, c) == objetivo:
+                    return (f, c)
+                if ((not libre(f - df, c) and libre(f - df, c + dc)) or
+                        (not libre(f, c - dc) and libre(f + df, c - dc))):
+                    return (f, c)
+                # Un salto diagonal se detiene donde arranca un salto recto
+                if salto_recto(f, c, df, 0, objetivo) is not None or salto_recto(f, c, 0, dc, objetivo) is not None:
+                    return (f, c)
+
+        def direcciones(actual, padre):
+            """Direcciones a explorar desde `actual` (vecinos naturales y forzados)."""
+            if padre is None:
+                return DIRECCIONES
+            f, c = actual
+            df = (f > padre[0]) - (f < padre[0])
+            dc = (c > padre[1]) - (c < padre[1])
+            if df and dc:
+                resultado = [(df, dc), (df, 0), (0, dc)]
+                if not libre(f - df, c):
+                    resultado.append((-df, dc))
+                if not libre(f, c - dc):
+                    resultado.append((df, -dc))
+            elif df:
+                resultado = [(df, 0)]
+                if not libre(f, c + 1):
+                    resultado.append((df, 1))
+                if not libre(f, c - 1):
+                    resultado.append((df, -1))
+            else:
+                resultado = [(0, dc)]
+                if not libre(f + 1, c):
+                    resultado.append((1, dc))
+                if not libre(f - 1, c):
+                    resultado.append((-1, dc))
+            return resultado
+
+        # Cada elemento de frontera: (coste_total_estimado, pasos_g, punto_de_salto, padre)
+        frontera = [(0, 0, inicio, None)]
+        padres = {}
+
+        while frontera:
+            _, coste_g, actual, padre = heappop(frontera)
+
+            if actual in padres:
+                continue
+            padres[actual] = padre
+
+            if actual == objetivo:
+                if estadisticas is not None:
+                    estadisticas['expandidos'] = len(padres)
+                return self._desplegar_saltos(padres, actual)
+
+            for df, dc in direcciones(actual, padre):
+                punto = saltar(actual[0], actual[1], df, dc)
+                if punto is None or punto in padres:
+                    continue
+                # Los tramos son rectos o diagonales: su coste es la distancia Chebyshev
+                nuevo_g = coste_g + max(abs(punto[0] - actual[0]), abs(punto[1] - actual[1]))
+                h = max(abs(punto[0] - objetivo[0]), abs(punto[1] - objetivo[1]))
+                heappush(frontera, (nuevo_g + h + uniform(0, factor_ruido), nuevo_g, punto, actual))
+
+        if estadisticas is not None:
+            estadisticas['expandidos'] = len(padres)
+        return []  # No se encontró ningún camino.
+
+    @staticmethod
+    def _desplegar_saltos(padres, objetivo):
+        """Camino celda a celda a partir de la cadena de puntos de salto."""
+        puntos = [objetivo]
+        while padres[puntos[-1]] is not None:
+            puntos.append(padres[puntos[-1]])
+        puntos.reverse()
+        camino = [puntos[0]]
+        for destino in puntos[1:]:
+            f, c = camino[-1]
+            df = (destino[0] > f) - (destino[0] < f)
+            dc = (destino[1] > c) - (destino[1] < c)
+            while (f, c) != destino:
+                f += df
+                c += dc
+                camino.append((f, c))
+        return camino
+
+    def _a_star_referencia(self, tablero, inicio, objetivo, factor_ruido):
+        """
+        A* original (referencia): guarda en la frontera una copia del camino de cada entrada.
         """
         # Cada elemento de frontera: (coste_total_estimado, pasos_g, posicion_actual, camino_recorrido)
         frontera = []
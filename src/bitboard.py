@@ -0,0 +1,228 @@
+"""
+Codificación del tablero en bitboards (enteros de Python usados como conjuntos de bits).
+Para tableros pequeños: estados compactos y hashables, y máscaras de vecindad precalculadas.
+"""
+
+import threading
+
+from .flower import Flower
+
+
+class MascarasBits:
+    """
+    Máscaras precalculadas para un tamaño de tablero (compartidas por todos los
+    tableros de ese tamaño). La celda (f, c) es el bit f * columnas + c.
+        - `vecinos[i]`: las 8 celdas adyacentes dentro del tablero.
+        - `cuadrado(r)[i]`: celdas a distancia Chebyshev <= r (incluida la propia).
+    El registro por tamaño y los cuadrados, que se calculan al pedirlos, se
+    rellenan con cerrojo: los comparten los tableros de todos los hilos.
+    """
+
+    _por_tamaño = {}
+    _cerrojo = threading.Lock()
+
+    @classmethod
+    def para(cls, filas, columnas):
+        mascaras = cls._por_tamaño.get((filas, columnas))
+        if mascaras is None:
+            with cls._cerrojo:
+                mascaras = cls._por_tamaño.get((filas, columnas))
+                if mascaras is None:
+                    mascaras = cls(filas, columnas)
+                    cls._por_tamaño[(filas, columnas)] = mascaras
+        return mascaras
+
+    def __init__(self, filas, columnas):
+        self.filas = filas
+        self.columnas = columnas
+        self.todo = (1 << (filas * columnas)) - 1
+        self._cuadrados = {}
+        self._cerrojo_cuadrados = threading.Lock()
+        self.vecinos = [cuadrado & ~(1 << i) for i, cuadrado in enumerate(self.cuadrado(1))]
+        # Misma lista y orden que Bee.obtener_vecinos (índice creciente)
+        self.lista_vecinos = [self.posiciones(mascara) for mascara in self.vecinos]
+
+    def bit(self, pos):
+        return 1 << (pos[0] * self.columnas + pos[1])
+
+    def cuadrado(self, radio):
+        mascaras = self._cuadrados.get(radio)
+        if mascaras is None:
+            with self._cerrojo_cuadrados:
+                mascaras = self._cuadrados.get(radio)
+                if mascaras is None:
+                    mascaras = self._calcular_cuadrado(radio)
+                    self._cuadrados[radio] = mascaras
+        return mascaras
+
+    def _calcular_cuadrado(self, radio):
+        mascaras = []
+        for f in range(self.filas):
+            f_min, f_max = max(0, f - radio), min(self.filas, f + radio + 1)
+            for c in range(self.columnas):
+                c_min, c_max = max(0, c - radio), min(self.columnas, c + radio + 1)
+                tramo = ((1 << (c_max - c_min)) - 1) << c_min
+                mascara = 0
+                for ff in range(f_min, f_max):
+                    mascara |= tramo << (ff * self.columnas)
+                mascaras.append(mascara)
+        return mascaras
+
+    def posiciones(self, mascara):
+        """Celdas (f, c) de una máscara en orden de índice creciente."""
+        posiciones = []
+        while mascara:
+            menor = mascara & -mascara
+            posiciones.append(divmod(menor.bit_length() - 1, self.columnas))
+            mascara ^= menor
+        return posiciones
+
+
+class Bitboard:
+    """
+    Estado del tablero como unos pocos enteros:
+        - obstaculos, flores (cualquier flor, viva o muerta), vivas, polinizadas
+          (vivas) y un conjunto por nivel de pesticida de las flores vivas
+          (`niveles[k]`, 1 <= k <= Flower.MAX_PESTICIDAS; al llegar al máximo
+          la flor muere justo después).
+        - colmena: bit de la colmena.
+
+    Se construye bajo demanda (`desde_tablero`): el tablero no lo mantiene en
+    cada jugada, porque consultar su cuadrícula es igual de rápido. `como_tupla`
+    da una representación hashable y barata de copiar o enviar a otros procesos.
+    """
+
+    __slots__ = ('mascaras', 'obstaculos', 'flores', 'vivas', 'polinizadas', 'niveles', 'colmena')
+
+    # Mayor tablero para el que se precalculan máscaras (memoria ~ celdas^2 bits por radio)
+    MAX_CELDAS = 1024
+
+    def __init__(self, filas, columnas):
+        self.mascaras = MascarasBits.para(filas, columnas)
+        self.obstaculos = 0
+        self.flores = 0
+        self.vivas = 0
+        self.polinizadas = 0
+        self.niveles = [0] * (Flower.MAX_PESTICIDAS + 1)
+        self.colmena = 0
+
+    @classmethod
+    def admite(cls, filas, columnas):
+        return filas * columnas <= cls.MAX_CELDAS
+
+    @classmethod
+    def desde_tablero(cls, tablero):
+        bits = cls(tablero.filas, tablero.columnas)
+        if tablero.pos_colmena is not None:
+            bits.colmena = bits.mascaras.bit(tablero.pos_colmena)
+        for pos in tablero.obstaculos:
+            bits.obstaculos |= bits.mascaras.bit(pos)
+        for pos, flor in tablero.flores:
+            bits.flores |= bits.mascaras.bit(pos)
+            bits.flor_actualizada(pos, (0, 0, 0, 0), flor.aporte())
+        return bits
+
+    def clonar(self):
+        copia = Bitboard.__new__(Bitboard)
+        copia.mascaras = self.mascaras
+        copia.obstaculos = self.obstaculos
+        copia.flores = self.flores
+        copia.vivas = self.vivas
+        copia.polinizadas = self.polinizadas
+        copia.niveles = list(self.niveles)
+        copia.colmena = self.colmena
+        return copia
+
+    # === Actualización (la usa desde_tablero) ===
+
+    def flor_actualizada(self, pos, aporte_previo, aporte_nuevo):
+        bit = self.mascaras.bit(pos)
+        if aporte_previo[0]:
+            self.vivas &= ~bit
+            self.polinizadas &= ~bit
+            self.niveles[aporte_previo[3]] &= ~bit
+        if aporte_nuevo[0]:
+            self.vivas |= bit
+            if aporte_nuevo[1]:
+                self.polinizadas |= bit
+            self.niveles[aporte_nuevo[3]] |= bit
+
+    def poner_flor(self, pos, presente):
+        if presente:
+            self.flores |= self.mascaras.bit(pos)
+        else:
+            self.flores &= ~self.mascaras.bit(pos)
+
+    def poner_obstaculo(self, pos, presente):
+        if presente:
+            self.obstaculos |= self.mascaras.bit(pos)
+        else:
+            self.obstaculos &= ~self.mascaras.bit(pos)
+
+    # === Consultas ===
+
+    def vacias(self):
+        """Celdas sin colmena, flor ni obstáculo."""
+        return self.mascaras.todo & ~(self.obstaculos | self.flores | self.colmena)
+
+    def es_transitable(self, fila, col):
+        mascaras = self.mascaras
+        if not (0 <= fila < mascaras.filas and 0 <= col < mascaras.columnas):
+            return False
+        return not (self.obstaculos >> (fila * mascaras.columnas + col)) & 1
+
+    def es_obstaculo(self, fila, col):
+        mascaras = self.mascaras
+        if not (0 <= fila < mascaras.filas and 0 <= col < mascaras.columnas):
+            return False
+        return bool((self.obstaculos >> (fila * mascaras.columnas + col)) & 1)
+
+    def vecinos(self, pos):
+        """Celdas adyacentes dentro del tablero (lista precalculada, no modificar)."""
+        return self.mascaras.lista_vecinos[pos[0] * self.mascaras.columnas + pos[1]]
+
+    def acciones_humanidad(self, pos_abeja, pos_colmena, radio_pesticida, radio_obstaculo):
+        """
+        Jugadas de la Humanidad: pesticida en flores vivas a distancia <= radio_pesticida
+        de la abeja y obstáculo en celdas vacías a distancia <= radio_obstaculo de la
+        colmena o de la abeja (nunca sobre la abeja). Orden de índice creciente.
+        """
+        mascaras = self.mascaras
+        i_abeja = pos_abeja[0] * mascaras.columnas + pos_abeja[1]
+        pesticida = self.vivas & mascaras.cuadrado(radio_pesticida)[i_abeja]
+
+        cuadrados = mascaras.cuadrado(radio_obstaculo)
+        zona = cuadrados[i_abeja]
+        if pos_colmena is not None:
+            zona |= cuadrados[pos_colmena[0] * mascaras.columnas + pos_colmena[1]]
+        obstaculo = zona & self.vacias() & ~(1 << i_abeja)
+
+        acciones = [('pesticida', pos) for pos in mascaras.posiciones(pesticida)]
+        acciones.extend(('obstaculo', pos) for pos in mascaras.posiciones(obstaculo))
+        return acciones
+
+    def como_tupla(self):
+        return (self.obstaculos, self.flores, self.vivas, self.polinizadas, *self.niveles[1:], self.colmena)
+
+
+def codificar(estado):
+    """
+    Estado completo como tupla de enteros: bitboards del tablero, índice de la
+    abeja, sus estadísticas, néctar de la colmena y turno. Hashable y compacto
+    (el clima y la configuración no se incluyen).
+    """
+    tablero = estado.tablero
+    bits = Bitboard.desde_tablero(tablero)
+    abeja = estado.abeja
+    return bits.como_tupla() + (
+        estado.pos_abeja[0] * tablero.columnas + estado.pos_abeja[1],
+        abeja.vida, abeja.energia, abeja.nectar_cargado,
+        tablero.nectar_en_colmena, estado.turno,
+    )
+
+
+def es_terminal(codigo, nectar_objetivo):
+    """Misma condición que ExpectimaxAI._es_terminal sobre un estado codificado."""
+    vivas = codigo[2]
+    vida, nectar_colmena = codigo[-5], codigo[-2]
+    return vida <= 0 or vivas == 0 or nectar_colmena >= nectar_objetivo
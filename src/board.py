@@ -1,72 +1,329 @@
 import random
+from bisect import bisect_left
 from .flower import Flower
+from .campos import CamposDistancia, CampoColmena, LineasObstaculos
+from .bitboard import Bitboard, MascarasBits
+from .indice_espacial import CandidatosObstaculo, IndiceEspacial
+from .rutas import MatrizRutas
+
+_MASCARA_64 = (1 << 64) - 1
+
+
+def _clave_flor(pos, aporte):
+    """Clave pseudoaleatoria de 64 bits de una flor según su aporte (0 si no aporta: muerta)."""
+    viva, polinizada, _, pesticidas = aporte
+    if not viva:
+        return 0
+    # splitmix64 sobre una codificación entera de (posición, polinizada, pesticidas)
+    x = ((pos[0] << 24 | pos[1] << 8 | polinizada << 4 | pesticidas) + 0x9E3779B97F4A7C15) & _MASCARA_64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASCARA_64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASCARA_64
+    return x ^ (x >> 31)
+
+
+def _orden_flor(par):
+    return par[1].orden
+
 
 class Board:
     """
     Representa el tablero del juego (Grid).
     Contiene la colmena, flores, obstáculos y gestiona el estado del juego.
+
+    Mantiene agregados de las flores (vivas, polinizadas, contaminadas y
+    pesticida total de las vivas) que las propias flores actualizan en O(1)
+    al cambiar de estado (el tablero es su observador), junto con una firma
+    XOR de las flores vivas (`firma_flores`) que sirve de clave compacta para
+    cachear evaluaciones. Si se han pedido los
+    campos de distancia (`campos_distancia`), también les avisa cuando una
+    flor pasa a estar limpia (viva y sin pesticida) o deja de estarlo.
+
+    En tableros pequeños (`Bitboard.admite`) comparte las máscaras precalculadas
+    de su tamaño (`mascaras_bits()`), de las que salen los vecinos de la abeja.
+    Las jugadas de la Humanidad salen del índice espacial de flores vivas
+    (`indice_espacial()`) y de las candidatas alrededor de la colmena.
+
+    Las flores muertas se programan para retirarse en una rueda de turnos
+    (turno -> posiciones): `limpiar_flores_muertas` solo toca las que vencen.
     """
 
     def __init__(self, filas=10, columnas=10):
         self.filas = filas
         self.columnas = columnas
-        self.grid = [[None for _ in range(columnas)] for _ in range(filas)]
 
         # Estado del juego
         self.pos_colmena = None
-        self.flores = []  # Lista de tuplas ((r, c), objeto_flor)
-        self.obstaculos = []  # Lista de tuplas (r, c)
         self.nectar_en_colmena = 0
         self.turno = 0
+        self._vaciar()
+
+    def _vaciar(self):
+        """Deja el tablero sin colmena, flores ni obstáculos."""
+        self._crear_celdas()
+        self.flores = []  # Lista de tuplas ((r, c), objeto_flor)
+        self.obstaculos = []  # Lista de tuplas (r, c)
+        self._siguiente_orden = 0
+        self._reiniciar_agregados()
+        self._campos = None
+        self._campo_colmena = None
+        self._lineas = None
+        self._rutas = None
+        self._indice = None
+        self._candidatos = None
+        self._mascaras = MascarasBits.para(self.filas, self.columnas) if Bitboard.admite(self.filas, self.columnas) else None
+        self._reiniciar_retiradas()
+
+    def _crear_celdas(self):
+        self.grid = [[None for _ in range(self.columnas)] for _ in range(self.filas)]
+
+    def _copiar_celdas(self, copia):
+        copia.grid = [fila[:] for fila in self.grid]
+
+    def _poner_celda(self, pos, contenido):
+        self.grid[pos[0]][pos[1]] = contenido
+
+    def _copiar_flor(self, copia, pos, flor):
+        """Flor de `copia` equivalente a `flor`, ya colocada en su celda."""
+        nueva = flor.clonar()
+        nueva.observador = copia
+        copia._poner_celda(pos, nueva)
+        return nueva
+
+    def _reiniciar_retiradas(self):
+        self._retiradas = {}       # Turno -> posiciones de flores muertas que se retiran en ese turno
+        self._turno_retirada = {}  # Posición -> turno programado
+
+    def _reiniciar_agregados(self):
+        self.num_vivas = 0
+        self.num_polinizadas = 0
+        self.num_contaminadas = 0
+        self.total_pesticidas = 0
+        self.firma_flores = 0
+
+    def flor_actualizada(self, flor, aporte_previo, aporte_nuevo):
+        """Notificación de una flor del tablero: sustituye su aporte a los agregados."""
+        self.num_vivas += aporte_nuevo[0] - aporte_previo[0]
+        self.num_polinizadas += aporte_nuevo[1] - aporte_previo[1]
+        self.num_contaminadas += aporte_nuevo[2] - aporte_previo[2]
+        self.total_pesticidas += aporte_nuevo[3] - aporte_previo[3]
+        if aporte_previo != aporte_nuevo:
+            self.firma_flores ^= _clave_flor(flor.posicion, aporte_previo) ^ _clave_flor(flor.posicion, aporte_nuevo)
+
+        if self._campos is not None:
+            # Limpia = viva y sin pesticida
+            limpia_antes = aporte_previo[0] and not aporte_previo[2]
+            limpia_ahora = aporte_nuevo[0] and not aporte_nuevo[2]
+            if limpia_antes != limpia_ahora:
+                self._campos.flor_limpia(flor.posicion, 1 if limpia_ahora else -1)
+
+        if aporte_previo[0] != aporte_nuevo[0]:
+            if self._indice is not None:
+                self._indice.flor_viva(flor.posicion, 1 if aporte_nuevo[0] else -1)
+            # Al morir se programa su retirada; si revive (deshacer) se cancela
+            if aporte_nuevo[0]:
+                self._cancelar_retirada(flor.posicion)
+            else:
+                self._programar_retirada(flor.posicion, flor.turnos_muerta)
+
+    def campos_distancia(self):
+        """Campos de distancia de las flores limpias (se crean al pedirlos por primera vez)."""
+        if self._campos is None:
+            self._campos = CamposDistancia(self)
+        return self._campos
+
+    def campo_colmena(self):
+        """Distancias a la colmena esquivando obstáculos (se recalcula al pedirlo tras cambiar los obstáculos)."""
+        if self._campo_colmena is None:
+            self._campo_colmena = CampoColmena(self)
+        return self._campo_colmena
+
+    def lineas_obstaculos(self):
+        """Obstáculos por filas y columnas para Jump Point Search (se recalcula tras cambiarlos)."""
+        if self._lineas is None:
+            self._lineas = LineasObstaculos(self)
+        return self._lineas
+
+    def matriz_rutas(self):
+        """Distancias reales desde la colmena y las flores (se crea al pedirla y se corrige con cada obstáculo)."""
+        if self._rutas is None:
+            self._rutas = MatrizRutas(self)
+        return self._rutas
+
+    def _obstaculos_cambiados(self, pos, presente):
+        self._campo_colmena = None
+        self._lineas = None
+        if self._rutas is not None:
+            self._rutas.obstaculo(pos, presente)
+        if self._candidatos is not None:
+            self._candidatos.pendientes.add(pos)
+
+    def _celda_cambiada(self, pos):
+        """Una flor entra o sale de la celda: se revisará en la próxima consulta de candidatas."""
+        if self._candidatos is not None:
+            self._candidatos.pendientes.add(pos)
+
+    def _programar_retirada(self, pos, turnos_muerta=0):
+        # Se retira al cumplir TURNOS_DESCOMPOSICION turnos muerta, nunca antes del siguiente turno
+        turno = self.turno + max(1, Flower.TURNOS_DESCOMPOSICION - turnos_muerta)
+        self._retiradas.setdefault(turno, set()).add(pos)
+        self._turno_retirada[pos] = turno
+
+    def _cancelar_retirada(self, pos):
+        turno = self._turno_retirada.pop(pos, None)
+        if turno is not None:
+            pendientes = self._retiradas[turno]
+            pendientes.discard(pos)
+            if not pendientes:
+                del self._retiradas[turno]
+
+    def indice_espacial(self):
+        """Índice de flores vivas por cubetas (se crea al pedirlo por primera vez)."""
+        if self._indice is None:
+            self._indice = IndiceEspacial(self)
+        return self._indice
+
+    def candidatos_obstaculo(self, radio):
+        """Celdas vacías alrededor de la colmena para los obstáculos de la Humanidad (se mantienen al día)."""
+        if self._candidatos is None or self._candidatos.radio != radio:
+            self._candidatos = CandidatosObstaculo(self, radio)
+        return self._candidatos
+
+    def mascaras_bits(self):
+        """Máscaras de bits de este tamaño (inmutables y compartidas), o None en tableros grandes."""
+        return self._mascaras
+
+    def agregados(self):
+        """(vivas, polinizadas, contaminadas, pesticidas) mantenidos incrementalmente."""
+        return (self.num_vivas, self.num_polinizadas, self.num_contaminadas, self.total_pesticidas)
+
+    def calcular_agregados(self):
+        """Los mismos agregados recalculados desde cero (referencia)."""
+        vivas = polinizadas = contaminadas = pesticidas = 0
+        for _, flor in self.flores:
+            v, p, c, t = flor.aporte()
+            vivas += v
+            polinizadas += p
+            contaminadas += c
+            pesticidas += t
+        return (vivas, polinizadas, contaminadas, pesticidas)
+
+    def calcular_firma_flores(self):
+        """`firma_flores` recalculada desde cero (referencia)."""
+        firma = 0
+        for pos, flor in self.flores:
+            firma ^= _clave_flor(pos, flor.aporte())
+        return firma
 
     def inicializar_tablero(self, num_flores=15, num_obstaculos=5, pos_colmena=None):
         """
         Reinicia y puebla el tablero de forma segura usando posiciones aleatorias únicas.
         """
         # Reiniciar estado
-        self.grid = [[None for _ in range(self.columnas)] for _ in range(self.filas)]
-        self.flores = []
-        self.obstaculos = []
+        self._vaciar()
 
         # Colocar Colmena
         if pos_colmena is None:
-            self.pos_colmena = (self.filas // 2, self.columnas // 2)
-        else:
-            self.pos_colmena = pos_colmena
-        self.grid[self.pos_colmena[0]][self.pos_colmena[1]] = "COLMENA"
+            pos_colmena = (self.filas // 2, self.columnas // 2)
+        self.colocar_colmena(pos_colmena)
 
-        # Generar todas las coordenadas posibles para evitar colisiones
         # Reservamos la posición de inicio de la abeja (encima de la colmena)
         pos_abeja_inicio = (self.pos_colmena[0] - 1, self.pos_colmena[1])
+        posiciones = self._posiciones_aleatorias(num_flores + num_obstaculos,
+                                                 (self.pos_colmena, pos_abeja_inicio))
+
+        # Colocar Flores
+        # Nos aseguramos de no generar más flores de las que caben
+        count_flores = min(num_flores, len(posiciones))
+        for pos in posiciones[:count_flores]:
+            self.agregar_flor(pos, Flower())
 
+        # Colocar Obstáculos
+        for pos in posiciones[count_flores:]:
+            self.colocar_obstaculo(pos[0], pos[1])
+
+    def _posiciones_aleatorias(self, cantidad, reservadas):
+        """Hasta `cantidad` posiciones distintas al azar, sin las reservadas."""
+        # Generar todas las coordenadas posibles para evitar colisiones
         todas_posiciones = [
             (r, c) for r in range(self.filas) for c in range(self.columnas)
         ]
 
         # Eliminar posiciones reservadas si existen en la lista
-        if self.pos_colmena in todas_posiciones:
-            todas_posiciones.remove(self.pos_colmena)
-        if pos_abeja_inicio in todas_posiciones:
-            todas_posiciones.remove(pos_abeja_inicio)
+        for pos in reservadas:
+            if pos in todas_posiciones:
+                todas_posiciones.remove(pos)
 
         # Barajar para aleatoriedad
         random.shuffle(todas_posiciones)
+        return [todas_posiciones.pop() for _ in range(min(cantidad, len(todas_posiciones)))]
 
-        # Colocar Flores
-        # Nos aseguramos de no generar más flores de las que caben
-        count_flores = min(num_flores, len(todas_posiciones))
-        for _ in range(count_flores):
-            pos = todas_posiciones.pop()
-            flor = Flower()
-            self.grid[pos[0]][pos[1]] = flor
-            self.flores.append((pos, flor))
+    def clonar(self):
+        """Copia independiente: filas de la cuadrícula y flores copiadas, listas de posiciones duplicadas."""
+        copia = type(self).__new__(type(self))
+        copia.filas = self.filas
+        copia.columnas = self.columnas
+        copia.pos_colmena = self.pos_colmena
+        copia.nectar_en_colmena = self.nectar_en_colmena
+        copia.turno = self.turno
+        self._copiar_celdas(copia)
+        copia.flores = []
+        copia._siguiente_orden = self._siguiente_orden
+        for pos, flor in self.flores:
+            copia.flores.append((pos, self._copiar_flor(copia, pos, flor)))
+        copia.obstaculos = list(self.obstaculos)
+        (copia.num_vivas, copia.num_polinizadas, copia.num_contaminadas,
+         copia.total_pesticidas) = self.agregados()
+        copia.firma_flores = self.firma_flores
+        copia._campos = None if self._campos is None else self._campos.__deepcopy__({})
+        copia._campo_colmena = self._campo_colmena  # Inmutables: se comparten
+        copia._lineas = self._lineas
+        copia._rutas = None if self._rutas is None else self._rutas.__deepcopy__({})
+        copia._indice = None if self._indice is None else self._indice.__deepcopy__({})
+        copia._candidatos = None if self._candidatos is None else self._candidatos.__deepcopy__({})
+        copia._mascaras = self._mascaras
+        copia._retiradas = {turno: set(pendientes) for turno, pendientes in self._retiradas.items()}
+        copia._turno_retirada = dict(self._turno_retirada)
+        return copia
 
-        # Colocar Obstáculos
-        count_obs = min(num_obstaculos, len(todas_posiciones))
-        for _ in range(count_obs):
-            pos = todas_posiciones.pop()
-            self.grid[pos[0]][pos[1]] = "OBSTACULO"
-            self.obstaculos.append(pos)
+    def aislar(self):
+        """
+        Deja de compartir con las demás copias lo que `clonar` comparte por
+        tablero (campo de la colmena, líneas de obstáculos y anillos de las
+        candidatas), para usar esta copia desde otro hilo. Sus propias copias
+        posteriores comparten solo entre ellas. Las máscaras y tablas de
+        vecinos por tamaño se siguen compartiendo: no cambian una vez creadas.
+        """
+        self._campo_colmena = None
+        self._lineas = None
+        if self._candidatos is not None:
+            self._candidatos.aislar()
+
+    def __deepcopy__(self, memo):
+        return self.clonar()
+
+    def compactar(self):
+        """Representación compacta (tuplas de primitivos) para enviar a otros procesos."""
+        flores = tuple((pos, flor.capturar_estado()) for pos, flor in self.flores)
+        return (self.filas, self.columnas, self.pos_colmena, flores, tuple(self.obstaculos),
+                self.nectar_en_colmena, self.turno)
+
+    @classmethod
+    def desde_compacto(cls, datos):
+        """Reconstruye un tablero a partir de `compactar`."""
+        filas, columnas, pos_colmena, flores, obstaculos, nectar, turno = datos
+        tablero = cls(filas, columnas)
+        # Antes de las flores: las muertas se programan a partir del turno actual
+        tablero.turno = turno
+        if pos_colmena is not None:
+            tablero.colocar_colmena(pos_colmena)
+        for pos, estado_flor in flores:
+            flor = Flower()
+            flor.restaurar_estado(estado_flor)
+            tablero.agregar_flor(pos, flor)
+        for pos in obstaculos:
+            tablero.colocar_obstaculo(pos[0], pos[1])
+        tablero.nectar_en_colmena = nectar
+        return tablero
 
     def get_celda(self, fila, col):
         """Retorna el contenido de una celda con seguridad de límites."""
@@ -74,11 +331,17 @@ class Board:
             return self.grid[fila][col]
         return None
 
+    def colocar_colmena(self, pos):
+        self.pos_colmena = pos
+        self._poner_celda(pos, "COLMENA")
+        self._campo_colmena = None
+        self._candidatos = None
+
     def es_colmena(self, fila, col):
         return (fila, col) == self.pos_colmena
 
     def es_obstaculo(self, fila, col):
-        return (fila, col) in self.obstaculos
+        return self.get_celda(fila, col) == "OBSTACULO"
 
     def es_flor(self, fila, col):
         celda = self.get_celda(fila, col)
@@ -101,18 +364,73 @@ class Board:
         # En cualquier otro caso se puede pasar
         return True
 
+    def agregar_flor(self, pos, flor):
+        """Coloca una flor en una celda (se asume vacía)."""
+        self._poner_celda(pos, flor)
+        self.flores.append((pos, flor))
+        flor.observador = self
+        flor.posicion = pos
+        flor.orden = self._siguiente_orden
+        self._siguiente_orden += 1
+        self._celda_cambiada(pos)
+        self.flor_actualizada(flor, (0, 0, 0, 0), flor.aporte())
+        if not flor.esta_viva():
+            self._programar_retirada(pos, flor.turnos_muerta)
+
+    def quitar_flor(self, fila, col):
+        """Retira la flor de una celda (se usa para deshacer una reproducción)."""
+        pos = (fila, col)
+        for i in range(len(self.flores) - 1, -1, -1):
+            if self.flores[i][0] == pos:
+                _, flor = self.flores.pop(i)
+                self.flor_actualizada(flor, flor.aporte(), (0, 0, 0, 0))
+                flor.observador = None
+                break
+        self._cancelar_retirada(pos)
+        self._retirar_celda_flor(pos)
+
+    def _retirar_celda_flor(self, pos):
+        self._poner_celda(pos, None)
+        self._celda_cambiada(pos)
+
     def colocar_obstaculo(self, fila, col):
         """Intenta colocar un obstáculo si la celda está vacía."""
-        if self.grid[fila][col] is None:
-            self.grid[fila][col] = "OBSTACULO"
+        if self.get_celda(fila, col) is None:
+            self._poner_celda((fila, col), "OBSTACULO")
             self.obstaculos.append((fila, col))
+            self._obstaculos_cambiados((fila, col), True)
             return True
         return False
 
-    def aplicar_pesticida_en(self, fila, col):
-        """Delega la aplicación de pesticida a la flor en la posición."""
+    def quitar_obstaculo(self, fila, col):
+        """
+        Retira un obstáculo del tablero.
+        Retorna su índice en la cola FIFO (o None si no existía) para poder restaurarlo.
+        """
+        pos = (fila, col)
+        if pos not in self.obstaculos:
+            return None
+        indice = self.obstaculos.index(pos)
+        self.obstaculos.pop(indice)
+        self._poner_celda(pos, None)
+        self._obstaculos_cambiados(pos, False)
+        return indice
+
+    def restaurar_obstaculo(self, fila, col, indice):
+        """Reinserta un obstáculo retirado en su posición original de la cola FIFO."""
+        self._poner_celda((fila, col), "OBSTACULO")
+        self.obstaculos.insert(indice, (fila, col))
+        self._obstaculos_cambiados((fila, col), True)
+
+    def aplicar_pesticida_en(self, fila, col, registro=None):
+        """
+        Delega la aplicación de pesticida a la flor en la posición.
+        Si se pasa `registro`, anota el estado previo de la flor para poder deshacerlo.
+        """
         celda = self.get_celda(fila, col)
         if isinstance(celda, Flower):
+            if registro is not None:
+                registro.append(('flor', celda, celda.capturar_estado()))
             celda.aplicar_pesticida()
             return True
         return False
@@ -124,7 +442,8 @@ class Board:
         return [(pos, flor) for pos, flor in self.flores if flor.esta_viva()]
 
     def contar_flores_vivas(self):
-        return len(self.get_flores_vivas())
+        """O(1): contador mantenido por las notificaciones de las flores."""
+        return self.num_vivas
 
     def incrementar_turno(self):
         self.turno += 1
@@ -134,21 +453,23 @@ class Board:
         return self.turno
 
     def limpiar_flores_muertas(self):
-        """Gestiona la desaparición de flores muertas tras el tiempo establecido."""
-        # Filtramos la lista
-        flores_vivas_o_recientes = []
-
-        for pos, flor in self.flores:
-            if not flor.esta_viva():
-                flor.incrementar_turno_muerta()
-
-                if flor.debe_eliminarse():
-                    # Eliminar del grid
-                    self.grid[pos[0]][pos[1]] = None
-                    # No la añadimos a la nueva lista (se elimina)
-                    continue
-
-            # Si está viva o muerta pero reciente, se queda
-            flores_vivas_o_recientes.append((pos, flor))
+        """
+        Retira las flores muertas cuyo turno de retirada ya ha llegado y avanza
+        el contador de descomposición (`turnos_muerta`) de las que esperan.
+        El turno avanza de uno en uno y las retiradas se programan siempre para
+        un turno posterior, así que basta con sacar la cubeta del turno actual.
+        Solo se tocan las flores muertas; el resto de la lista conserva su orden.
+        """
+        for pos in self._retiradas.pop(self.turno, ()):
+            del self._turno_retirada[pos]
+            flor = self.get_celda(pos[0], pos[1])
+            flor.turnos_muerta = Flower.TURNOS_DESCOMPOSICION
+            # `flores` está ordenada por llegada: búsqueda binaria en lugar de recorrerla
+            self.flores.pop(bisect_left(self.flores, flor.orden, key=_orden_flor))
+            # Eliminar del grid (una flor muerta no aporta a los agregados)
+            self._retirar_celda_flor(pos)
+            flor.observador = None
 
-        self.flores = flores_vivas_o_recientes
\ No newline at end of file
+        # Turnos transcurridos desde su muerte
+        for pos, turno in self._turno_retirada.items():
+            self.get_celda(pos[0], pos[1]).turnos_muerta = self.turno - turno + Flower.TURNOS_DESCOMPOSICION
@@ -0,0 +1,81 @@
+"""
+Tablero disperso por trozos para mapas muy grandes.
+Solo guarda memoria para las zonas con algo colocado: un mapa de 2000x2000 con
+unos miles de flores ocupa lo que ocupan sus trozos, no cuatro millones de celdas.
+"""
+
+import random
+
+from .board import Board
+
+
+class BoardDisperso(Board):
+    """
+    Board con las celdas repartidas en trozos de LADO_TROZO x LADO_TROZO (8x8):
+        - `_trozos`: (fila_trozo, col_trozo) -> lista plana con las celdas del trozo.
+        - `_ocupadas`: número de celdas no vacías de cada trozo.
+
+    Un trozo se crea al escribir la primera celda no vacía y se libera cuando
+    vuelve a quedar vacío; leer una celda de un trozo inexistente da None. El
+    resto de la lógica (flores, obstáculos, agregados, deshacer) es la de Board.
+
+    La colocación inicial toma muestras de índices de celda en lugar de barajar
+    la lista de todas las coordenadas, así que con la misma semilla la
+    disposición no coincide con la de Board.
+    """
+
+    LADO_TROZO = 8
+
+    # === Almacenamiento ===
+
+    def _crear_celdas(self):
+        self._trozos = {}
+        self._ocupadas = {}
+
+    def _copiar_celdas(self, copia):
+        copia._trozos = {clave: list(trozo) for clave, trozo in self._trozos.items()}
+        copia._ocupadas = dict(self._ocupadas)
+
+    def _poner_celda(self, pos, contenido):
+        lado = self.LADO_TROZO
+        clave = (pos[0] // lado, pos[1] // lado)
+        i = (pos[0] % lado) * lado + pos[1] % lado
+        trozo = self._trozos.get(clave)
+        if trozo is None:
+            if contenido is None:
+                return
+            trozo = [None] * (lado * lado)
+            self._trozos[clave] = trozo
+            self._ocupadas[clave] = 0
+        previo = trozo[i]
+        trozo[i] = contenido
+        if previo is None and contenido is not None:
+            self._ocupadas[clave] += 1
+        elif previo is not None and contenido is None:
+            self._ocupadas[clave] -= 1
+            if not self._ocupadas[clave]:
+                del self._trozos[clave]
+                del self._ocupadas[clave]
+
+    def get_celda(self, fila, col):
+        """Retorna el contenido de una celda con seguridad de límites."""
+        if 0 <= fila < self.filas and 0 <= col < self.columnas:
+            lado = self.LADO_TROZO
+            trozo = self._trozos.get((fila // lado, col // lado))
+            if trozo is not None:
+                return trozo[(fila % lado) * lado + col % lado]
+        return None
+
+    def num_trozos(self):
+        return len(self._trozos)
+
+    # === Colocación inicial ===
+
+    def _posiciones_aleatorias(self, cantidad, reservadas):
+        """Muestra de índices de celda: O(cantidad) sin generar todas las coordenadas."""
+        total = self.filas * self.columnas
+        reservadas = {pos for pos in reservadas
+                      if 0 <= pos[0] < self.filas and 0 <= pos[1] < self.columnas}
+        muestra = random.sample(range(total), min(total, cantidad + len(reservadas)))
+        posiciones = [divmod(i, self.columnas) for i in muestra]
+        return [pos for pos in posiciones if pos not in reservadas][:cantidad]
@@ -0,0 +1,200 @@
+"""
+Tablero respaldado por arrays de NumPy.
+Misma interfaz que Board con celdas de un byte y las flores en estructura de arrays,
+pensado para copias baratas y evaluación vectorizada en tableros grandes.
+"""
+
+import numpy as np
+
+from .board import Board
+from .flower import Flower
+
+# Tipos de celda del array `celdas`
+VACIO = 0
+COLMENA = 1
+OBSTACULO = 2
+FLOR = 3
+
+
+def _campo(nombre, tipo):
+    """Propiedad de FlorVista que lee/escribe la posición de la flor en un array del tablero."""
+    def leer(self):
+        return tipo(getattr(self.tablero, nombre)[self.indice])
+
+    def escribir(self, valor):
+        getattr(self.tablero, nombre)[self.indice] = valor
+
+    return property(leer, escribir)
+
+
+class FlorVista(Flower):
+    """
+    Flor cuyo estado vive en los arrays de un BoardNumpy (una fila de la estructura).
+    Hereda toda la lógica de Flower, así que notifica al tablero igual que una flor normal.
+    """
+
+    __slots__ = ('tablero', 'indice')
+
+    vida = _campo('vida', int)
+    max_vida = _campo('max_vida', int)
+    es_polinizada = _campo('polinizada', bool)
+    pesticidas = _campo('pesticidas', int)
+    viva = _campo('viva', bool)
+    turnos_muerta = _campo('turnos_muerta', int)
+
+    def __init__(self, tablero, indice, posicion):
+        self.tablero = tablero
+        self.indice = indice
+        self.observador = tablero
+        self.posicion = posicion
+
+
+class BoardNumpy(Board):
+    """
+    Board con representación compacta:
+        - `celdas`: int8 (filas x columnas) con VACIO, COLMENA, OBSTACULO o FLOR.
+        - `indice_flor`: int32 con la fila de la flor de cada celda (-1 si no hay).
+        - Flores en estructura de arrays: viva, polinizada, pesticidas,
+          turnos_muerta, vida y max_vida. Las filas libres se reutilizan.
+
+    `get_celda` devuelve lo mismo que Board (None, "COLMENA", "OBSTACULO" o una
+    flor); las flores son vistas (`FlorVista`) sobre su fila de los arrays, de
+    modo que los motores, la heurística y el registro de deshacer funcionan sin
+    cambios. Las consultas de celda son O(1) (`es_obstaculo` ya no recorre la
+    lista de obstáculos) y copiar el tablero es copiar los arrays.
+
+    `agregar_flor` copia el estado de la flor recibida en los arrays: la flor
+    del tablero es la vista, no el objeto original.
+
+    El almacenamiento entra por los ganchos de Board (`_crear_celdas`,
+    `_copiar_celdas`, `_poner_celda` y `_copiar_flor`), como en BoardDisperso:
+    vaciar, clonar y colocar la colmena u obstáculos son los de Board.
+    """
+
+    CAPACIDAD_INICIAL = 16
+
+    # Contenido de Board -> tipo de celda (las flores se colocan con agregar_flor)
+    _TIPOS = {None: VACIO, "COLMENA": COLMENA, "OBSTACULO": OBSTACULO}
+    _ARRAYS_FLORES = ('viva', 'polinizada', 'pesticidas', 'turnos_muerta', 'vida', 'max_vida', 'ocupada')
+
+    # === Almacenamiento ===
+
+    def _crear_celdas(self):
+        self.celdas = np.zeros((self.filas, self.columnas), dtype=np.int8)
+        self.indice_flor = np.full((self.filas, self.columnas), -1, dtype=np.int32)
+        self._reservar(self.CAPACIDAD_INICIAL)
+        self._vistas = [None] * self.CAPACIDAD_INICIAL
+        self._libres = list(range(self.CAPACIDAD_INICIAL - 1, -1, -1))
+
+    def _copiar_celdas(self, copia):
+        for nombre in ('celdas', 'indice_flor') + self._ARRAYS_FLORES:
+            setattr(copia, nombre, getattr(self, nombre).copy())
+        copia._libres = list(self._libres)
+        copia._vistas = [None] * len(self._vistas)
+
+    def _poner_celda(self, pos, contenido):
+        self.celdas[pos] = self._TIPOS[contenido]
+
+    def _copiar_flor(self, copia, pos, flor):
+        """La fila de la flor ya está en los arrays copiados: basta una vista sobre ellos."""
+        vista = FlorVista(copia, flor.indice, pos)
+        vista.orden = flor.orden
+        copia._vistas[flor.indice] = vista
+        return vista
+
+    def _reservar(self, capacidad):
+        self.viva = np.zeros(capacidad, dtype=np.bool_)
+        self.polinizada = np.zeros(capacidad, dtype=np.bool_)
+        self.pesticidas = np.zeros(capacidad, dtype=np.int8)
+        self.turnos_muerta = np.zeros(capacidad, dtype=np.int16)
+        self.vida = np.zeros(capacidad, dtype=np.int16)
+        self.max_vida = np.zeros(capacidad, dtype=np.int16)
+        self.ocupada = np.zeros(capacidad, dtype=np.bool_)
+
+    def _ampliar(self):
+        """Duplica la capacidad de la estructura de flores."""
+        anterior = len(self.ocupada)
+        for nombre in self._ARRAYS_FLORES:
+            array = getattr(self, nombre)
+            setattr(self, nombre, np.concatenate((array, np.zeros_like(array))))
+        self._vistas.extend([None] * anterior)
+        self._libres.extend(range(2 * anterior - 1, anterior - 1, -1))
+
+    # === Flores ===
+
+    def agregar_flor(self, pos, flor):
+        """Coloca una flor en una celda (se asume vacía) copiando su estado a los arrays."""
+        if not self._libres:
+            self._ampliar()
+        i = self._libres.pop()
+        (self.vida[i], self.polinizada[i], self.pesticidas[i],
+         self.viva[i], self.turnos_muerta[i]) = flor.capturar_estado()
+        self.max_vida[i] = flor.max_vida
+        self.ocupada[i] = True
+        self.celdas[pos] = FLOR
+        self.indice_flor[pos] = i
+        self._celda_cambiada(pos)
+
+        vista = FlorVista(self, i, pos)
+        vista.orden = self._siguiente_orden
+        self._siguiente_orden += 1
+        self._vistas[i] = vista
+        self.flores.append((pos, vista))
+        self.flor_actualizada(vista, (0, 0, 0, 0), vista.aporte())
+        if not vista.esta_viva():
+            self._programar_retirada(pos, vista.turnos_muerta)
+
+    def _retirar_celda_flor(self, pos):
+        self._liberar(self._vistas[self.indice_flor[pos]])
+        super()._retirar_celda_flor(pos)
+
+    def _liberar(self, flor):
+        i = flor.indice
+        flor.observador = None
+        self.ocupada[i] = False
+        self._vistas[i] = None
+        self._libres.append(i)
+        self.indice_flor[flor.posicion] = -1
+
+    # === Consultas O(1) ===
+
+    def get_celda(self, fila, col):
+        """Retorna el contenido de una celda con seguridad de límites."""
+        if 0 <= fila < self.filas and 0 <= col < self.columnas:
+            tipo = self.celdas[fila, col]
+            if tipo == FLOR:
+                return self._vistas[self.indice_flor[fila, col]]
+            if tipo == OBSTACULO:
+                return "OBSTACULO"
+            if tipo == COLMENA:
+                return "COLMENA"
+        return None
+
+    def es_obstaculo(self, fila, col):
+        return 0 <= fila < self.filas and 0 <= col < self.columnas and self.celdas[fila, col] == OBSTACULO
+
+    def es_flor(self, fila, col):
+        return 0 <= fila < self.filas and 0 <= col < self.columnas and self.celdas[fila, col] == FLOR
+
+    def es_transitable(self, fila, col):
+        return 0 <= fila < self.filas and 0 <= col < self.columnas and self.celdas[fila, col] != OBSTACULO
+
+    # === Obstáculos ===
+
+    def quitar_obstaculo(self, fila, col):
+        """Retira un obstáculo; retorna su índice en la cola FIFO (o None si no existía)."""
+        if self.celdas[fila, col] != OBSTACULO:
+            return None
+        return super().quitar_obstaculo(fila, col)
+
+    # === Flores (vectorizado) ===
+
+    def calcular_agregados(self):
+        """Agregados recalculados desde cero sobre los arrays."""
+        vivas = self.ocupada & self.viva
+        pesticidas = self.pesticidas[vivas]
+        return (int(np.count_nonzero(vivas)), int(np.count_nonzero(self.polinizada[vivas])),
+                int(np.count_nonzero(pesticidas)), int(pesticidas.sum()))
+
+    def get_flores_vivas(self):
+        return [(pos, flor) for pos, flor in self.flores if self.viva[flor.indice]]
@@ -0,0 +1,90 @@
+"""
+Caché LRU de evaluaciones de la heurística.
+Evita reevaluar hojas idénticas dentro de una búsqueda y entre búsquedas.
+"""
+
+import sys
+from collections import OrderedDict
+
+from .heuristica import Heuristica
+
+
+class CacheEvaluacion:
+    """
+    Memoriza `Heuristica.evaluar` con desalojo LRU.
+
+    Se usa en lugar de la heurística (mismo `evaluar` y mismas cotas), tanto en
+    los motores de la partida como en ejecuciones por lotes sin interfaz.
+
+    La clave solo contiene lo que lee la heurística: la firma de las flores
+    vivas que mantiene el tablero (`Board.firma_flores`), el estado de la abeja,
+    el néctar de la colmena, su posición y el número de obstáculos. Así, dos
+    hojas que solo difieren en dónde está un obstáculo, o ramas de clima sin
+    efecto, comparten entrada. Si la heurística usa distancias reales
+    (`rutas`), la clave incluye además las posiciones de los obstáculos.
+
+    El tamaño se limita por entradas (`max_entradas`) y, opcionalmente, por
+    bytes estimados (`max_bytes`). Contadores: aciertos, fallos y desalojos.
+    """
+
+    def __init__(self, heuristica=None, max_entradas=1 << 17, max_bytes=None):
+        self.heuristica = heuristica if heuristica else Heuristica()
+        self.COTA_INFERIOR = self.heuristica.COTA_INFERIOR
+        self.COTA_SUPERIOR = self.heuristica.COTA_SUPERIOR
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.rutas = getattr(self.heuristica, 'rutas', False)
+        self._entradas = OrderedDict()
+        self.bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    @staticmethod
+    def clave(estado):
+        abeja = estado.abeja
+        tablero = estado.tablero
+        return (tablero.firma_flores, estado.pos_abeja, abeja.vida, abeja.energia, abeja.nectar_cargado,
+                abeja.max_vida, abeja.max_energia, abeja.capacidad_nectar,
+                tablero.nectar_en_colmena, tablero.pos_colmena, len(tablero.obstaculos))
+
+    def evaluar(self, estado):
+        clave = self.clave(estado)
+        if self.rutas:
+            clave += (frozenset(estado.tablero.obstaculos),)
+        valor = self._entradas.get(clave)
+        if valor is not None:
+            self._entradas.move_to_end(clave)
+            self.aciertos += 1
+            return valor
+
+        self.fallos += 1
+        valor = self.heuristica.evaluar(estado)
+        self._entradas[clave] = valor
+        self.bytes_usados += self._tamaño_entrada(clave, valor)
+        self._desalojar()
+        return valor
+
+    def _desalojar(self):
+        while self._entradas and (len(self._entradas) > self.max_entradas or
+                                  (self.max_bytes is not None and self.bytes_usados > self.max_bytes)):
+            clave, valor = self._entradas.popitem(last=False)
+            self.bytes_usados -= self._tamaño_entrada(clave, valor)
+            self.desalojos += 1
+
+    @staticmethod
+    def _tamaño_entrada(clave, valor):
+        # Tupla clave + float + nodo del OrderedDict (estimación, los enteros pequeños son compartidos)
+        return sys.getsizeof(clave) + sys.getsizeof(valor) + 100
+
+    def limpiar(self):
+        self._entradas.clear()
+        self.bytes_usados = 0
+
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def num_entradas(self):
+        # Sin __len__: los motores comprueban la heurística por veracidad (`heuristica if heuristica else ...`)
+        return len(self._entradas)
@@ -0,0 +1,284 @@
+"""
+Campos de distancia para los términos posicionales de la heurística y la navegación.
+Sustituyen el recorrido de todas las flores (o una búsqueda) por una consulta a la celda de la abeja.
+"""
+
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, deque
+from math import lcm
+
+# 8 direcciones, en orden de índice de celda creciente
+DIRECCIONES = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+class TablaVecinos:
+    """
+    Celdas adyacentes dentro del tablero para un tamaño de tablero (compartida
+    por todos los tableros de ese tamaño), en el orden de DIRECCIONES.
+
+    Hasta MAX_CELDAS se precalculan en una lista indexada por f * columnas + c
+    (las tuplas de posición también se comparten); en tableros mayores se
+    calculan en cada consulta. El registro por tamaño se rellena con cerrojo
+    (el hilo de ponderación también crea tableros); la tabla no cambia después.
+    """
+
+    _por_tamaño = {}
+    _cerrojo = threading.Lock()
+
+    MAX_CELDAS = 1 << 14
+
+    @classmethod
+    def para(cls, filas, columnas):
+        tabla = cls._por_tamaño.get((filas, columnas))
+        if tabla is None:
+            with cls._cerrojo:
+                tabla = cls._por_tamaño.get((filas, columnas))
+                if tabla is None:
+                    tabla = cls(filas, columnas)
+                    cls._por_tamaño[(filas, columnas)] = tabla
+        return tabla
+
+    def __init__(self, filas, columnas):
+        self.filas = filas
+        self.columnas = columnas
+        self._tabla = None
+        if filas * columnas <= self.MAX_CELDAS:
+            celdas = [(f, c) for f in range(filas) for c in range(columnas)]
+            self._tabla = [tuple(celdas[(f + df) * columnas + c + dc] for df, dc in DIRECCIONES
+                                 if 0 <= f + df < filas and 0 <= c + dc < columnas)
+                           for f, c in celdas]
+
+    def vecinos(self, pos):
+        """Tupla de celdas adyacentes (no modificar)."""
+        if self._tabla is not None:
+            return self._tabla[pos[0] * self.columnas + pos[1]]
+        f, c = pos
+        return tuple((f + df, c + dc) for df, dc in DIRECCIONES
+                     if 0 <= f + df < self.filas and 0 <= c + dc < self.columnas)
+
+
+class CampoColmena:
+    """
+    Distancia en movimientos (8 direcciones, esquivando obstáculos) de cada
+    celda a la colmena, por BFS inverso desde la colmena. -1 si no se llega.
+
+    El tablero lo crea al pedirlo y lo descarta cuando cambian los obstáculos
+    o la colmena. No se modifica después, así que las copias lo comparten.
+    """
+
+    def __init__(self, tablero):
+        self.columnas = tablero.columnas
+        self.tabla = TablaVecinos.para(tablero.filas, tablero.columnas)
+        self.distancias = [-1] * (tablero.filas * tablero.columnas)
+        origen = tablero.pos_colmena
+        if origen is None:
+            return
+        columnas = self.columnas
+        distancias = self.distancias
+        vecinos = self.tabla.vecinos
+        es_transitable = tablero.es_transitable
+        distancias[origen[0] * columnas + origen[1]] = 0
+        cola = deque([origen])
+        while cola:
+            actual = cola.popleft()
+            d = distancias[actual[0] * columnas + actual[1]] + 1
+            for vecino in vecinos(actual):
+                i = vecino[0] * columnas + vecino[1]
+                if distancias[i] < 0 and es_transitable(vecino[0], vecino[1]):
+                    distancias[i] = d
+                    cola.append(vecino)
+
+    def distancia(self, pos):
+        """Movimientos hasta la colmena, o None si no hay camino."""
+        d = self.distancias[pos[0] * self.columnas + pos[1]]
+        return d if d >= 0 else None
+
+    def ruta(self, inicio, rng=None):
+        """
+        Camino mínimo de `inicio` a la colmena (incluidos ambos), o [] si no hay.
+        Se baja por el campo paso a paso; entre los pasos empatados se elige el
+        primero o, si se pasa un generador `rng`, uno al azar. O(longitud del camino).
+        """
+        columnas = self.columnas
+        distancias = self.distancias
+        d = distancias[inicio[0] * columnas + inicio[1]]
+        if d < 0:
+            return []
+        camino = [inicio]
+        actual = inicio
+        while d > 0:
+            d -= 1
+            candidatos = [vecino for vecino in self.tabla.vecinos(actual)
+                          if distancias[vecino[0] * columnas + vecino[1]] == d]
+            actual = rng.choice(candidatos) if rng is not None and len(candidatos) > 1 else candidatos[0]
+            camino.append(actual)
+        return camino
+
+
+class LineasObstaculos:
+    """
+    Obstáculos del tablero por filas y por columnas (listas ordenadas), para
+    saltar en línea recta sin recorrer celda a celda (Jump Point Search).
+    Como CampoColmena, el tablero lo descarta al cambiar los obstáculos y las
+    copias lo comparten.
+    """
+
+    def __init__(self, tablero):
+        self.filas = tablero.filas
+        self.columnas = tablero.columnas
+        self.celdas = set(tablero.obstaculos)
+        self.por_fila = {}
+        self.por_columna = {}
+        # Recorriendo en orden (fila, columna) ambas listas quedan ordenadas
+        for f, c in sorted(self.celdas):
+            self.por_fila.setdefault(f, []).append(c)
+            self.por_columna.setdefault(c, []).append(f)
+
+    def libre(self, f, c):
+        return 0 <= f < self.filas and 0 <= c < self.columnas and (f, c) not in self.celdas
+
+    def salto_recto(self, f, c, df, dc, objetivo):
+        """
+        Primer punto de salto avanzando desde (f, c) en horizontal o vertical:
+        el objetivo o una celda con vecino forzado (obstáculo al lado y libre
+        justo delante de él). None si antes se llega a un obstáculo o al borde.
+        """
+        if dc:
+            lineas, x, paso, limite = self.por_fila, c, dc, self.columnas
+            linea, meta = f, (objetivo[1] if objetivo[0] == f else None)
+        else:
+            lineas, x, paso, limite = self.por_columna, f, df, self.filas
+            linea, meta = c, (objetivo[0] if objetivo[1] == c else None)
+
+        # Primer obstáculo (o borde) de la propia línea
+        propia = lineas.get(linea, ())
+        if paso > 0:
+            i = bisect_right(propia, x)
+            fin = propia[i] if i < len(propia) else limite
+        else:
+            i = bisect_left(propia, x) - 1
+            fin = propia[i] if i >= 0 else -1
+
+        if meta is not None and (meta - x) * paso > 0 and (fin - meta) * paso > 0:
+            fin = meta
+            mejor = meta
+        else:
+            mejor = None
+        for adyacente in (lineas.get(linea - 1), lineas.get(linea + 1)):
+            if adyacente:
+                o = self._forzado(adyacente, x, paso, fin, limite)
+                if o is not None:
+                    fin = mejor = o
+        return None if mejor is None else ((f, mejor) if dc else (mejor, c))
+
+    @staticmethod
+    def _forzado(adyacente, x, paso, fin, limite):
+        """Primer obstáculo de la línea vecina entre x y fin (exclusivos) con la celda siguiente libre."""
+        if paso > 0:
+            i = bisect_right(adyacente, x)
+            while i < len(adyacente) and adyacente[i] < fin:
+                o = adyacente[i]
+                if o + 1 < limite and (i + 1 == len(adyacente) or adyacente[i + 1] != o + 1):
+                    return o
+                i += 1
+        else:
+            i = bisect_left(adyacente, x) - 1
+            while i >= 0 and adyacente[i] > fin:
+                o = adyacente[i]
+                if o > 0 and (i == 0 or adyacente[i - 1] != o - 1):
+                    return o
+                i -= 1
+        return None
+
+
+class CamposDistancia:
+    """
+    Tablas por celda sobre las flores 'limpias' (vivas y sin pesticida):
+        - Distancia Chebyshev a la flor limpia más cercana (`_h_proximidad`).
+        - Suma de 10 / max(1, dist) a todas ellas (`_h_amenaza`).
+
+    Cada celda consultada guarda un histograma de flores limpias por distancia,
+    la distancia mínima y la suma escalada por mcm(1..dist_max) como entero, así
+    que la suma es exacta y el resultado es su redondeo correcto a float. Las dos
+    consultas son O(1) sobre una celda ya calculada; calcular una celda nueva
+    recorre las flores limpias.
+
+    Cuando una flor pasa a estar limpia o deja de estarlo, el tablero lo notifica
+    y se actualizan todas las celdas ya calculadas: O(celdas en caché) sumas de
+    enteros grandes (mcm(1..dist_max) tiene ~0.43 * dist_max dígitos: 867 en un
+    tablero de 2000x2000, donde una notificación con la caché llena ronda el
+    milisegundo). Si una celda pierde su última flor a la distancia mínima, el
+    nuevo mínimo se busca subiendo por el histograma.
+
+    Solo se guardan `max_celdas` celdas (las posiciones que visita la abeja
+    en la búsqueda), que acotan también el coste de cada notificación; al
+    llenarse se desaloja la celda consultada hace más tiempo (LRU).
+    """
+
+    def __init__(self, tablero, max_celdas=1024):
+        self.max_celdas = max_celdas
+        self.dist_max = max(1, tablero.filas - 1, tablero.columnas - 1)
+        self.escala = lcm(*range(1, self.dist_max + 1))
+        self.limpias = {pos for pos, flor in tablero.flores if flor.esta_viva() and flor.pesticidas == 0}
+        self._celdas = OrderedDict()
+
+    def flor_limpia(self, pos, signo):
+        """Notificación: la flor en `pos` pasa a estar limpia (+1) o deja de estarlo (-1)."""
+        if signo > 0:
+            self.limpias.add(pos)
+        else:
+            self.limpias.discard(pos)
+        for celda, (suma, cuentas, minima) in self._celdas.items():
+            d = max(abs(celda[0] - pos[0]), abs(celda[1] - pos[1]))
+            cuentas[d] += signo
+            if signo > 0:
+                if minima is None or d < minima:
+                    minima = d
+            elif d == minima and not cuentas[d]:
+                minima = self._minima(cuentas, d + 1)
+            self._celdas[celda] = (suma + signo * (self.escala // max(1, d)), cuentas, minima)
+
+    @staticmethod
+    def _minima(cuentas, desde=0):
+        """Primera distancia con flores del histograma a partir de `desde`, o None."""
+        for d in range(desde, len(cuentas)):
+            if cuentas[d]:
+                return d
+        return None
+
+    def _datos(self, celda):
+        datos = self._celdas.get(celda)
+        if datos is not None:
+            self._celdas.move_to_end(celda)
+        else:
+            if len(self._celdas) >= self.max_celdas:
+                self._celdas.popitem(last=False)
+            suma = 0
+            cuentas = [0] * (self.dist_max + 1)
+            for pos in self.limpias:
+                d = max(abs(celda[0] - pos[0]), abs(celda[1] - pos[1]))
+                cuentas[d] += 1
+                suma += self.escala // max(1, d)
+            datos = (suma, cuentas, self._minima(cuentas))
+            self._celdas[celda] = datos
+        return datos
+
+    def distancia_flor_limpia(self, celda):
+        """Distancia a la flor limpia más cercana, o None si no hay ninguna."""
+        return self._datos(celda)[2]
+
+    def amenaza(self, celda):
+        """Suma de 10 / max(1, dist) a las flores limpias."""
+        return 10 * self._datos(celda)[0] / self.escala
+
+    def __deepcopy__(self, memo):
+        # Las tablas se reconstruyen bajo demanda: la copia solo hereda las flores limpias
+        copia = CamposDistancia.__new__(CamposDistancia)
+        copia.max_celdas = self.max_celdas
+        copia.dist_max = self.dist_max
+        copia.escala = self.escala
+        copia.limpias = set(self.limpias)
+        copia._celdas = OrderedDict()
+        memo[id(self)] = copia
+        return copia
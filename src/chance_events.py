@@ -1,4 +1,5 @@
 import random
+from .config import CONFIG_AZAR, campo_config
 from .flower import Flower
 
 class ChanceEvents:
@@ -7,19 +8,32 @@ class ChanceEvents:
     Actúa como el nodo 'CHANCE' en la lógica del juego.
     """
 
-    def __init__(self):
-        # Configuración de Clima
-        self.frecuencia_clima = 4
-        self.prob_lluvia = 0.10
-        self.prob_sol = 0.15
+    __slots__ = ('config', 'clima_actual')
 
-        # Configuración de Reproducción
-        self.prob_reproduccion_base = 0.20
-        self.bonus_reproduccion_sol = 0.20
+    frecuencia_clima = campo_config('frecuencia_clima')
+    prob_lluvia = campo_config('prob_lluvia')
+    prob_sol = campo_config('prob_sol')
+    prob_reproduccion_base = campo_config('prob_reproduccion_base')
+    bonus_reproduccion_sol = campo_config('bonus_reproduccion_sol')
+
+    def __init__(self, config=CONFIG_AZAR):
+        # Configuración de Clima y Reproducción (compartida)
+        self.config = config
 
         # Estado
         self.clima_actual = "Normal"
 
+    def clonar(self):
+        """Copia del clima actual; la configuración se comparte."""
+        copia = ChanceEvents(self.config)
+        copia.clima_actual = self.clima_actual
+        return copia
+
+    __copy__ = clonar
+
+    def __deepcopy__(self, memo):
+        return self.clonar()
+
     def debe_activar_evento(self, turno_actual):
         """Determina si en este turno corresponde ejecutar eventos climáticos."""
         return turno_actual > 0 and turno_actual % self.frecuencia_clima == 0
@@ -37,12 +51,17 @@ class ChanceEvents:
 
         return self.clima_actual
 
-    def aplicar_efectos_clima(self, tablero):
-        """Aplica los cambios inmediatos que el clima provoca en el tablero."""
+    def aplicar_efectos_clima(self, tablero, registro=None):
+        """
+        Aplica los cambios inmediatos que el clima provoca en el tablero.
+        Si se pasa `registro`, anota el estado previo de cada flor modificada.
+        """
         if self.clima_actual == "Lluvia":
             # La lluvia limpia pesticidas
             for _, flor in tablero.flores:
                 if flor.esta_viva() and flor.pesticidas > 0:
+                    if registro is not None:
+                        registro.append(('flor', flor, flor.capturar_estado()))
                     flor.reducir_pesticida(1)
 
         # Sol y Normal no tienen efectos inmediatos sobre el tablero,
@@ -55,8 +74,12 @@ class ChanceEvents:
             prob += self.bonus_reproduccion_sol
         return prob
 
-    def intentar_reproduccion(self, tablero, pos_flor):
-        """Intenta reproducir una flor específica en una casilla adyacente vacía."""
+    def intentar_reproduccion(self, tablero, pos_flor, rng=None, registro=None):
+        """
+        Intenta reproducir una flor específica en una casilla adyacente vacía.
+        Si se pasa `registro`, anota la flor añadida para poder deshacerlo.
+        """
+        rng = rng or random
         fila, col = pos_flor
         flor = tablero.get_celda(fila, col)
 
@@ -65,7 +88,7 @@ class ChanceEvents:
             return False, None
 
         # Tirada de dados
-        if random.random() > self.obtener_probabilidad_reproduccion():
+        if rng.random() > self.obtener_probabilidad_reproduccion():
             return False, None
 
         # Buscar espacio libre
@@ -75,12 +98,12 @@ class ChanceEvents:
             return False, None
 
         # Crear nueva flor
-        nueva_pos = random.choice(vecinos)
+        nueva_pos = rng.choice(vecinos)
         nueva_flor = Flower()
 
-        # Inserción manual en el tablero
-        tablero.grid[nueva_pos[0]][nueva_pos[1]] = nueva_flor
-        tablero.flores.append((nueva_pos, nueva_flor))
+        tablero.agregar_flor(nueva_pos, nueva_flor)
+        if registro is not None:
+            registro.append(('agregar_flor', nueva_pos))
 
         return True, nueva_pos
 
@@ -122,20 +145,26 @@ class ChanceEvents:
         self.aplicar_efectos_clima(tablero)
 
         # Reproducción
-        nuevas = 0
+        nuevas = self.aplicar_reproduccion(tablero)
+
+        return {
+            "clima": self.clima_actual,
+            "nuevas_flores": len(nuevas)
+        }
+
+    def aplicar_reproduccion(self, tablero, rng=None, registro=None):
+        """Intenta reproducir cada flor polinizada. Retorna las posiciones de las flores nuevas."""
+        nuevas = []
         # Iteramos sobre una copia para no romper el bucle al añadir flores
         flores_actuales = list(tablero.flores)
 
         for pos, flor in flores_actuales:
             if flor.esta_polinizada():
-                exito, _ = self.intentar_reproduccion(tablero, pos)
+                exito, nueva_pos = self.intentar_reproduccion(tablero, pos, rng, registro)
                 if exito:
-                    nuevas += 1
+                    nuevas.append(nueva_pos)
 
-        return {
-            "clima": self.clima_actual,
-            "nuevas_flores": nuevas
-        }
+        return nuevas
 
     def reset_clima(self):
         self.clima_actual = "Normal"
\ No newline at end of file
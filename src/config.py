@@ -0,0 +1,29 @@
+"""
+Configuración inmutable de las entidades del juego.
+Se separa del estado mutable para que todas las copias de un estado la compartan.
+"""
+
+from collections import namedtuple
+
+ConfigAbeja = namedtuple('ConfigAbeja', [
+    'max_vida', 'max_energia', 'capacidad_nectar',
+    'daño_ataque', 'coste_movimiento', 'coste_recoleccion', 'nectar_por_flor',
+    'factor_a_star',
+])
+
+ConfigHumanidad = namedtuple('ConfigHumanidad', ['radio_pesticida', 'radio_obstaculo', 'max_obstaculos'])
+
+ConfigAzar = namedtuple('ConfigAzar', [
+    'frecuencia_clima', 'prob_lluvia', 'prob_sol',
+    'prob_reproduccion_base', 'bonus_reproduccion_sol',
+])
+
+# Valores por defecto (una única instancia compartida)
+CONFIG_HUMANIDAD = ConfigHumanidad(radio_pesticida=2, radio_obstaculo=3, max_obstaculos=4)
+CONFIG_AZAR = ConfigAzar(frecuencia_clima=4, prob_lluvia=0.10, prob_sol=0.15,
+                         prob_reproduccion_base=0.20, bonus_reproduccion_sol=0.20)
+
+
+def campo_config(nombre):
+    """Propiedad de solo lectura que expone el campo `nombre` de `self.config`."""
+    return property(lambda self: getattr(self.config, nombre))
@@ -1,6 +1,11 @@
-import copy
+import time
+from .bee import Bee
+from .humanidad import Humanidad
+from .chance_events import ChanceEvents
+from .config import ConfigAbeja, ConfigHumanidad, ConfigAzar
 from .game_manager import GameManager
 from .heuristica import Heuristica
+from .zobrist import ZobristHash, TablaTransposicion
 
 class GameState:
     """
@@ -8,6 +13,8 @@ class GameState:
     Se usa para simular turnos futuros sin afectar el juego real.
     """
 
+    __slots__ = ('tablero', 'abeja', 'pos_abeja', 'humanidad', 'eventos_azar', 'turno', 'hash')
+
     def __init__(self, tablero, abeja, pos_abeja, humanidad, eventos_azar, turno):
         self.tablero = tablero
         self.abeja = abeja
@@ -15,125 +22,671 @@ class GameState:
         self.humanidad = humanidad
         self.eventos_azar = eventos_azar
         self.turno = turno
+        # Hash Zobrist incremental (solo lo mantiene el motor si usa tabla de transposición)
+        self.hash = None
 
     def clonar(self):
         """
-        Crea una copia profunda del estado.
+        Crea una copia independiente del estado.
+        Cada entidad se copia con su propio `clonar`: se duplica solo el estado
+        mutable y la configuración inmutable se comparte.
         """
-        return GameState(
-            copy.deepcopy(self.tablero),
-            copy.deepcopy(self.abeja),
+        clon = GameState(
+            self.tablero.clonar(),
+            self.abeja.clonar(),
             self.pos_abeja,  # Tupla es inmutable, no necesita copia
-            copy.deepcopy(self.humanidad),
-            copy.deepcopy(self.eventos_azar),
+            self.humanidad.clonar(),
+            self.eventos_azar.clonar(),
+            self.turno
+        )
+        clon.hash = self.hash
+        return clon
+
+    __copy__ = clonar
+
+    def __deepcopy__(self, memo):
+        return self.clonar()
+
+    def compactar(self):
+        """
+        Representación compacta y serializable del estado (tuplas de primitivos y
+        la clase del tablero, que se serializa por nombre).
+        Se usa para enviar estados a procesos de trabajo sin copiar objetos completos.
+        """
+        abeja = self.abeja
+        azar = self.eventos_azar
+        return (
+            (type(self.tablero), self.tablero.compactar()),
+            (abeja.capturar_estado(), tuple(abeja.config)),
+            self.pos_abeja,
+            tuple(self.humanidad.config),
+            (azar.clima_actual, tuple(azar.config)),
             self.turno
         )
 
+    @classmethod
+    def desde_compacto(cls, datos):
+        """Reconstruye un estado a partir de `compactar` con la misma clase de tablero."""
+        datos_tablero, datos_abeja, pos_abeja, datos_humanidad, datos_azar, turno = datos
+
+        estado_abeja, config_abeja = datos_abeja
+        abeja = Bee(config=ConfigAbeja(*config_abeja))
+        abeja.restaurar_estado(estado_abeja)
+
+        humanidad = Humanidad(ConfigHumanidad(*datos_humanidad))
+
+        clima, config_azar = datos_azar
+        azar = ChanceEvents(ConfigAzar(*config_azar))
+        azar.clima_actual = clima
+
+        clase_tablero, datos_tablero = datos_tablero
+        return cls(clase_tablero.desde_compacto(datos_tablero), abeja, pos_abeja, humanidad, azar, turno)
+
+    def deshacer(self, registro):
+        """
+        Revierte in situ los cambios anotados en `registro` (en orden inverso).
+        Cada entrada es una tupla compacta cuyo primer elemento indica el tipo.
+        """
+        for entrada in reversed(registro):
+            tipo = entrada[0]
+            if tipo == 'flor':
+                entrada[1].restaurar_estado(entrada[2])
+            elif tipo == 'abeja':
+                self.abeja.restaurar_estado(entrada[1])
+            elif tipo == 'pos':
+                self.pos_abeja = entrada[1]
+            elif tipo == 'colmena':
+                self.tablero.nectar_en_colmena = entrada[1]
+            elif tipo == 'clima':
+                self.eventos_azar.clima_actual = entrada[1]
+            elif tipo == 'turno':
+                self.turno = entrada[1]
+            elif tipo == 'hash':
+                self.hash = entrada[1]
+            elif tipo == 'colocar_obstaculo':
+                self.tablero.quitar_obstaculo(entrada[1][0], entrada[1][1])
+            elif tipo == 'quitar_obstaculo':
+                self.tablero.restaurar_obstaculo(entrada[1][0], entrada[1][1], entrada[2])
+            elif tipo == 'agregar_flor':
+                self.tablero.quitar_flor(entrada[1][0], entrada[1][1])
+
+
+class _TiempoAgotado(Exception):
+    """Se lanza dentro de la búsqueda cuando se supera el límite de tiempo o se cancela."""
+
 
 class ExpectimaxAI:
     """
     Motor de decisión para la Abeja (Agente MAX).
     Explora el árbol de juego considerando a la Humanidad (MIN) y el Clima (CHANCE).
+
+    Modos de aplicación de jugadas:
+        - 'deshacer': la búsqueda recorre un único estado mutable; cada jugada
+          anota un registro compacto que se revierte al volver del hijo.
+        - 'clonar': copia profunda del estado en cada nodo (modo de referencia).
+
+    Si se pasa una `tabla_transposicion`, el motor mantiene un hash Zobrist
+    incremental del estado y reutiliza los valores de posiciones ya evaluadas
+    con la misma profundidad restante y tipo de nodo. Solo se consulta desde
+    `PROFUNDIDAD_MINIMA_TT` (antes no hay transposiciones posibles) y en nodos
+    con al menos `RESTANTE_MINIMO_TT` plies por delante; las jugadas que solo
+    llevan a nodos que no se consultan no actualizan el hash. El orden FIFO de
+    los obstáculos forma parte de la clave cuando aún puede retirarse alguno
+    en el horizonte.
+
+    Con `poda=True` se propagan ventanas (alfa, beta) por los nodos MAX/MIN
+    (poda alfa-beta) y CHANCE (Star1), usando como cotas los valores
+    terminales de la heurística. El valor de la raíz y la acción elegida
+    coinciden con la búsqueda sin poda.
+
+    Si se pasa `deadline_ms` a los puntos de entrada, la búsqueda profundiza
+    de un nivel en uno hasta `max_depth` y devuelve el resultado de la última
+    iteración completada (ver `profundidad_alcanzada`).
+
+    Con un `ordenador` (ver OrdenadorAcciones) las jugadas se exploran en orden
+    de prometedoras primero en lugar de en orden aleatorio.
+
+    Con un `arbol` (ver ArbolBusqueda) los nodos completados guardan el valor de
+    sus hijos entre búsquedas: al empezar cada una se promueve el subárbol de la
+    nueva raíz, los nodos MAX/MIN guardados exploran primero la jugada que fue
+    mejor la vez anterior y la raíz se salta las iteraciones ya completadas.
+
+    Los nodos CHANCE siguen el calendario del juego: solo hay evento de azar en
+    los turnos que marca `ChanceEvents.debe_activar_evento` (cada jugada de la
+    Abeja avanza el turno); en el resto el nodo es un paso directo. Además, con
+    `fusionar_azar=True` los climas que llevan al mismo estado se exploran una
+    sola vez con la probabilidad sumada (False enumera los tres, como referencia).
+
+    Con un `reductor` (ver ReductorObstaculos) los nodos MIN buscan un solo
+    obstáculo por clase de jugadas equivalentes dentro del horizonte.
+
+    Con un `muestreo` (ver MuestreoAzar) los nodos CHANCE no enumeran los climas:
+    sortean k resultados completos (clima + reproducción de flores) y promedian.
+
+    `cancelacion` admite un objeto con `is_set()` (p. ej. threading.Event):
+    si se activa, la búsqueda con `deadline_ms` se aborta como si se agotara el tiempo.
     """
 
-    def __init__(self, max_depth=3, heuristica=None, nectar_objetivo=GameManager().nectar_objetivo):
+    MODOS = ('deshacer', 'clonar')
+
+    # Una transposición necesita dos jugadas del mismo bando que se puedan permutar:
+    # con raíz MIN, la primera posible es el nodo CHANCE que sigue al segundo nodo
+    # MIN (la raíz y el de profundidad 2). Por encima, sondear la tabla solo cuesta.
+    PROFUNDIDAD_MINIMA_TT = 3
+    # Con un ply restante un acierto solo ahorra evaluar una hoja: sale más caro
+    # mantener el hash y consultar la tabla en todos esos nodos
+    RESTANTE_MINIMO_TT = 2
+    # Plies desde cada tipo de nodo hasta el siguiente nodo MIN
+    _HASTA_MIN = {'MIN': 0, 'MAX': 1, 'CHANCE': 2}
+
+    def __init__(self, max_depth=3, heuristica=None, nectar_objetivo=GameManager().nectar_objetivo,
+                 modo='deshacer', tabla_transposicion=None, poda=False, ordenador=None,
+                 muestreo=None, fusionar_azar=True, reductor=None, arbol=None):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo desconocido: {modo}")
         self.max_depth = max_depth
         self.nodos_explorados = 0
         self.heuristica = heuristica if heuristica else Heuristica()
         self.nectar_objetivo = nectar_objetivo
-
-    def get_mejor_accion(self, estado):
-        """Entrada principal: Retorna la mejor acción calculada."""
+        self.modo = modo
+        self.valor_mejor_accion = None
+        self.tabla = tabla_transposicion
+        self.arbol = arbol
+        # Ni el modelo exhaustivo ni el muestreo consultan el clima actual (se fija o sortea
+        # en cada nodo de azar): no se incluye en el hash
+        usa_hash = tabla_transposicion is not None or arbol is not None
+        self.zobrist = ZobristHash(incluir_clima=False) if usa_hash else None
+        # Profundidad restante mínima de los nodos cuyo hash se consulta: el árbol
+        # enlaza los hijos de sus nodos, la tabla solo sondea desde RESTANTE_MINIMO_TT
+        self._restante_hash = 1 if arbol is not None else self.RESTANTE_MINIMO_TT
+        self.poda = poda
+        self.cota_inferior = self.heuristica.COTA_INFERIOR
+        self.cota_superior = self.heuristica.COTA_SUPERIOR
+        self.profundidad_alcanzada = 0
+        self._limite_tiempo = None
+        self.ordenador = ordenador
+        self.cancelacion = None
+        self.muestreo = muestreo
+        self.fusionar_azar = fusionar_azar
+        self.reductor = reductor
+        # La reducción exacta solo agrupa obstáculos si la evaluación y el azar no dependen de su posición
+        self._posiciones_importan = getattr(self.heuristica, 'rutas', False) or muestreo is not None
+
+    def get_mejor_accion(self, estado, deadline_ms=None):
+        """Entrada principal: Retorna la mejor acción calculada para la Abeja."""
         self.nodos_explorados = 0
         acciones = self._get_acciones_abeja(estado)
 
         if not acciones:
             return None
 
+        if self.ordenador is not None:
+            self.ordenador.nueva_busqueda()
+            acciones = self.ordenador.ordenar_abeja(acciones, 0)
+
+        # La raíz de la Abeja empieza en profundidad 1: hace falta al menos 2 para expandir
+        return self._profundizar(estado, acciones, self._buscar_raiz_abeja, 'MAX', 2, deadline_ms)
+
+    def get_mejor_accion_humanidad(self, estado, acciones=None, deadline_ms=None):
+        """
+        Retorna la acción de la Humanidad que minimiza la utilidad de la Abeja.
+        Tras cada acción raíz el siguiente nivel es el Clima (CHANCE).
+        """
+        self.nodos_explorados = 0
+        if acciones is None:
+            acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja)
+
+        if not acciones:
+            return None
+
+        if self.ordenador is not None:
+            self.ordenador.nueva_busqueda()
+            acciones = self.ordenador.ordenar_humanidad(estado, acciones, 0)
+
+        return self._profundizar(estado, acciones, self._buscar_raiz_humanidad, 'MIN', 1, deadline_ms)
+
+    def _profundizar(self, estado, acciones, buscar_raiz, tipo_raiz, profundidad_minima, deadline_ms):
+        """
+        Sin `deadline_ms` busca directamente a `max_depth`.
+        Con `deadline_ms` aplica profundización iterativa: la mejor acción de cada
+        iteración se explora primero en la siguiente, y si se agota el tiempo se
+        devuelve el resultado de la última iteración completa. La primera
+        iteración siempre se completa para tener una respuesta.
+        Con `arbol`, las profundidades que la raíz ya tiene resueltas no se repiten.
+        """
+        if self.muestreo is not None:
+            self.muestreo.nueva_busqueda()
+        if self.reductor is not None:
+            self.reductor.nueva_busqueda()
+
+        previo = None
+        if self.arbol is not None:
+            acciones, previo = self._reutilizar_arbol(estado, acciones, tipo_raiz)
+
+        if deadline_ms is None:
+            if previo is not None and previo[0] >= self.max_depth:
+                self.profundidad_alcanzada, accion, valor = previo
+            else:
+                # Trabajamos sobre una copia: la búsqueda nunca toca el estado real
+                accion, valor = buscar_raiz(self._preparar_raiz(estado), acciones)
+                self.profundidad_alcanzada = self.max_depth
+            self.valor_mejor_accion = valor
+            return accion
+
+        limite = time.perf_counter() + deadline_ms / 1000.0
+        profundidad_maxima = self.max_depth
+        accion, valor = None, None
+        inicio = min(profundidad_minima, profundidad_maxima)
+        if previo is not None:
+            # Ya hay respuesta: todas las iteraciones que quedan respetan el límite
+            self.profundidad_alcanzada, accion, valor = previo
+            inicio = self.profundidad_alcanzada + 1
+            self._limite_tiempo = limite
+
+        try:
+            for profundidad in range(inicio, profundidad_maxima + 1):
+                self.max_depth = profundidad
+                if accion is not None:
+                    acciones = [accion] + [a for a in acciones if a != accion]
+
+                try:
+                    # Cada iteración parte de una copia limpia: si se aborta, se descarta
+                    accion, valor = buscar_raiz(self._preparar_raiz(estado), acciones)
+                except _TiempoAgotado:
+                    break
+
+                self.profundidad_alcanzada = profundidad
+                self._limite_tiempo = limite
+                if time.perf_counter() >= limite:
+                    break
+        finally:
+            self.max_depth = profundidad_maxima
+            self._limite_tiempo = None
+
+        self.valor_mejor_accion = valor
+        return accion
+
+    def _reutilizar_arbol(self, estado, acciones, tipo_raiz):
+        """
+        Promueve en el árbol el subárbol del estado raíz y adelanta la mejor acción
+        guardada. Retorna (acciones, previo); `previo` es
+        (profundidad, accion, valor) si la raíz ya se resolvió exactamente a
+        esa profundidad, o None.
+        """
+        hash_raiz = self.zobrist.hash_completo(estado) ^ self.zobrist.h_orden(estado.tablero)
+        self.arbol.promover(hash_raiz)
+        acciones = self._ordenar_por_arbol(hash_raiz, tipo_raiz, acciones)
+        if self.reductor is not None:
+            # El conjunto de jugadas guardado depende del horizonte de la reducción
+            return acciones, None
+
+        previo = self.arbol.resultado_raiz(hash_raiz, tipo_raiz, acciones, TablaTransposicion.EXACTO)
+        if previo is None:
+            return acciones, None
+        restante, accion, valor = previo
+        # Los hijos de la raíz MIN empiezan en profundidad 0, los de la MAX en 1
+        profundidad = restante - 1 if tipo_raiz == 'MIN' else restante
+        if profundidad < 1:
+            return acciones, None
+        return acciones, (profundidad, accion, valor)
+
+    def _ordenar_por_arbol(self, hash_nodo, tipo, acciones):
+        """Adelanta la mejor jugada guardada en el árbol; el resto conserva su orden."""
+        mejor = self.arbol.mejor_jugada(hash_nodo, tipo)
+        if mejor is None:
+            return acciones
+        acciones = list(acciones)
+        if mejor not in acciones:
+            return acciones
+        return [mejor] + [accion for accion in acciones if accion != mejor]
+
+    def _buscar_raiz_abeja(self, estado, acciones):
+        """Nodo MAX raíz. Retorna (mejor_accion, valor)."""
         mejor_valor = float('-inf')
         mejor_accion = None
+        hijos = [] if self.arbol is not None else None
 
         for accion in acciones:
-            nuevo_estado = self._aplicar_accion_abeja(estado, accion)
+            nuevo_estado, registro = self._aplicar_accion_abeja(estado, accion, self._hashear_hijos(0))
             # El siguiente nivel es MIN (Humanidad)
-            valor = self._expectimax(nuevo_estado, 1, 'MIN')
+            valor = self._expectimax(nuevo_estado, 1, 'MIN', max(self.cota_inferior, mejor_valor), self.cota_superior)
+            if hijos is not None:
+                hijos.append((accion, self._hash_arbol(nuevo_estado), valor))
+            self._revertir(nuevo_estado, registro)
 
             if valor > mejor_valor:
                 mejor_valor = valor
                 mejor_accion = accion
 
-        return mejor_accion
+        if hijos:
+            self.arbol.guardar(self._hash_arbol(estado), 'MAX', self.max_depth, TablaTransposicion.EXACTO, hijos)
+        return mejor_accion, mejor_valor
+
+    def _buscar_raiz_humanidad(self, estado, acciones, reducir=True, cota=float('inf')):
+        """
+        Nodo MIN raíz. Retorna (mejor_accion, valor).
+        `reducir=False` omite el reductor en la raíz (las acciones ya vienen reducidas).
+        Con `cota` solo interesan las acciones que bajan de ella: si ninguna lo
+        hace se retorna (None, cota).
+        """
+        if self.reductor is not None and reducir:
+            # Los hijos de la raíz MIN empiezan en profundidad 0
+            acciones = self.reductor.reducir(estado, acciones, self.max_depth + 1, self._posiciones_importan)
+        peor_valor = cota
+        mejor_accion = None
+        hijos = [] if self.arbol is not None else None
+
+        for accion in acciones:
+            nuevo_estado, registro = self._aplicar_accion_humanidad(estado, accion, self._hashear_hijos(-1))
+            valor = self._expectimax(nuevo_estado, 0, 'CHANCE', self.cota_inferior, min(self.cota_superior, peor_valor))
+            if hijos is not None:
+                hijos.append((accion, self._hash_arbol(nuevo_estado), valor))
+            self._revertir(nuevo_estado, registro)
+
+            if valor < peor_valor:
+                peor_valor = valor
+                mejor_accion = accion
+
+        if hijos:
+            # Con una `cota` finita la raíz no es exacta
+            cota_raiz = TablaTransposicion.EXACTO if cota == float('inf') else TablaTransposicion.SUPERIOR
+            self.arbol.guardar(self._hash_arbol(estado), 'MIN', self.max_depth + 1, cota_raiz, hijos)
+        return mejor_accion, peor_valor
+
+    def _expectimax(self, estado, profundidad, tipo_agente, alfa=float('-inf'), beta=float('inf')):
+        """
+        Núcleo recursivo del algoritmo.
+        Con poda activa, el resultado es exacto si queda dentro de (alfa, beta);
+        si es <= alfa es una cota superior y si es >= beta una cota inferior.
+        """
+        # Consulta a la tabla de transposición (solo nodos internos a los que se
+        # puede llegar por más de un camino)
+        restante = self.max_depth - profundidad
+        clave = None
+        if (self.tabla is not None and restante >= self.RESTANTE_MINIMO_TT
+                and profundidad >= self.PROFUNDIDAD_MINIMA_TT):
+            clave = (self._hash_transposicion(estado, restante, tipo_agente), restante, tipo_agente)
+            entrada = self.tabla.buscar(clave)
+            if entrada is not None:
+                valor, cota = entrada
+                if (cota == TablaTransposicion.EXACTO or
+                        (cota == TablaTransposicion.INFERIOR and valor >= beta) or
+                        (cota == TablaTransposicion.SUPERIOR and valor <= alfa)):
+                    return valor
 
-    def _expectimax(self, estado, profundidad, tipo_agente):
-        """Núcleo recursivo del algoritmo."""
         self.nodos_explorados += 1
+        if not self.nodos_explorados & 0xFF:
+            self._comprobar_interrupcion()
 
         # Caso Base: Profundidad máxima o juego terminado
         if profundidad >= self.max_depth or self._es_terminal(estado):
             return self.heuristica.evaluar(estado)
 
+        # Con árbol, cada nodo con horizonte suficiente anota (jugada, hash_hijo, valor) de sus hijos
+        hijos = [] if self.arbol is not None and restante >= self.arbol.min_restante else None
         if tipo_agente == 'MAX':
-            return self._nodo_max(estado, profundidad)
+            valor = self._nodo_max(estado, profundidad, alfa, beta, hijos)
         elif tipo_agente == 'MIN':
-            return self._nodo_min(estado, profundidad)
+            valor = self._nodo_min(estado, profundidad, alfa, beta, hijos)
         elif tipo_agente == 'CHANCE':
-            return self._nodo_chance(estado, profundidad)
-
-        return 0.0
-
-    def _nodo_max(self, estado, profundidad):
+            valor = self._nodo_chance(estado, profundidad, alfa, beta, hijos)
+        else:
+            valor = 0.0
+
+        if clave is not None or hijos:
+            if not self.poda:
+                cota = TablaTransposicion.EXACTO
+            elif valor <= alfa:
+                cota = TablaTransposicion.SUPERIOR
+            elif valor >= beta:
+                cota = TablaTransposicion.INFERIOR
+            else:
+                cota = TablaTransposicion.EXACTO
+            if clave is not None:
+                self.tabla.guardar(clave, valor, cota)
+            if hijos:
+                self.arbol.guardar(self._hash_arbol(estado), tipo_agente, restante, cota, hijos)
+        return valor
+
+    def _hashear_hijos(self, profundidad):
+        """Si las jugadas de un nodo a `profundidad` deben actualizar el hash del hijo."""
+        return self.max_depth - profundidad - 1 >= self._restante_hash
+
+    def _hash_transposicion(self, estado, restante, tipo_agente):
+        """
+        Hash del nodo para la tabla. El orden FIFO de los obstáculos solo se añade
+        si dentro del horizonte aún puede retirarse alguno: si no, dos órdenes del
+        mismo conjunto tienen el mismo valor y se comparte la entrada.
+        """
+        # Jugadas de la Humanidad que quedan (ciclo MIN -> CHANCE -> MAX)
+        desfase = self._HASTA_MIN[tipo_agente]
+        jugadas = (restante - 1 - desfase) // 3 + 1 if restante > desfase else 0
+        tablero = estado.tablero
+        if len(tablero.obstaculos) + jugadas > estado.humanidad.max_obstaculos:
+            return estado.hash ^ self.zobrist.h_orden(tablero)
+        return estado.hash
+
+    def _hash_arbol(self, estado):
+        """Hash del estado con el orden FIFO de los obstáculos (el árbol no conoce el horizonte)."""
+        return estado.hash ^ self.zobrist.h_orden(estado.tablero)
+
+    def _comprobar_interrupcion(self):
+        """Aborta la iteración en curso si se canceló la búsqueda o se agotó el tiempo."""
+        if self.cancelacion is not None and self.cancelacion.is_set():
+            raise _TiempoAgotado()
+        if self._limite_tiempo is not None and time.perf_counter() > self._limite_tiempo:
+            raise _TiempoAgotado()
+
+    def _nodo_max(self, estado, profundidad, alfa, beta, hijos=None):
         """Turno de la Abeja (Maximizar)."""
         acciones = self._get_acciones_abeja(estado)
         if not acciones:
             return self.heuristica.evaluar(estado)
 
+        if self.ordenador is not None:
+            acciones = self.ordenador.ordenar_abeja(acciones, profundidad)
+        if hijos is not None:
+            acciones = self._ordenar_por_arbol(self._hash_arbol(estado), 'MAX', acciones)
+
         mejor_valor = float('-inf')
+        mejor_accion = None
+        corte = False
+        hashear = self._hashear_hijos(profundidad)
         for accion in acciones:
-            nuevo_estado = self._aplicar_accion_abeja(estado, accion)
-            valor = self._expectimax(nuevo_estado, profundidad + 1, 'MIN')
-            mejor_valor = max(mejor_valor, valor)
+            nuevo_estado, registro = self._aplicar_accion_abeja(estado, accion, hashear)
+            valor = self._expectimax(nuevo_estado, profundidad + 1, 'MIN', max(alfa, mejor_valor), beta)
+            if hijos is not None:
+                hijos.append((accion, self._hash_arbol(nuevo_estado), valor))
+            self._revertir(nuevo_estado, registro)
+            if valor > mejor_valor:
+                mejor_valor = valor
+                mejor_accion = accion
 
+            if self.poda and mejor_valor >= beta:
+                corte = True
+                break
+
+        if self.ordenador is not None:
+            self.ordenador.registrar(mejor_accion, profundidad, self.max_depth - profundidad, corte)
         return mejor_valor
 
-    def _nodo_min(self, estado, profundidad):
+    def _nodo_min(self, estado, profundidad, alfa, beta, hijos=None):
         """Turno de la Humanidad (Minimizar)."""
-        acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja)
-        if not acciones:
-            return self._expectimax(estado, profundidad + 1, 'CHANCE')
+        if self.ordenador is not None or self.reductor is not None:
+            acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja,
+                                                                 barajar=False)
+            if not acciones:
+                return self._expectimax(estado, profundidad + 1, 'CHANCE', alfa, beta)
+            if self.reductor is not None:
+                acciones = self.reductor.reducir(estado, acciones, self.max_depth - profundidad,
+                                                 self._posiciones_importan)
+            if self.ordenador is not None:
+                acciones = self.ordenador.ordenar_humanidad(estado, acciones, profundidad)
+        else:
+            # Sin ordenación se recorren directamente del generador: ni lista ni barajado
+            acciones = estado.humanidad.iterar_acciones(estado.tablero, estado.pos_abeja)
+        if hijos is not None:
+            acciones = self._ordenar_por_arbol(self._hash_arbol(estado), 'MIN', acciones)
 
         peor_valor = float('inf')
+        mejor_accion = None
+        corte = False
+        hashear = self._hashear_hijos(profundidad)
+        hay_acciones = False
         for accion in acciones:
-            nuevo_estado = self._aplicar_accion_humanidad(estado, accion)
-            valor = self._expectimax(nuevo_estado, profundidad + 1, 'CHANCE')
-            peor_valor = min(peor_valor, valor)
+            hay_acciones = True
+            nuevo_estado, registro = self._aplicar_accion_humanidad(estado, accion, hashear)
+            valor = self._expectimax(nuevo_estado, profundidad + 1, 'CHANCE', alfa, min(beta, peor_valor))
+            if hijos is not None:
+                hijos.append((accion, self._hash_arbol(nuevo_estado), valor))
+            self._revertir(nuevo_estado, registro)
+            if valor < peor_valor:
+                peor_valor = valor
+                mejor_accion = accion
+
+            if self.poda and peor_valor <= alfa:
+                corte = True
+                break
 
+        if not hay_acciones:
+            return self._expectimax(estado, profundidad + 1, 'CHANCE', alfa, beta)
+        if self.ordenador is not None:
+            self.ordenador.registrar(mejor_accion, profundidad, self.max_depth - profundidad, corte)
         return peor_valor
 
-    def _nodo_chance(self, estado, profundidad):
+    def _nodo_chance(self, estado, profundidad, alfa, beta, hijos=None):
         """Turno del Entorno (Promedio ponderado)."""
-        # Obtenemos probabilidades
-        p_lluvia = estado.eventos_azar.prob_lluvia
-        p_sol = estado.eventos_azar.prob_sol
-        p_normal = 1.0 - (p_lluvia + p_sol)
+        if not estado.eventos_azar.debe_activar_evento(estado.turno):
+            # En este turno no hay evento de azar: el nodo no ramifica
+            valor = self._expectimax(estado, profundidad + 1, 'MAX', alfa, beta)
+            if hijos is not None:
+                hijos.append((None, self._hash_arbol(estado), valor))
+            return valor
+        if self.muestreo is not None:
+            return self._nodo_chance_muestreo(estado, profundidad, hijos)
+        if self.poda:
+            return self._nodo_chance_star1(estado, profundidad, alfa, beta, hijos)
 
         valor_esperado = 0.0
+        hashear = self._hashear_hijos(profundidad)
 
         # Iteramos los posibles climas
-        escenarios = [("Lluvia", p_lluvia), ("Sol", p_sol), ("Normal", p_normal)]
+        for clima, probabilidad in self._escenarios_distintos(estado):
+            # Forzamos el clima y aplicamos efectos
+            estado_simulado, registro = self._aplicar_evento_clima(estado, clima, hashear)
+
+            # Siguiente nivel vuelve a ser MAX (profundidad aumenta)
+            val = self._expectimax(estado_simulado, profundidad + 1, 'MAX')
+            if hijos is not None:
+                hijos.append((clima, self._hash_arbol(estado_simulado), val))
+            self._revertir(estado_simulado, registro)
+            valor_esperado += probabilidad * val
+
+        return valor_esperado
+
+    def _nodo_chance_star1(self, estado, profundidad, alfa, beta, hijos=None):
+        """
+        Nodo CHANCE con poda Star1.
+        Usa las cotas de la heurística [L, U] para acotar el valor de los hijos
+        aún no explorados y cortar en cuanto la media no puede entrar en (alfa, beta).
+        """
+        cota_l, cota_u = self.cota_inferior, self.cota_superior
+        escenarios = self._escenarios_distintos(estado)
+
+        valor_esperado = 0.0          # Suma ponderada de los hijos ya evaluados
+        hashear = self._hashear_hijos(profundidad)
+        prob_restante = 1.0           # Masa de probabilidad aún sin explorar
 
         for clima, probabilidad in escenarios:
-            if probabilidad > 0:
-                estado_simulado = estado.clonar()
-                # Forzamos el clima y aplicamos efectos
-                estado_simulado.eventos_azar.clima_actual = clima
-                self._aplicar_evento_clima(estado_simulado)
+            prob_restante -= probabilidad
+
+            # Ventana del hijo: valores que aún podrían dejar la media dentro de (alfa, beta)
+            alfa_hijo = (alfa - valor_esperado - cota_u * prob_restante) / probabilidad
+            beta_hijo = (beta - valor_esperado - cota_l * prob_restante) / probabilidad
+
+            estado_simulado, registro = self._aplicar_evento_clima(estado, clima, hashear)
+            val = self._expectimax(estado_simulado, profundidad + 1, 'MAX',
+                                   max(alfa_hijo, cota_l), min(beta_hijo, cota_u))
+            if hijos is not None:
+                hijos.append((clima, self._hash_arbol(estado_simulado), val))
+            self._revertir(estado_simulado, registro)
 
-                # Siguiente nivel vuelve a ser MAX (profundidad aumenta)
-                val = self._expectimax(estado_simulado, profundidad + 1, 'MAX')
-                valor_esperado += probabilidad * val
+            if val <= alfa_hijo:
+                # Aunque el resto valga U, la media no supera alfa: cota superior
+                return valor_esperado + probabilidad * val + cota_u * prob_restante
+            if val >= beta_hijo:
+                # Aunque el resto valga L, la media no baja de beta: cota inferior
+                return valor_esperado + probabilidad * val + cota_l * prob_restante
+
+            valor_esperado += probabilidad * val
 
         return valor_esperado
 
+    def _nodo_chance_muestreo(self, estado, profundidad, hijos=None):
+        """
+        Nodo CHANCE por muestreo disperso: media de hasta k resultados sorteados.
+        Los hijos se buscan con la ventana completa para que cada muestra sea exacta.
+        """
+        muestreo = self.muestreo
+        k = muestreo.num_muestras(profundidad)
+        hashear = self._hashear_hijos(profundidad)
+        n, suma, suma_cuadrados = 0, 0.0, 0.0
+
+        while n < k:
+            estado_simulado, registro = self._aplicar_muestra_azar(estado, muestreo.rng, hashear)
+            val = self._expectimax(estado_simulado, profundidad + 1, 'MAX',
+                                   self.cota_inferior, self.cota_superior)
+            if hijos is not None:
+                hijos.append((estado_simulado.eventos_azar.clima_actual, self._hash_arbol(estado_simulado), val))
+            self._revertir(estado_simulado, registro)
+
+            n += 1
+            suma += val
+            suma_cuadrados += val * val
+            if muestreo.suficiente(n, suma, suma_cuadrados):
+                break
+
+        muestreo.registrar(n, muestreo.varianza_media(n, suma, suma_cuadrados))
+        return suma / n
+
+    def _aplicar_muestra_azar(self, estado, rng, hashear=True):
+        """Sortea con `rng` un resultado del Entorno: clima y reproducción de las flores polinizadas."""
+        climas, probabilidades = zip(*self._escenarios_clima(estado))
+        clima = rng.choices(climas, probabilidades)[0]
+
+        nuevo_estado, registro = self._aplicar_evento_clima(estado, clima, hashear)
+        nuevas = nuevo_estado.eventos_azar.aplicar_reproduccion(nuevo_estado.tablero, rng, registro)
+        if nuevas and hashear:
+            # Las celdas estaban vacías (clave 0): basta con añadir la clave de cada flor nueva
+            self._rehash(nuevo_estado, registro, 0, hashear, nuevas)
+        return nuevo_estado, registro
+
+    def _escenarios_clima(self, estado):
+        """Lista de (clima, probabilidad) con probabilidad positiva."""
+        p_lluvia = estado.eventos_azar.prob_lluvia
+        p_sol = estado.eventos_azar.prob_sol
+        p_normal = 1.0 - (p_lluvia + p_sol)
+
+        escenarios = [("Lluvia", p_lluvia), ("Sol", p_sol), ("Normal", p_normal)]
+        return [(clima, p) for clima, p in escenarios if p > 0]
+
+    def _escenarios_distintos(self, estado):
+        """
+        Climas que producen estados distintos, con la probabilidad de los equivalentes sumada.
+        Sol y Normal no cambian el tablero; la Lluvia solo lo cambia si alguna flor viva
+        tiene pesticida. El clima resultante no se consulta en el modelo exacto.
+        """
+        escenarios = self._escenarios_clima(estado)
+        if not self.fusionar_azar:
+            return escenarios
+
+        lluvia_efectiva = any(flor.esta_viva() and flor.pesticidas > 0 for _, flor in estado.tablero.flores)
+        fusionados = {}
+        for clima, probabilidad in escenarios:
+            representante = clima if clima == "Lluvia" and lluvia_efectiva else "Normal"
+            fusionados[representante] = fusionados.get(representante, 0.0) + probabilidad
+        return list(fusionados.items())
+
     # === Generación y Aplicación de Acciones ===
 
     def _get_acciones_abeja(self, estado):
@@ -169,11 +722,63 @@ class ExpectimaxAI:
 
         return acciones
 
-    def _aplicar_accion_abeja(self, estado, accion):
-        nuevo_estado = estado.clonar()
+    def _preparar_raiz(self, estado):
+        """En modo 'deshacer' se clona una sola vez la raíz para no tocar el juego real."""
+        if self.modo == 'deshacer' or self.zobrist is not None:
+            estado = estado.clonar()
+        if self.zobrist is not None:
+            estado.hash = self.zobrist.hash_completo(estado)
+        return estado
+
+    def _nuevo_hijo(self, estado):
+        """
+        Prepara el estado sobre el que se aplica una jugada.
+        Retorna (estado_hijo, registro); el registro es None en modo 'clonar'.
+        """
+        if self.modo == 'clonar':
+            return estado.clonar(), None
+        return estado, []
+
+    def _revertir(self, estado, registro):
+        """Deshace una jugada aplicada en modo 'deshacer' (no-op en modo 'clonar')."""
+        if registro is not None:
+            estado.deshacer(registro)
+
+    def _firma(self, estado, hashear, celdas=(), **rasgos):
+        """
+        Firma Zobrist de los rasgos que va a modificar una jugada (0 si no hay hashing).
+        Con `hashear=False` (el hijo es una hoja: nadie consulta su hash) no se calcula.
+        """
+        if self.zobrist is None or not hashear:
+            return 0
+        return self.zobrist.firma_parcial(estado, celdas, **rasgos)
+
+    def _rehash(self, estado, registro, antes, hashear, celdas=(), **rasgos):
+        """Actualiza el hash tras la jugada: h' = h ^ firma_antes ^ firma_despues."""
+        if self.zobrist is None or not hashear:
+            return
+        if registro is not None:
+            registro.append(('hash', estado.hash))
+        estado.hash ^= antes ^ self.zobrist.firma_parcial(estado, celdas, **rasgos)
+
+    def _aplicar_accion_abeja(self, estado, accion, hashear=True):
+        nuevo_estado, registro = self._nuevo_hijo(estado)
         tipo, destino = accion
+        celdas = (destino,) if tipo == 'recoger' else ()
+        colmena = tipo == 'descargar'
+        antes = self._firma(nuevo_estado, hashear, celdas, abeja=True, colmena=colmena, turno=True)
+
+        if registro is not None:
+            registro.append(('abeja', nuevo_estado.abeja.capturar_estado()))
+            registro.append(('pos', nuevo_estado.pos_abeja))
+            registro.append(('turno', nuevo_estado.turno))
+        # Cada jugada de la Abeja cierra un turno completo
+        nuevo_estado.turno += 1
 
         if tipo == 'recoger':
+            if registro is not None:
+                flor = nuevo_estado.tablero.get_celda(destino[0], destino[1])
+                registro.append(('flor', flor, flor.capturar_estado()))
             nuevo_estado.abeja.recoger_nectar_y_polinizar(nuevo_estado.tablero, destino)
             nuevo_estado.pos_abeja = destino
 
@@ -185,18 +790,45 @@ class ExpectimaxAI:
             nuevo_estado.abeja.descansar()
 
         elif tipo == 'descargar':
+            if registro is not None:
+                registro.append(('colmena', nuevo_estado.tablero.nectar_en_colmena))
             nuevo_estado.abeja.descargar_nectar_en_colmena(nuevo_estado.tablero, destino)
             nuevo_estado.abeja.recuperar_energia_en_colmena(nuevo_estado.tablero, destino)
 
-        return nuevo_estado
-
-    def _aplicar_accion_humanidad(self, estado, accion):
-        nuevo_estado = estado.clonar()
-        nuevo_estado.humanidad.ejecutar_accion(nuevo_estado.tablero, accion, nuevo_estado.pos_abeja)
-        return nuevo_estado
-
-    def _aplicar_evento_clima(self, estado):
-        estado.eventos_azar.aplicar_efectos_clima(estado.tablero)
+        self._rehash(nuevo_estado, registro, antes, hashear, celdas, abeja=True, colmena=colmena, turno=True)
+        return nuevo_estado, registro
+
+    def _aplicar_accion_humanidad(self, estado, accion, hashear=True):
+        nuevo_estado, registro = self._nuevo_hijo(estado)
+        tipo, pos = accion
+        celdas = (pos,)
+        tablero = nuevo_estado.tablero
+        if tipo == 'obstaculo' and len(tablero.obstaculos) >= nuevo_estado.humanidad.max_obstaculos:
+            # El obstáculo más antiguo será retirado (FIFO)
+            celdas = (pos, tablero.obstaculos[0])
+        antes = self._firma(nuevo_estado, hashear, celdas)
+
+        nuevo_estado.humanidad.ejecutar_accion(tablero, accion, nuevo_estado.pos_abeja, registro)
+
+        self._rehash(nuevo_estado, registro, antes, hashear, celdas)
+        return nuevo_estado, registro
+
+    def _aplicar_evento_clima(self, estado, clima, hashear=True):
+        nuevo_estado, registro = self._nuevo_hijo(estado)
+        celdas = ()
+        if self.zobrist is not None and hashear and clima == "Lluvia":
+            # Solo cambian las flores vivas con pesticida
+            celdas = [pos for pos, flor in nuevo_estado.tablero.flores
+                      if flor.esta_viva() and flor.pesticidas > 0]
+        antes = self._firma(nuevo_estado, hashear, celdas, clima=True)
+
+        if registro is not None:
+            registro.append(('clima', nuevo_estado.eventos_azar.clima_actual))
+        nuevo_estado.eventos_azar.clima_actual = clima
+        nuevo_estado.eventos_azar.aplicar_efectos_clima(nuevo_estado.tablero, registro)
+
+        self._rehash(nuevo_estado, registro, antes, hashear, celdas, clima=True)
+        return nuevo_estado, registro
 
     def _es_terminal(self, estado):
         if not estado.abeja.esta_viva(): return True
@@ -2,11 +2,18 @@ class Flower:
     """
     Representa una flor.
     Gestiona su ciclo de vida, estado de polinización y niveles de contaminación.
+
+    Si tiene un `observador` (el tablero que la contiene), cada cambio de estado
+    le notifica el aporte previo y el nuevo a los agregados del tablero.
     """
 
+    __slots__ = ('vida', 'max_vida', 'es_polinizada', 'pesticidas', 'viva', 'turnos_muerta',
+                 'observador', 'posicion', 'orden')
+
     # Constantes de clase
     MAX_PESTICIDAS = 3
     DAÑO_POR_NIVEL = {0: 0, 1: 5, 2: 10, 3: 15}
+    TURNOS_DESCOMPOSICION = 1  # Cambios de turno que una flor muerta sigue en el tablero
 
     def __init__(self, vida=100):
         self.vida = vida
@@ -15,6 +22,35 @@ class Flower:
         self.pesticidas = 0
         self.viva = True
         self.turnos_muerta = 0
+        self.observador = None
+        self.posicion = None
+        self.orden = None  # Orden de llegada al tablero (lo asigna el tablero)
+
+    def clonar(self):
+        """Copia del estado de la flor, sin observador (el tablero que la copia la vuelve a enlazar)."""
+        copia = Flower.__new__(Flower)
+        (copia.vida, copia.es_polinizada, copia.pesticidas,
+         copia.viva, copia.turnos_muerta) = self.capturar_estado()
+        copia.max_vida = self.max_vida
+        copia.observador = None
+        copia.posicion = self.posicion
+        copia.orden = self.orden
+        return copia
+
+    __copy__ = clonar
+
+    def __deepcopy__(self, memo):
+        return self.clonar()
+
+    def aporte(self):
+        """Aporte a los agregados del tablero: (viva, polinizada, contaminada, pesticidas)."""
+        if not self.viva:
+            return (0, 0, 0, 0)
+        return (1, int(self.es_polinizada), int(self.pesticidas > 0), self.pesticidas)
+
+    def _notificar(self, aporte_previo):
+        if self.observador is not None:
+            self.observador.flor_actualizada(self, aporte_previo, self.aporte())
 
     def esta_viva(self):
         """Indica si la flor sigue viva."""
@@ -27,20 +63,26 @@ class Flower:
     def polinizar(self):
         """Marca la flor como polinizada si está viva."""
         if self.viva:
+            previo = self.aporte()
             self.es_polinizada = True
+            self._notificar(previo)
 
     def aplicar_pesticida(self):
         """Incrementa nivel de pesticida. Si alcanza el máximo, la flor muere."""
         if not self.viva:
             return
 
+        previo = self.aporte()
         self.pesticidas += 1
+        self._notificar(previo)
         if self.pesticidas >= self.MAX_PESTICIDAS:
             self.matar()
 
     def reducir_pesticida(self, cantidad=1):
         """Reduce el nivel de pesticida (ej. por lluvia)."""
+        previo = self.aporte()
         self.pesticidas = max(0, self.pesticidas - cantidad)
+        self._notificar(previo)
 
     def get_daño_pesticida(self):
         """
@@ -52,9 +94,21 @@ class Flower:
 
     def matar(self):
         """Finaliza el ciclo de vida de la flor."""
+        previo = self.aporte()
         self.viva = False
         self.vida = 0
         self.turnos_muerta = 0
+        self._notificar(previo)
+
+    def capturar_estado(self):
+        """Retorna una tupla compacta con el estado mutable de la flor (para deshacer)."""
+        return (self.vida, self.es_polinizada, self.pesticidas, self.viva, self.turnos_muerta)
+
+    def restaurar_estado(self, estado):
+        """Restaura un estado obtenido con `capturar_estado`."""
+        previo = self.aporte()
+        self.vida, self.es_polinizada, self.pesticidas, self.viva, self.turnos_muerta = estado
+        self._notificar(previo)
 
     def incrementar_turno_muerta(self):
         """Avanza el contador de descomposición si la flor está muerta."""
@@ -63,7 +117,7 @@ class Flower:
 
     def debe_eliminarse(self):
         """Determina si la flor muerta debe ser retirada del tablero."""
-        return not self.viva and self.turnos_muerta >= 1
+        return not self.viva and self.turnos_muerta >= self.TURNOS_DESCOMPOSICION
 
     # Métodos de manipulación de vida (mantenidos por compatibilidad con lógica externa)
     def bajar_vida(self, daño):
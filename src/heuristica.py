@@ -6,9 +6,28 @@ class Heuristica:
     """
     Función de evaluación H(s) para el algoritmo Expectimax.
     Combina factores ambientales e internos de la abeja.
+    Los valores están acotados en [COTA_INFERIOR, COTA_SUPERIOR] (valores terminales).
+
+    Con `incremental=True` (opcional) los términos globales del tablero se leen de los
+    agregados que el propio tablero mantiene (`Board.agregados`) y solo se
+    recorren las flores para los términos que dependen de la posición de la
+    abeja, que se consultan en los campos de distancia del tablero
+    (`Board.campos_distancia`) en lugar de recorrer las flores. Con False se
+    recalcula todo desde cero (por defecto). Los valores coinciden salvo el
+    redondeo de la suma de amenaza, que el campo calcula de forma exacta y el
+    recorrido suma en el orden de las flores: difieren en el último bit (~1e-13)
+    y eso basta para cambiar un desempate entre jugadas, así que el modo por
+    defecto reproduce exactamente la evaluación de referencia.
+
+    Con `rutas=True` la proximidad a la colmena y a la flor limpia más cercana
+    usa distancias reales esquivando obstáculos (`Board.matriz_rutas`) en lugar
+    de la distancia Chebyshev; una meta inalcanzable no aporta proximidad.
     """
 
-    def __init__(self, w1=10, w2=8, w3=15, w4=5, w5=3, w6=2, w7=1, w8=5, w9=5):
+    COTA_INFERIOR = -100000.0
+    COTA_SUPERIOR = 100000.0
+
+    def __init__(self, w1=10, w2=8, w3=15, w4=5, w5=3, w6=2, w7=1, w8=5, w9=5, incremental=False, rutas=False):
         self.w_flores_vivas = w1
         self.w_polinizadas = w2
         self.w_nectar_colmena = w3
@@ -18,39 +37,32 @@ class Heuristica:
         self.w_proximidad = w7
         self.w_amenaza = w8
         self.w_obstaculos = w9
+        self.incremental = incremental
+        self.rutas = rutas
 
     def evaluar(self, estado):
         """Retorna el valor numérico (utilidad) de un estado."""
         # Estados Terminales
-        if not estado.abeja.esta_viva(): return -100000.0
-        if estado.tablero.contar_flores_vivas() == 0: return -100000.0
-        if estado.tablero.nectar_en_colmena >= 100: return 100000.0
+        tablero = estado.tablero
+        agregados = tablero.agregados() if self.incremental else tablero.calcular_agregados()
+        if not estado.abeja.esta_viva(): return self.COTA_INFERIOR
+        if agregados[0] == 0: return self.COTA_INFERIOR
+        if tablero.nectar_en_colmena >= 100: return self.COTA_SUPERIOR
 
         # Evaluación Heurística
         valor = (
-            self._h_tablero(estado) +
+            self._h_tablero(agregados) +
             self._h_agente(estado) +
             self._h_progreso(estado) +
             self._h_proximidad(estado) +
             self._h_amenaza(estado) -
             self._h_obstaculos(estado)
         )
-        return valor
-
-    def _h_tablero(self, estado):
-        flores_vivas = 0
-        flores_polinizadas = 0
-        flores_contaminadas = 0
-        total_pesticidas = 0
-
-        for _, flor in estado.tablero.flores:
-            if flor.esta_viva():
-                flores_vivas += 1
-                if flor.esta_polinizada(): flores_polinizadas += 1
-                if flor.pesticidas > 0:
-                    flores_contaminadas += 1
-                    total_pesticidas += flor.pesticidas
+        # Garantiza las cotas que usa la poda Star1 (no afecta a valores realistas)
+        return min(max(valor, self.COTA_INFERIOR), self.COTA_SUPERIOR)
 
+    def _h_tablero(self, agregados):
+        flores_vivas, flores_polinizadas, flores_contaminadas, total_pesticidas = agregados
         return (self.w_flores_vivas * flores_vivas +
                 self.w_polinizadas * flores_polinizadas -
                 5 * flores_contaminadas -
@@ -82,24 +94,53 @@ class Heuristica:
 
         # Modo: volver a casa (mochila llena > 60%)
         if estado.abeja.nectar_cargado >= (capacidad * 0.6):
-            dist = self.distancia_chebyshev(pos_abeja, estado.tablero.pos_colmena)
+            if self.rutas:
+                dist = estado.tablero.matriz_rutas().distancia(estado.tablero.pos_colmena, pos_abeja)
+                if dist is None: return 0
+            else:
+                dist = self.distancia_chebyshev(pos_abeja, estado.tablero.pos_colmena)
             return (20.0 / dist * self.w_proximidad) if dist > 0 else (50 * self.w_proximidad)
 
-        # Modo: recolección
-        flores_vivas = estado.tablero.get_flores_vivas()
-        if not flores_vivas: return 0
-
-        # Buscar flor más cercana sin pesticidas graves
-        dist_min = float('inf')
-        for pos_flor, flor in flores_vivas:
-            if flor.pesticidas == 0:
-                d = self.distancia_chebyshev(pos_abeja, pos_flor)
-                if d < dist_min: dist_min = d
-
-        if dist_min == float('inf'): return 0
+        # Modo: recolección. Buscar flor viva más cercana sin pesticidas graves
+        if self.rutas:
+            dist_min = self._distancia_flor_limpia_real(estado)
+            if dist_min is None: return 0
+        elif self.incremental:
+            dist_min = estado.tablero.campos_distancia().distancia_flor_limpia(pos_abeja)
+            if dist_min is None: return 0
+        else:
+            dist_min = float('inf')
+            for pos_flor, flor in estado.tablero.flores:
+                if flor.esta_viva() and flor.pesticidas == 0:
+                    d = self.distancia_chebyshev(pos_abeja, pos_flor)
+                    if d < dist_min: dist_min = d
+
+            if dist_min == float('inf'): return 0
         return (10.0 / dist_min * self.w_proximidad) if dist_min > 0 else (20 * self.w_proximidad)
 
+    def _distancia_flor_limpia_real(self, estado):
+        """Distancia esquivando obstáculos a la flor limpia más cercana (None si no se llega a ninguna)."""
+        tablero = estado.tablero
+        if self.incremental:
+            limpias = tablero.campos_distancia().limpias
+        else:
+            limpias = [pos for pos, flor in tablero.flores if flor.esta_viva() and flor.pesticidas == 0]
+        matriz = tablero.matriz_rutas()
+        pos_abeja = estado.pos_abeja
+        mejor = None
+        # La distancia real nunca es menor que la Chebyshev: se consultan las flores de cerca a lejos
+        for cota, pos in sorted((self.distancia_chebyshev(pos_abeja, pos), pos) for pos in limpias):
+            if mejor is not None and cota >= mejor:
+                break
+            d = matriz.distancia(pos, pos_abeja)
+            if d is not None and (mejor is None or d < mejor):
+                mejor = d
+        return mejor
+
     def _h_amenaza(self, estado):
+        if self.incremental:
+            return estado.tablero.campos_distancia().amenaza(estado.pos_abeja) * self.w_amenaza
+
         amenaza = 0
         for pos_flor, flor in estado.tablero.flores:
             if flor.esta_viva() and flor.pesticidas == 0:
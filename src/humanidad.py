@@ -1,23 +1,74 @@
 import random
+from itertools import chain, repeat
+from .config import CONFIG_HUMANIDAD, campo_config
 
 class Humanidad:
     """
     Agente MIN.
     Gestiona la aplicación de pesticidas y la colocación estratégica de obstáculos.
+
+    No tiene estado propio: radios y límites están en un `ConfigHumanidad` compartido.
     """
 
-    def __init__(self):
+    __slots__ = ('config',)
+
+    radio_pesticida = campo_config('radio_pesticida')
+    radio_obstaculo = campo_config('radio_obstaculo')
+    max_obstaculos = campo_config('max_obstaculos')
+
+    def __init__(self, config=CONFIG_HUMANIDAD):
         # Configuración de radios y límites
-        self.radio_pesticida = 2
-        self.radio_obstaculo = 3
-        self.max_obstaculos = 4
+        self.config = config
+
+    def clonar(self):
+        return Humanidad(self.config)
+
+    __copy__ = clonar
+
+    def __deepcopy__(self, memo):
+        return self.clonar()
 
     def distancia_chebyshev(self, pos1, pos2):
         """Calcula la distancia máxima en un eje (movimiento de Rey)."""
         return max(abs(pos1[0] - pos2[0]), abs(pos1[1] - pos2[1]))
 
-    def obtener_acciones_validas(self, tablero, pos_abeja):
-        """Genera todas las jugadas legales para la Humanidad en el turno actual."""
+    def obtener_acciones_validas(self, tablero, pos_abeja, barajar=True):
+        """
+        Genera todas las jugadas legales para la Humanidad en el turno actual.
+        Con `barajar=False` no se mezclan (la búsqueda aplica su propio orden).
+        """
+        acciones = list(self.iterar_acciones(tablero, pos_abeja))
+
+        # Mezclamos para evitar sesgo posicional en la IA
+        if barajar:
+            random.shuffle(acciones)
+        return acciones
+
+    def iterar_acciones(self, tablero, pos_abeja):
+        """
+        Iterador de las jugadas legales en orden de celda (pesticidas primero), sin barajar.
+        """
+        # Pesticidas por el índice espacial; obstáculos de las candidatas que el
+        # tablero mantiene alrededor de la colmena más el anillo de la abeja
+        # (solo se revisan las celdas que dependen de ella)
+        flores = tablero.indice_espacial().flores_en_radio(pos_abeja, self.radio_pesticida)
+        candidatos = tablero.candidatos_obstaculo(self.radio_obstaculo)
+        return chain(zip(repeat('pesticida'), flores),
+                     zip(repeat('obstaculo'), candidatos.celdas(tablero, pos_abeja)))
+
+    def _acciones_por_radio(self, tablero, pos_abeja):
+        """Las mismas jugadas recalculando los dos cuadrados en cada llamada (vía anterior en tableros grandes)."""
+        indice = tablero.indice_espacial()
+        acciones = [('pesticida', pos) for pos in indice.flores_en_radio(pos_abeja, self.radio_pesticida)]
+        # No podemos poner obstáculo sobre la abeja (la colmena nunca está vacía)
+        acciones.extend(('obstaculo', pos)
+                        for pos in indice.vacias_en_radio(tablero, (tablero.pos_colmena, pos_abeja),
+                                                          self.radio_obstaculo)
+                        if pos != pos_abeja)
+        return acciones
+
+    def _acciones_por_recorrido(self, tablero, pos_abeja):
+        """Las mismas jugadas recorriendo todas las flores y las celdas candidatas (referencia)."""
         acciones = []
 
         # Pesticidas: Solo en flores vivas cerca de la abeja
@@ -26,6 +77,8 @@ class Humanidad:
                 dist = self.distancia_chebyshev(pos, pos_abeja)
                 if dist <= self.radio_pesticida:
                     acciones.append(('pesticida', pos))
+        # Mismo orden (por celda) que las otras vías
+        acciones.sort()
 
         # Obstáculos: Cerca de la Colmena O cerca de la Abeja
         candidatos = set()
@@ -45,7 +98,7 @@ class Humanidad:
         # Filtramos los candidatos que son válidos (vacíos y no son entidades clave)
         pos_colmena = tablero.pos_colmena
 
-        for pos in candidatos:
+        for pos in sorted(candidatos):
             # No podemos poner obstáculo sobre la abeja, la colmena o algo que no sea vacío (None)
             if pos == pos_abeja or pos == pos_colmena:
                 continue
@@ -53,26 +106,26 @@ class Humanidad:
             if tablero.get_celda(pos[0], pos[1]) is not None:
                 continue
 
-            # Regla: Debe estar dentro del radio de influencia de alguno de los objetivos
-            # (El helper ya filtra por radio cuadrado, pero verificamos distancia exacta si es necesario)
             acciones.append(('obstaculo', pos))
 
-        # Mezclamos para evitar sesgo posicional en la IA
-        random.shuffle(acciones)
         return acciones
 
-    def ejecutar_accion(self, tablero, accion, pos_abeja):
-        """Despacha la acción al método correspondiente."""
+    def ejecutar_accion(self, tablero, accion, pos_abeja, registro=None):
+        """
+        Despacha la acción al método correspondiente.
+        Si se pasa una lista `registro`, se anotan en ella entradas compactas
+        que permiten deshacer la acción (ver `GameState.deshacer`).
+        """
         tipo, pos = accion
 
         if tipo == 'pesticida':
-            return self._aplicar_pesticida(tablero, pos, pos_abeja)
+            return self._aplicar_pesticida(tablero, pos, pos_abeja, registro)
         elif tipo == 'obstaculo':
-            return self.colocar_obstaculo(tablero, pos)
+            return self.colocar_obstaculo(tablero, pos, registro)
 
         return False
 
-    def colocar_obstaculo(self, tablero, posicion):
+    def colocar_obstaculo(self, tablero, posicion, registro=None):
         """
         Intenta colocar un obstáculo gestionando el límite máximo (FIFO).
         Es público porque la GUI lo usa para aplicar decisiones de la IA.
@@ -85,21 +138,23 @@ class Humanidad:
         if len(tablero.obstaculos) >= self.max_obstaculos:
             # Eliminamos el más antiguo
             viejo_pos = tablero.obstaculos[0]
-            # Accedemos al grid para limpiar
-            # Si board tuviera un método 'quitar_obstaculo', sería mejor usarlo.
-            tablero.grid[viejo_pos[0]][viejo_pos[1]] = None
-            tablero.obstaculos.pop(0)
+            indice = tablero.quitar_obstaculo(viejo_pos[0], viejo_pos[1])
+            if registro is not None:
+                registro.append(('quitar_obstaculo', viejo_pos, indice))
 
         # Delegamos la colocación al tablero
-        return tablero.colocar_obstaculo(posicion[0], posicion[1])
+        colocado = tablero.colocar_obstaculo(posicion[0], posicion[1])
+        if colocado and registro is not None:
+            registro.append(('colocar_obstaculo', posicion))
+        return colocado
 
-    def _aplicar_pesticida(self, tablero, posicion, pos_abeja):
+    def _aplicar_pesticida(self, tablero, posicion, pos_abeja, registro=None):
         """Aplica pesticida validando la distancia."""
         # Doble check de distancia por seguridad
         if self.distancia_chebyshev(posicion, pos_abeja) > self.radio_pesticida:
             return False
 
-        return tablero.aplicar_pesticida_en(posicion[0], posicion[1])
+        return tablero.aplicar_pesticida_en(posicion[0], posicion[1], registro)
 
     def _obtener_celdas_candidatas(self, tablero, centro, radio):
         """Retorna una lista de coordenadas dentro del cuadrado definido por el radio."""
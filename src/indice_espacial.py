@@ -0,0 +1,188 @@
+"""
+Índice espacial de las flores vivas para consultas por radio.
+Evita recorrer todas las flores (y construir listas de celdas) en cada nodo MIN.
+"""
+
+from bisect import bisect_left
+from heapq import merge
+
+
+class IndiceEspacial:
+    """
+    Cubetas uniformes de `lado` x `lado` celdas con las posiciones de las flores vivas.
+
+    - `flores_en_radio(p, r)`: flores vivas a distancia Chebyshev <= r de p;
+      solo se visitan las cubetas que cortan el cuadrado de la consulta.
+    - `vacias_en_radio(tablero, centros, r)`: celdas vacías a distancia <= r
+      de alguno de los centros, recorriendo por filas la unión de los
+      cuadrados (cada celda una sola vez, sin conjuntos intermedios).
+
+    Ambas devuelven las posiciones en orden de celda (fila, columna). El tablero
+    avisa cuando una flor pasa a estar viva o deja de estarlo (colocación,
+    muerte, reproducción y sus deshacer), igual que con sus agregados.
+    """
+
+    def __init__(self, tablero, lado=4):
+        self.lado = lado
+        self._cubetas = {}
+        for pos, flor in tablero.flores:
+            if flor.esta_viva():
+                self.flor_viva(pos, 1)
+
+    def flor_viva(self, pos, signo):
+        """Notificación: la flor en `pos` pasa a estar viva (+1) o deja de estarlo (-1)."""
+        clave = (pos[0] // self.lado, pos[1] // self.lado)
+        if signo > 0:
+            self._cubetas.setdefault(clave, set()).add(pos)
+        else:
+            cubeta = self._cubetas.get(clave)
+            if cubeta is not None:
+                cubeta.discard(pos)
+                if not cubeta:
+                    del self._cubetas[clave]
+
+    def flores_en_radio(self, centro, radio):
+        f, c = centro
+        lado = self.lado
+        resultado = []
+        for bf in range((f - radio) // lado, (f + radio) // lado + 1):
+            for bc in range((c - radio) // lado, (c + radio) // lado + 1):
+                cubeta = self._cubetas.get((bf, bc))
+                if cubeta:
+                    for pos in cubeta:
+                        if abs(pos[0] - f) <= radio and abs(pos[1] - c) <= radio:
+                            resultado.append(pos)
+        resultado.sort()
+        return resultado
+
+    @staticmethod
+    def vacias_en_radio(tablero, centros, radio):
+        centros = [centro for centro in centros if centro is not None]
+        if not centros:
+            return []
+        resultado = []
+        get_celda = tablero.get_celda
+        f_min = max(0, min(centro[0] for centro in centros) - radio)
+        f_max = min(tablero.filas - 1, max(centro[0] for centro in centros) + radio)
+        for f in range(f_min, f_max + 1):
+            # Tramos de columnas de los cuadrados que cubren esta fila, fusionados
+            tramos = sorted((max(0, c - radio), min(tablero.columnas - 1, c + radio))
+                            for cf, c in centros if abs(cf - f) <= radio)
+            siguiente = 0
+            for inicio, fin in tramos:
+                for c in range(max(inicio, siguiente), fin + 1):
+                    if get_celda(f, c) is None:
+                        resultado.append((f, c))
+                siguiente = max(siguiente, fin + 1)
+        return resultado
+
+    def __deepcopy__(self, memo):
+        copia = IndiceEspacial.__new__(IndiceEspacial)
+        copia.lado = self.lado
+        copia._cubetas = {clave: set(cubeta) for clave, cubeta in self._cubetas.items()}
+        memo[id(self)] = copia
+        return copia
+
+
+class CandidatosObstaculo:
+    """
+    Celdas candidatas a obstáculo de la Humanidad para un radio:
+        - `vacias`: celdas vacías a distancia <= radio de la colmena, en orden
+          de celda. No se recalcula entre nodos: el tablero anota en
+          `pendientes` las celdas que cambian (obstáculos y flores que entran
+          o salen) y solo esas se revisan en la siguiente consulta. Poner y
+          deshacer una jugada cuesta añadir una posición a un conjunto.
+        - Anillo de la abeja: celdas de su cuadrado que quedan fuera del de la
+          colmena. Es solo geometría, se calcula una vez por posición de la
+          abeja y se comparte entre copias del tablero; en cada consulta
+          únicamente se mira si esas celdas están vacías.
+    """
+
+    def __init__(self, tablero, radio):
+        self.radio = radio
+        self.filas = tablero.filas
+        self.columnas = tablero.columnas
+        self.colmena = tablero.pos_colmena
+        self.pendientes = set()
+        self._anillos = {}  # Posición de la abeja -> tupla de celdas (compartido entre copias)
+        self.vacias = []
+        if self.colmena is None:
+            self._zona = (0, -1, 0, -1)
+            return
+        f, c = self.colmena
+        self._zona = (max(0, f - radio), min(self.filas - 1, f + radio),
+                      max(0, c - radio), min(self.columnas - 1, c + radio))
+        f_min, f_max, c_min, c_max = self._zona
+        get_celda = tablero.get_celda
+        self.vacias = [(ff, cc) for ff in range(f_min, f_max + 1) for cc in range(c_min, c_max + 1)
+                       if get_celda(ff, cc) is None]
+
+    def _en_zona(self, pos):
+        f_min, f_max, c_min, c_max = self._zona
+        return f_min <= pos[0] <= f_max and c_min <= pos[1] <= c_max
+
+    def _sincronizar(self, tablero):
+        """Revisa las celdas que han cambiado desde la última consulta."""
+        vacias = self.vacias
+        for pos in self.pendientes:
+            if not self._en_zona(pos):
+                continue
+            i = bisect_left(vacias, pos)
+            presente = i < len(vacias) and vacias[i] == pos
+            vacia = tablero.get_celda(pos[0], pos[1]) is None
+            if vacia and not presente:
+                vacias.insert(i, pos)
+            elif presente and not vacia:
+                del vacias[i]
+        self.pendientes.clear()
+
+    def anillo(self, pos_abeja):
+        """Celdas del cuadrado de la abeja fuera del de la colmena, en orden de celda."""
+        anillo = self._anillos.get(pos_abeja)
+        if anillo is None:
+            f, c = pos_abeja
+            r = self.radio
+            anillo = tuple((ff, cc) for ff in range(max(0, f - r), min(self.filas, f + r + 1))
+                           for cc in range(max(0, c - r), min(self.columnas, c + r + 1))
+                           if not self._en_zona((ff, cc)))
+            self._anillos[pos_abeja] = anillo
+        return anillo
+
+    def celdas(self, tablero, pos_abeja):
+        """
+        Iterador, en orden de celda, de las celdas vacías candidatas (nunca la
+        de la abeja). Trabaja sobre una copia: se puede modificar el tablero
+        mientras se recorre.
+        """
+        if self.pendientes:
+            self._sincronizar(tablero)
+        get_celda = tablero.get_celda
+        if self._en_zona(pos_abeja):
+            colmena = [pos for pos in self.vacias if pos != pos_abeja]
+            extra = [pos for pos in self.anillo(pos_abeja) if get_celda(pos[0], pos[1]) is None]
+        else:
+            colmena = self.vacias[:]
+            extra = [pos for pos in self.anillo(pos_abeja)
+                     if pos != pos_abeja and get_celda(pos[0], pos[1]) is None]
+        if not extra:
+            return iter(colmena)
+        if not colmena:
+            return iter(extra)
+        return merge(colmena, extra)
+
+    def aislar(self):
+        """Deja de compartir los anillos con las copias (para usar la copia desde otro hilo)."""
+        self._anillos = dict(self._anillos)
+
+    def __deepcopy__(self, memo):
+        copia = CandidatosObstaculo.__new__(CandidatosObstaculo)
+        copia.radio = self.radio
+        copia.filas = self.filas
+        copia.columnas = self.columnas
+        copia.colmena = self.colmena
+        copia._zona = self._zona
+        copia._anillos = self._anillos
+        copia.vacias = list(self.vacias)
+        copia.pendientes = set(self.pendientes)
+        memo[id(self)] = copia
+        return copia
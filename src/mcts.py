@@ -0,0 +1,275 @@
+"""
+Búsqueda en árbol Monte Carlo (MCTS) con nodos de azar explícitos.
+Alternativa a ExpectimaxAI cuya fuerza crece de forma continua con el presupuesto.
+"""
+
+import math
+import random
+import time
+
+from .expectimax import ExpectimaxAI
+from .game_manager import GameManager
+from .heuristica import Heuristica
+from .ordenacion import OrdenadorAcciones
+
+
+class NodoMCTS:
+    """Nodo del árbol: MAX (Abeja), MIN (Humanidad) o CHANCE (Entorno)."""
+
+    def __init__(self, tipo, profundidad):
+        self.tipo = tipo
+        self.profundidad = profundidad
+        self.hijos = {}
+        self.pendientes = None   # Jugadas sin expandir; la más prometedora al final (pop)
+        self.visitas = 0
+        self.suma = 0.0          # Recompensas normalizadas en [0, 1]
+        self.suma_valor = 0.0    # Valores de la heurística (solo para informar)
+
+
+class MCTSAI:
+    """
+    Motor MCTS (UCT) con la misma interfaz que ExpectimaxAI.
+
+    - Nodos MAX/MIN: selección UCT (la Humanidad minimiza la recompensa de la
+      Abeja). Ensanchamiento progresivo: un nodo con n visitas admite
+      ceil(pw_constante * n^pw_exponente) hijos y las jugadas se añaden de más
+      a menos prometedoras (orden estático de OrdenadorAcciones para la
+      Humanidad), así el gran conjunto de obstáculos no diluye las visitas.
+    - Nodos CHANCE explícitos: en los turnos con evento (calendario de
+      ChanceEvents) se sortea clima + reproducción de flores; cada resultado
+      distinto es un hijo y se visita en proporción a su probabilidad.
+    - Simulación: política voraz barata durante `profundidad_simulacion`
+      plies y evaluación con la heurística. La recompensa se normaliza a
+      [0, 1] con tanh alrededor del valor de la raíz (`escala`).
+
+    El presupuesto es `iteraciones` y, opcionalmente, `deadline_ms` (lo que se
+    agote antes; la primera iteración siempre se completa). La jugada elegida
+    es la más visitada de la raíz. Las transiciones del juego son las de
+    ExpectimaxAI (aplicar/deshacer sobre un único estado).
+    """
+
+    def __init__(self, iteraciones=2000, heuristica=None, nectar_objetivo=GameManager().nectar_objetivo,
+                 exploracion=1.4, pw_constante=2.0, pw_exponente=0.5, profundidad_simulacion=3,
+                 escala=200.0, semilla=0):
+        self.iteraciones = iteraciones
+        self.heuristica = heuristica if heuristica else Heuristica()
+        self.modelo = ExpectimaxAI(heuristica=self.heuristica, nectar_objetivo=nectar_objetivo)
+        self.ordenador = OrdenadorAcciones(determinista=True)
+        self.exploracion = exploracion
+        self.pw_constante = pw_constante
+        self.pw_exponente = pw_exponente
+        self.profundidad_simulacion = profundidad_simulacion
+        self.escala = escala
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+
+        self.nodos_explorados = 0
+        self.iteraciones_realizadas = 0
+        self.profundidad_alcanzada = 0
+        self.valor_mejor_accion = None
+        self.cancelacion = None
+        self._valor_referencia = 0.0
+
+    def get_mejor_accion(self, estado, deadline_ms=None):
+        """Entrada principal: Retorna la mejor acción para la Abeja."""
+        return self._buscar(estado, 'MAX', self.modelo._get_acciones_abeja(estado), deadline_ms)
+
+    def get_mejor_accion_humanidad(self, estado, acciones=None, deadline_ms=None):
+        """Retorna la acción de la Humanidad que minimiza la utilidad esperada de la Abeja."""
+        if acciones is None:
+            acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja)
+        return self._buscar(estado, 'MIN', acciones, deadline_ms)
+
+    def _buscar(self, estado, tipo, acciones, deadline_ms):
+        self.nodos_explorados = 0
+        self.iteraciones_realizadas = 0
+        self.profundidad_alcanzada = 0
+        if not acciones:
+            return None
+
+        self.rng.seed(self.semilla)
+        self.ordenador.nueva_busqueda()
+        trabajo = self.modelo._preparar_raiz(estado)
+        self._valor_referencia = self.heuristica.evaluar(trabajo)
+
+        raiz = NodoMCTS(tipo, 0)
+        raiz.pendientes = self._ordenar(trabajo, tipo, acciones)
+        if self.modelo._es_terminal(trabajo):
+            # Partida ya decidida: no hay nada que explorar, cualquier jugada vale lo mismo
+            self.valor_mejor_accion = self._valor_referencia
+            return raiz.pendientes[-1]
+        limite = time.perf_counter() + deadline_ms / 1000.0 if deadline_ms is not None else None
+
+        while self.iteraciones_realizadas < self.iteraciones:
+            if self.iteraciones_realizadas:
+                if limite is not None and time.perf_counter() >= limite:
+                    break
+                if self.cancelacion is not None and self.cancelacion.is_set():
+                    break
+            self._iterar(raiz, trabajo)
+            self.iteraciones_realizadas += 1
+
+        if not raiz.hijos:
+            self.valor_mejor_accion = self._valor_referencia
+            return raiz.pendientes[-1] if raiz.pendientes else None
+
+        # Hijo más visitado (a igualdad, el expandido antes)
+        accion, hijo = max(raiz.hijos.items(), key=lambda par: par[1].visitas)
+        self.valor_mejor_accion = hijo.suma_valor / hijo.visitas
+        return accion
+
+    def _iterar(self, raiz, estado):
+        """Selección + expansión, simulación y retropropagación (sobre el estado de trabajo)."""
+        camino = [raiz]
+        registros = []
+        nodo = raiz
+
+        while not self.modelo._es_terminal(estado):
+            if nodo.tipo == 'CHANCE':
+                clave, registro = self._sortear_azar(estado)
+            else:
+                if nodo.pendientes is None:
+                    nodo.pendientes = self._ordenar(estado, nodo.tipo, self._acciones(estado, nodo.tipo))
+                if nodo.pendientes and len(nodo.hijos) < self._limite_hijos(nodo):
+                    clave = nodo.pendientes.pop()
+                elif nodo.hijos:
+                    clave = self._seleccionar(nodo)
+                else:
+                    break
+                registro = self._aplicar(estado, nodo.tipo, clave)
+
+            registros.append(registro)
+            hijo = nodo.hijos.get(clave)
+            nuevo = hijo is None
+            if nuevo:
+                hijo = NodoMCTS(self._siguiente_tipo(nodo.tipo), nodo.profundidad + 1)
+                nodo.hijos[clave] = hijo
+                self.nodos_explorados += 1
+            camino.append(hijo)
+            nodo = hijo
+            if nuevo:
+                break
+
+        if nodo.profundidad > self.profundidad_alcanzada:
+            self.profundidad_alcanzada = nodo.profundidad
+
+        valor = self._simular(estado, nodo.tipo)
+        for registro in reversed(registros):
+            self.modelo._revertir(estado, registro)
+
+        recompensa = 0.5 + 0.5 * math.tanh((valor - self._valor_referencia) / self.escala)
+        for visitado in camino:
+            visitado.visitas += 1
+            visitado.suma += recompensa
+            visitado.suma_valor += valor
+
+    def _limite_hijos(self, nodo):
+        """Ensanchamiento progresivo: hijos permitidos según las visitas del nodo."""
+        return max(1, math.ceil(self.pw_constante * max(nodo.visitas, 1) ** self.pw_exponente))
+
+    def _seleccionar(self, nodo):
+        """UCT: la Abeja maximiza la recompensa media y la Humanidad la minimiza."""
+        log_visitas = math.log(nodo.visitas)
+        es_max = nodo.tipo == 'MAX'
+
+        def uct(par):
+            hijo = par[1]
+            media = hijo.suma / hijo.visitas
+            explotacion = media if es_max else 1.0 - media
+            return explotacion + self.exploracion * math.sqrt(log_visitas / hijo.visitas)
+
+        return max(nodo.hijos.items(), key=uct)[0]
+
+    @staticmethod
+    def _siguiente_tipo(tipo):
+        return {'MAX': 'MIN', 'MIN': 'CHANCE', 'CHANCE': 'MAX'}[tipo]
+
+    # === Transiciones ===
+
+    def _acciones(self, estado, tipo):
+        if tipo == 'MAX':
+            return self.modelo._get_acciones_abeja(estado)
+        return estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja, barajar=False)
+
+    def _ordenar(self, estado, tipo, acciones):
+        """Lista de pendientes con la jugada más prometedora al final."""
+        if tipo == 'MIN':
+            ordenadas = self.ordenador.ordenar_humanidad(estado, acciones, 0)
+        else:
+            prioridad = {'descargar': 0, 'recoger': 1, 'mover': 2, 'descansar': 3}
+            ordenadas = sorted(acciones, key=lambda accion: prioridad[accion[0]])
+        return ordenadas[::-1]
+
+    def _aplicar(self, estado, tipo, accion):
+        if tipo == 'MAX':
+            return self.modelo._aplicar_accion_abeja(estado, accion)[1]
+        return self.modelo._aplicar_accion_humanidad(estado, accion)[1]
+
+    def _sortear_azar(self, estado):
+        """Retorna (clave del resultado, registro). Sin evento en este turno, un único resultado."""
+        if not estado.eventos_azar.debe_activar_evento(estado.turno):
+            return None, []
+        _, registro = self.modelo._aplicar_muestra_azar(estado, self.rng)
+        nuevas = tuple(entrada[1] for entrada in registro if entrada[0] == 'agregar_flor')
+        return (estado.eventos_azar.clima_actual, nuevas), registro
+
+    # === Simulación ===
+
+    def _simular(self, estado, tipo):
+        """Juega `profundidad_simulacion` plies con políticas voraces y evalúa la heurística."""
+        registros = []
+        for _ in range(self.profundidad_simulacion):
+            if self.modelo._es_terminal(estado):
+                break
+            if tipo == 'CHANCE':
+                _, registro = self._sortear_azar(estado)
+            else:
+                accion = self._politica_abeja(estado) if tipo == 'MAX' else self._politica_humanidad(estado)
+                registro = self._aplicar(estado, tipo, accion) if accion is not None else []
+            registros.append(registro)
+            tipo = self._siguiente_tipo(tipo)
+
+        valor = self.heuristica.evaluar(estado)
+        for registro in reversed(registros):
+            self.modelo._revertir(estado, registro)
+        return valor
+
+    def _politica_abeja(self, estado):
+        """Descargar o recoger si se puede; si no, acercarse a una flor libre o a la colmena."""
+        acciones = self.modelo._get_acciones_abeja(estado)
+        if not acciones:
+            return None
+        for preferida in ('descargar', 'recoger'):
+            for accion in acciones:
+                if accion[0] == preferida:
+                    return accion
+
+        movimientos = [accion for accion in acciones if accion[0] == 'mover']
+        if not movimientos:
+            return acciones[0]
+
+        abeja, tablero = estado.abeja, estado.tablero
+        objetivos = []
+        if abeja.puede_cargar_nectar() and abeja.energia >= abeja.max_energia * 0.3:
+            objetivos = [pos for pos, flor in tablero.flores if flor.esta_viva() and not flor.esta_polinizada()]
+        if not objetivos:
+            objetivos = [tablero.pos_colmena]
+
+        def distancia(accion):
+            destino = accion[1]
+            cercania = min(max(abs(destino[0] - o[0]), abs(destino[1] - o[1])) for o in objetivos)
+            return cercania, self.rng.random()
+
+        return min(movimientos, key=distancia)
+
+    def _politica_humanidad(self, estado):
+        """Pesticida en la flor más cercana a la abeja; si no hay, un obstáculo al azar."""
+        acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja, barajar=False)
+        if not acciones:
+            return None
+        pesticidas = [accion for accion in acciones if accion[0] == 'pesticida']
+        if pesticidas:
+            pos_abeja = estado.pos_abeja
+            return min(pesticidas, key=lambda accion: max(abs(accion[1][0] - pos_abeja[0]),
+                                                          abs(accion[1][1] - pos_abeja[1])))
+        return self.rng.choice(acciones)
@@ -0,0 +1,79 @@
+"""
+Muestreo disperso (sparse sampling) de los nodos de azar.
+Permite modelar clima y reproducción de flores con un coste acotado por nodo.
+"""
+
+import random
+
+
+class MuestreoAzar:
+    """
+    Política de muestreo para los nodos CHANCE de ExpectimaxAI.
+
+    En lugar de enumerar los climas, cada nodo de azar sortea hasta k resultados
+    completos (clima + reproducción de las flores polinizadas) con un generador
+    propio sembrado con `semilla`, y promedia el valor de los hijos.
+
+    k es adaptativo:
+        - Se reduce a la mitad por cada turno completo de profundidad
+          (los nodos profundos pesan menos en el valor de la raíz).
+        - Tras `muestras_minimas` se deja de muestrear en cuanto el error
+          estándar estimado de la media baja de `tolerancia`.
+
+    Estadísticas por búsqueda: nodos muestreados, muestras tomadas y la varianza
+    estimada de la media en cada nodo (media y máxima).
+    """
+
+    # Plies por turno completo: Humanidad (MIN), Clima (CHANCE) y Abeja (MAX)
+    PLIES_POR_TURNO = 3
+
+    def __init__(self, muestras=8, muestras_minimas=2, tolerancia=1.0, semilla=0):
+        if muestras_minimas < 1 or muestras < muestras_minimas:
+            raise ValueError("Se requiere 1 <= muestras_minimas <= muestras")
+        self.muestras = muestras
+        self.muestras_minimas = muestras_minimas
+        self.tolerancia = tolerancia
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        self.nueva_busqueda()
+
+    def nueva_busqueda(self):
+        """Resiembra el generador (búsquedas reproducibles) y reinicia las estadísticas."""
+        self.rng.seed(self.semilla)
+        self.nodos = 0
+        self.muestras_tomadas = 0
+        self.suma_varianzas = 0.0
+        self.varianza_maxima = 0.0
+
+    def num_muestras(self, profundidad):
+        """Máximo de muestras para un nodo de azar a esta profundidad."""
+        turnos = profundidad // self.PLIES_POR_TURNO
+        return max(self.muestras_minimas, self.muestras >> turnos)
+
+    def suficiente(self, n, suma, suma_cuadrados):
+        """True si la media de las n muestras ya es lo bastante precisa."""
+        if n < self.muestras_minimas:
+            return False
+        return self.varianza_media(n, suma, suma_cuadrados) <= self.tolerancia ** 2
+
+    @staticmethod
+    def varianza_media(n, suma, suma_cuadrados):
+        """Varianza estimada de la media muestral (0 con una sola muestra)."""
+        if n < 2:
+            return 0.0
+        media = suma / n
+        varianza = max(suma_cuadrados - n * media * media, 0.0) / (n - 1)
+        return varianza / n
+
+    def registrar(self, n, varianza):
+        self.nodos += 1
+        self.muestras_tomadas += n
+        self.suma_varianzas += varianza
+        if varianza > self.varianza_maxima:
+            self.varianza_maxima = varianza
+
+    def muestras_por_nodo(self):
+        return self.muestras_tomadas / self.nodos if self.nodos else 0.0
+
+    def varianza_promedio(self):
+        return self.suma_varianzas / self.nodos if self.nodos else 0.0
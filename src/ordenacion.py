@@ -0,0 +1,118 @@
+"""
+Ordenación de jugadas para el árbol de búsqueda Expectimax.
+Un buen orden hace que la poda y la profundización iterativa corten antes.
+"""
+
+import random
+from collections import deque
+from .flower import Flower
+
+
+class OrdenadorAcciones:
+    """
+    Etapa de ordenación enchufable para ExpectimaxAI.
+
+    Criterios (de mayor a menor prioridad):
+        1. Jugadas asesinas (killer moves): provocaron un corte a la misma profundidad.
+        2. Orden estático (solo Humanidad): pesticida en flores adyacentes a la abeja,
+           otros pesticidas, obstáculos sobre la ruta de la abeja a la colmena y el resto
+           por cercanía a la abeja.
+        3. Tabla de historia: acumula 2^profundidad_restante cada vez que una jugada
+           resulta la mejor o provoca un corte. Se conserva entre turnos (con envejecimiento).
+
+    En modo determinista los empates se resuelven por el propio orden de la tupla
+    de acción; si no, se barajan antes de ordenar (como hacía la Humanidad).
+    """
+
+    NUM_KILLERS = 2
+
+    def __init__(self, determinista=False):
+        self.determinista = determinista
+        self.historia = {}
+        self.killers = {}
+        self._rutas = {}
+
+    def nueva_busqueda(self):
+        """Envejece la historia para que pese más lo aprendido en los últimos turnos."""
+        for accion in list(self.historia):
+            self.historia[accion] //= 2
+            if not self.historia[accion]:
+                del self.historia[accion]
+        self._rutas.clear()
+
+    def ordenar_humanidad(self, estado, acciones, profundidad):
+        ruta = self._ruta_a_colmena(estado.tablero, estado.pos_abeja)
+        return self._ordenar(acciones, profundidad,
+                             lambda accion: self._valor_estatico(estado, accion, ruta))
+
+    def ordenar_abeja(self, acciones, profundidad):
+        return self._ordenar(acciones, profundidad, lambda accion: 0)
+
+    def registrar(self, accion, profundidad, restante, corte):
+        """Anota la mejor jugada de un nodo (y si provocó un corte)."""
+        self.historia[accion] = self.historia.get(accion, 0) + (1 << restante)
+        if corte:
+            killers = self.killers.setdefault(profundidad, [])
+            if accion not in killers:
+                killers.insert(0, accion)
+                del killers[self.NUM_KILLERS:]
+
+    def _ordenar(self, acciones, profundidad, valor_estatico):
+        acciones = list(acciones)
+        if self.determinista:
+            acciones.sort()
+        else:
+            random.shuffle(acciones)
+
+        killers = self.killers.get(profundidad, ())
+        historia = self.historia
+        acciones.sort(key=lambda a: (a in killers, valor_estatico(a), historia.get(a, 0)), reverse=True)
+        return acciones
+
+    def _valor_estatico(self, estado, accion, ruta):
+        tipo, pos = accion
+        pos_abeja = estado.pos_abeja
+        dist = max(abs(pos[0] - pos_abeja[0]), abs(pos[1] - pos_abeja[1]))
+
+        if tipo == 'pesticida':
+            flor = estado.tablero.get_celda(pos[0], pos[1])
+            nivel = flor.pesticidas if isinstance(flor, Flower) else 0
+            # Primero las flores adyacentes; dentro de cada grupo, las más cerca de morir
+            return (3 if dist <= 1 else 2, nivel)
+        if pos in ruta:
+            return (1, -dist)
+        return (0, -dist)
+
+    def _ruta_a_colmena(self, tablero, pos_abeja):
+        """
+        Celdas del camino mínimo de la abeja a la colmena (BFS determinista).
+        Se cachea por posición y obstáculos durante una búsqueda.
+        """
+        clave = (pos_abeja, tuple(sorted(tablero.obstaculos)))
+        ruta = self._rutas.get(clave)
+        if ruta is not None:
+            return ruta
+
+        objetivo = tablero.pos_colmena
+        padres = {pos_abeja: None}
+        cola = deque([pos_abeja])
+        while cola:
+            actual = cola.popleft()
+            if actual == objetivo:
+                break
+            for df in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    vecino = (actual[0] + df, actual[1] + dc)
+                    if vecino not in padres and tablero.es_transitable(vecino[0], vecino[1]):
+                        padres[vecino] = actual
+                        cola.append(vecino)
+
+        ruta = set()
+        if objetivo in padres:
+            paso = padres[objetivo]
+            while paso is not None and paso != pos_abeja:
+                ruta.add(paso)
+                paso = padres[paso]
+
+        self._rutas[clave] = ruta
+        return ruta
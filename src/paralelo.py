@@ -0,0 +1,225 @@
+"""
+Búsqueda Expectimax paralela en la raíz.
+Reparte las acciones raíz de la Humanidad entre un pool de procesos.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .expectimax import ExpectimaxAI, GameState, _TiempoAgotado
+from .cache_evaluacion import CacheEvaluacion
+from .heuristica import Heuristica
+from .zobrist import TablaTransposicion
+from .ordenacion import OrdenadorAcciones
+
+# Motor propio de cada proceso de trabajo (se crea una vez en el inicializador)
+_motor_trabajador = None
+
+
+def _crear_motor(config):
+    tabla = None
+    if config['capacidad_tt']:
+        tabla = TablaTransposicion(config['capacidad_tt'])
+    ordenador = None
+    if config['ordenacion']:
+        ordenador = OrdenadorAcciones(determinista=True)
+    heuristica = config['heuristica'] if config['heuristica'] else Heuristica()
+    if config['cache_evaluacion']:
+        heuristica = CacheEvaluacion(heuristica, max_entradas=config['cache_evaluacion'])
+    return ExpectimaxAI(max_depth=config['max_depth'], heuristica=heuristica,
+                        nectar_objetivo=config['nectar_objetivo'], tabla_transposicion=tabla,
+                        poda=config['poda'], ordenador=ordenador, muestreo=config['muestreo'],
+                        fusionar_azar=config['fusionar_azar'], reductor=config['reductor'])
+
+
+def _inicializar_trabajador(config):
+    global _motor_trabajador
+    _motor_trabajador = _crear_motor(config)
+
+
+def _buscar_bloque(datos_estado, acciones, profundidad, limite, cota):
+    """
+    Ejecuta el nodo MIN raíz a `profundidad` sobre un bloque de acciones en un
+    proceso de trabajo. `limite` es la hora (time.time) a la que se aborta, o None;
+    `cota` es el mejor valor ya conocido de los bloques anteriores.
+    Retorna (accion, valor, nodos) del mejor del bloque (accion None si ninguna
+    baja de la cota); valor es None si se agotó el tiempo.
+    """
+    motor = _motor_trabajador
+    estado = GameState.desde_compacto(datos_estado)
+    motor.nodos_explorados = 0
+    motor.max_depth = profundidad
+    # Cada bloque es una búsqueda nueva: sin killers, historia ni estadísticas de la anterior
+    if motor.ordenador is not None:
+        motor.ordenador.nueva_busqueda()
+    if motor.muestreo is not None:
+        motor.muestreo.nueva_busqueda()
+    if motor.reductor is not None:
+        motor.reductor.nueva_busqueda()
+    if limite is not None:
+        # time.time es común a todos los procesos; el motor mide con perf_counter
+        motor._limite_tiempo = time.perf_counter() + (limite - time.time())
+    try:
+        # La raíz ya viene reducida por el proceso principal
+        accion, valor = motor._buscar_raiz_humanidad(motor._preparar_raiz(estado), acciones,
+                                                     reducir=False, cota=cota)
+    except _TiempoAgotado:
+        accion, valor = None, None
+    finally:
+        motor._limite_tiempo = None
+    return accion, valor, motor.nodos_explorados
+
+
+class BusquedaParalela:
+    """
+    Paraleliza la raíz de la decisión de la Humanidad.
+
+    Cada bloque contiguo de acciones raíz se evalúa en un proceso distinto a
+    partir de un estado compacto (`GameState.compactar`) y los resultados se
+    combinan con la misma selección del mínimo que la búsqueda secuencial
+    (a igual valor gana la acción que aparece antes), así que la decisión
+    coincide con la de `ExpectimaxAI` configurado igual a la misma profundidad.
+    El primer bloque (las acciones mejor ordenadas) se busca solo y su valor
+    acota la ventana de los demás, que se buscan a la vez: como en la búsqueda
+    secuencial, una acción que no baja de esa cota se poda.
+    Cada proceso tiene su propia tabla de transposición (`capacidad_tt`) y,
+    con `cache_evaluacion` (número de entradas), su caché de evaluaciones.
+    El reductor se aplica a la raíz en el proceso principal, antes de repartir.
+    Con `muestreo` cada bloque sortea con su propio generador: el resultado
+    sigue la misma distribución pero no es idéntico al secuencial.
+
+    Con `deadline_ms` profundiza de un nivel en uno como `ExpectimaxAI`: la mejor
+    acción de cada iteración va primero en la siguiente, la primera iteración
+    siempre se completa y si algún bloque agota el tiempo se descarta la
+    iteración entera (ver `profundidad_alcanzada`).
+
+    Si hay pocas acciones raíz (o un único proceso) se busca en secuencial.
+    """
+
+    def __init__(self, max_depth=3, heuristica=None, nectar_objetivo=100, poda=True,
+                 capacidad_tt=1 << 16, ordenacion=True, num_procesos=None, min_acciones_por_proceso=2,
+                 muestreo=None, fusionar_azar=True, reductor=None, cache_evaluacion=1 << 16):
+        self.config = {
+            'max_depth': max_depth,
+            'heuristica': heuristica,
+            'nectar_objetivo': nectar_objetivo,
+            'poda': poda,
+            'capacidad_tt': capacidad_tt,
+            'ordenacion': ordenacion,
+            'muestreo': muestreo,
+            'fusionar_azar': fusionar_azar,
+            'reductor': reductor,
+            'cache_evaluacion': cache_evaluacion,
+        }
+        self.num_procesos = num_procesos or os.cpu_count() or 1
+        self.min_acciones_por_proceso = min_acciones_por_proceso
+        self.motor_local = _crear_motor(self.config)
+        self.max_depth = max_depth
+        self.nodos_explorados = 0
+        self.valor_mejor_accion = None
+        self.profundidad_alcanzada = 0
+        self._pool = None
+
+    def _obtener_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.num_procesos,
+                                             initializer=_inicializar_trabajador,
+                                             initargs=(self.config,))
+        return self._pool
+
+    def cerrar(self):
+        """Libera los procesos de trabajo (los bloques aún en cola se cancelan)."""
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def get_mejor_accion_humanidad(self, estado, acciones=None, deadline_ms=None):
+        """Misma interfaz que `ExpectimaxAI.get_mejor_accion_humanidad`."""
+        self.nodos_explorados = 0
+        if acciones is None:
+            acciones = estado.humanidad.obtener_acciones_validas(estado.tablero, estado.pos_abeja)
+        if not acciones:
+            return None
+
+        motor = self.motor_local
+        # Pocas acciones: el coste de repartir supera la ganancia
+        if self.num_procesos <= 1 or len(acciones) < self.num_procesos * self.min_acciones_por_proceso:
+            accion = motor.get_mejor_accion_humanidad(estado, acciones, deadline_ms=deadline_ms)
+            self.nodos_explorados = motor.nodos_explorados
+            self.valor_mejor_accion = motor.valor_mejor_accion
+            self.profundidad_alcanzada = motor.profundidad_alcanzada
+            return accion
+
+        # Mismo orden raíz que usaría la búsqueda secuencial
+        if motor.ordenador is not None:
+            motor.ordenador.nueva_busqueda()
+            acciones = motor.ordenador.ordenar_humanidad(estado, acciones, 0)
+
+        datos_estado = estado.compactar()
+        if deadline_ms is None:
+            accion, valor = self._buscar_profundidad(estado, datos_estado, acciones, self.max_depth, None)
+            self.profundidad_alcanzada = self.max_depth
+            self.valor_mejor_accion = valor
+            return accion
+
+        limite = time.time() + deadline_ms / 1000.0
+        accion, valor = None, None
+        for profundidad in range(1, self.max_depth + 1):
+            if accion is not None:
+                acciones = [accion] + [a for a in acciones if a != accion]
+            # La primera iteración siempre se completa para tener una respuesta
+            resultado = self._buscar_profundidad(estado, datos_estado, acciones, profundidad,
+                                                 limite if accion is not None else None)
+            if resultado is None:
+                break
+            accion, valor = resultado
+            self.profundidad_alcanzada = profundidad
+            if time.time() >= limite:
+                break
+
+        self.valor_mejor_accion = valor
+        return accion
+
+    def _buscar_profundidad(self, estado, datos_estado, acciones, profundidad, limite):
+        """Una iteración repartida en bloques. Retorna (accion, valor) o None si se agotó el tiempo."""
+        reductor = self.motor_local.reductor
+        if reductor is not None:
+            # Los hijos de la raíz MIN empiezan en profundidad 0 (ver _buscar_raiz_humanidad)
+            reductor.nueva_busqueda()
+            acciones = reductor.reducir(estado, acciones, profundidad + 1, self.motor_local._posiciones_importan)
+
+        # Bloques contiguos (conservan el orden para el desempate) y algo más pequeños
+        # que el reparto exacto para equilibrar la carga
+        num_bloques = self.num_procesos * 2
+        tamaño = -(-len(acciones) // num_bloques)
+        bloques = [acciones[i:i + tamaño] for i in range(0, len(acciones), tamaño)]
+
+        pool = self._obtener_pool()
+        # El primer bloque solo: su valor es la cota de los demás
+        accion, valor, nodos = pool.submit(_buscar_bloque, datos_estado, bloques[0], profundidad,
+                                           limite, float('inf')).result()
+        self.nodos_explorados += nodos
+        if valor is None:
+            return None
+        mejor_accion, peor_valor = accion, valor
+
+        futuros = [pool.submit(_buscar_bloque, datos_estado, bloque, profundidad, limite, peor_valor)
+                   for bloque in bloques[1:]]
+        completa = True
+        for futuro in futuros:
+            accion, valor, nodos = futuro.result()
+            self.nodos_explorados += nodos
+            if valor is None:
+                completa = False
+                break
+            # Estricto: los bloques están en orden, así que a igualdad gana el anterior
+            if accion is not None and valor < peor_valor:
+                peor_valor = valor
+                mejor_accion = accion
+
+        if not completa:
+            for futuro in futuros:
+                futuro.cancel()
+            return None
+        return mejor_accion, peor_valor
@@ -0,0 +1,147 @@
+"""
+Ponderación (pondering): búsqueda especulativa durante el turno del jugador.
+Mientras la GUI espera el clic del jugador, se precalcula la respuesta de la
+Humanidad a cada jugada posible de la Abeja.
+"""
+
+import copy
+import threading
+import time
+
+from .expectimax import ExpectimaxAI
+from .zobrist import ZobristHash, TablaTransposicion
+from .ordenacion import OrdenadorAcciones
+
+
+class MotorPonderacion:
+    """
+    Motor de ponderación en segundo plano.
+
+    - `iniciar(estado)`: copia el estado (en el hilo que llama) y lanza un hilo
+      que, para cada jugada legal de la Abeja (`ExpectimaxAI._get_acciones_abeja`),
+      aplica la jugada como lo hace la GUI y busca la respuesta de la Humanidad.
+    - `detener()`: cancela la búsqueda en curso y espera al hilo.
+    - `consultar(estado)`: si el estado real coincide (hash Zobrist) con uno
+      ponderado, devuelve al instante (accion, valor, profundidad).
+
+    El trabajo especulativo está limitado por `presupuesto_cpu_ms` (tiempo de CPU
+    del hilo por turno) y cada respuesta por `deadline_por_jugada_ms`.
+
+    El hilo no comparte estado mutable con el juego: usa su propia copia de la
+    `heuristica` recibida (con su caché, si la tiene) y su copia del estado no
+    comparte las cachés del tablero con el original (`Board.aislar`).
+    """
+
+    def __init__(self, max_depth=4, heuristica=None, nectar_objetivo=100,
+                 presupuesto_cpu_ms=3000, deadline_por_jugada_ms=300):
+        heuristica = copy.deepcopy(heuristica) if heuristica is not None else None
+        self.motor = ExpectimaxAI(max_depth=max_depth, heuristica=heuristica,
+                                  nectar_objetivo=nectar_objetivo,
+                                  tabla_transposicion=TablaTransposicion(), poda=True,
+                                  ordenador=OrdenadorAcciones(determinista=True))
+        self.zobrist = ZobristHash(incluir_clima=False)
+        self.presupuesto_cpu_ms = presupuesto_cpu_ms
+        self.deadline_por_jugada_ms = deadline_por_jugada_ms
+
+        self.resultados = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.cpu_usado_ms = 0.0
+
+        self._cancelar = threading.Event()
+        self.motor.cancelacion = self._cancelar
+        self._hilo = None
+        self._cerrojo = threading.Lock()
+
+    def iniciar(self, estado):
+        """Arranca la ponderación para el turno del jugador que empieza en `estado`."""
+        self.detener()
+        with self._cerrojo:
+            self.resultados = {}
+        self.cpu_usado_ms = 0.0
+        self._cancelar.clear()
+
+        # La copia se hace aquí: el hilo nunca toca los objetos del juego real
+        copia = estado.clonar()
+        copia.tablero.aislar()
+        self._hilo = threading.Thread(target=self._ponderar, args=(copia,), daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        """Cancela el trabajo especulativo y espera a que el hilo termine."""
+        if self._hilo is not None:
+            self._cancelar.set()
+            self._hilo.join()
+            self._hilo = None
+
+    def consultar(self, estado):
+        """Retorna (accion, valor, profundidad) si el estado fue ponderado, o None."""
+        clave = self.zobrist.hash_completo(estado)
+        with self._cerrojo:
+            resultado = self.resultados.get(clave)
+        if resultado is None:
+            self.fallos += 1
+        else:
+            self.aciertos += 1
+        return resultado
+
+    def _ponderar(self, estado):
+        inicio_cpu = time.thread_time()
+        jugadas = self._jugadas_probables(estado)
+
+        for accion in jugadas:
+            restante_ms = self.presupuesto_cpu_ms - (time.thread_time() - inicio_cpu) * 1000
+            if self._cancelar.is_set() or restante_ms <= 0:
+                break
+
+            sucesor = self._aplicar_jugada_jugador(estado, accion)
+            deadline = min(self.deadline_por_jugada_ms, restante_ms)
+            # Sin barajar: el hilo no debe consumir el generador aleatorio global del juego
+            acciones = sucesor.humanidad.obtener_acciones_validas(sucesor.tablero, sucesor.pos_abeja,
+                                                                 barajar=False)
+            respuesta = self.motor.get_mejor_accion_humanidad(sucesor, acciones, deadline_ms=deadline)
+
+            # Una búsqueda cancelada antes de completar la primera iteración no deja respuesta
+            if respuesta is not None and not self._cancelar.is_set():
+                clave = self.zobrist.hash_completo(sucesor)
+                with self._cerrojo:
+                    self.resultados[clave] = (respuesta, self.motor.valor_mejor_accion,
+                                              self.motor.profundidad_alcanzada)
+
+        self.cpu_usado_ms = (time.thread_time() - inicio_cpu) * 1000
+
+    def _jugadas_probables(self, estado):
+        """Jugadas de la Abeja ordenadas por valor estático: se ponderan antes las que más convienen."""
+        jugadas = self.motor._get_acciones_abeja(estado)
+        heuristica = self.motor.heuristica
+        valores = {accion: heuristica.evaluar(self._aplicar_jugada_jugador(estado, accion))
+                   for accion in jugadas}
+        return sorted(jugadas, key=lambda accion: valores[accion], reverse=True)
+
+    @staticmethod
+    def _aplicar_jugada_jugador(estado, accion):
+        """
+        Aplica una jugada con la misma semántica que la GUI: recoger no mueve
+        a la abeja, entrar en la colmena descarga y recupera automáticamente
+        y el turno avanza antes de que responda la Humanidad.
+        """
+        sucesor = estado.clonar()
+        abeja, tablero = sucesor.abeja, sucesor.tablero
+        tipo, destino = accion
+
+        if tipo == 'mover':
+            abeja.mover(tablero, sucesor.pos_abeja, destino)
+            sucesor.pos_abeja = destino
+            if tablero.es_colmena(destino[0], destino[1]):
+                abeja.descargar_nectar_en_colmena(tablero, destino)
+                abeja.recuperar_energia_en_colmena(tablero, destino)
+        elif tipo == 'recoger':
+            abeja.recoger_nectar_y_polinizar(tablero, destino)
+        elif tipo == 'descansar':
+            abeja.descansar()
+        elif tipo == 'descargar':
+            abeja.descargar_nectar_en_colmena(tablero, destino)
+            abeja.recuperar_energia_en_colmena(tablero, destino)
+
+        sucesor.turno += 1
+        return sucesor
@@ -41,7 +41,7 @@ class QLearningAI:
             cuadrante = 2 if c < columna_central else 3
 
         # Nivel de flores vivas (0: Escasez, 1: Medio, 2: Abundancia)
-        # Accedemos directamente a la longitud de la lista filtrada
+        # Contador de flores vivas que mantiene el tablero (O(1))
         num_flores = board.contar_flores_vivas()
         nivel_flores = 0
 
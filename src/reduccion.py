@@ -0,0 +1,122 @@
+"""
+Reducción de las jugadas de obstáculo de la Humanidad por clases de equivalencia.
+Muchos obstáculos llevan al mismo valor dentro del horizonte: basta con buscar uno por clase.
+"""
+
+
+class ReductorObstaculos:
+    """
+    Etapa enchufable de ExpectimaxAI para los nodos MIN: agrupa las jugadas
+    ('obstaculo', pos) por su efecto dentro de las plies que quedan y deja un
+    representante por clase. Los pesticidas no se tocan.
+
+    Con la heurística por defecto un obstáculo solo cuenta por el número de
+    obstáculos; su posición influye en el árbol por dos vías:
+        - La abeja: con m jugadas suyas por delante solo puede intentar pisar
+          celdas a distancia <= m. Esas celdas son clases propias.
+        - Las candidatas de la Humanidad en los nodos MIN siguientes: las del
+          cuadrado de la colmena lo son siempre; las demás dependen de dónde
+          esté la abeja, así que también son clases propias si queda algún MIN.
+    El resto de celdas son intercambiables (el subárbol es el mismo salvo por
+    la celda ocupada) y forman una sola clase.
+
+    Modos:
+        - 'exacto': el valor de cada nodo coincide con el de la búsqueda
+          completa. Si las posiciones sí cuentan (heurística con `rutas` o
+          muestreo con reproducción de flores) no se reduce nada.
+        - 'top_k': con pérdida. Las celdas fuera del alcance de la abeja se
+          agrupan en una clase aunque queden nodos MIN, y de las celdas al
+          alcance solo se conservan las `k` que más estorban (las más cerca
+          del objetivo de la abeja: la colmena si vuelve cargada o la flor
+          limpia más cercana).
+
+    Estadísticas por búsqueda: nodos reducidos, jugadas recibidas y jugadas buscadas.
+    """
+
+    MODOS = ('exacto', 'top_k')
+
+    # Plies por turno completo: Humanidad (MIN), Clima (CHANCE) y Abeja (MAX)
+    PLIES_POR_TURNO = 3
+
+    def __init__(self, modo='exacto', k=4):
+        if modo not in self.MODOS:
+            raise ValueError(f"Modo desconocido: {modo}")
+        if k < 1:
+            raise ValueError("Se requiere k >= 1")
+        self.modo = modo
+        self.k = k
+        self.nueva_busqueda()
+
+    def nueva_busqueda(self):
+        """Reinicia las estadísticas."""
+        self.nodos = 0
+        self.jugadas = 0
+        self.representantes = 0
+
+    def reducir(self, estado, acciones, restante, posiciones_importan=False):
+        """
+        Jugadas a buscar en un nodo MIN con `restante` plies por debajo.
+        Conserva el orden recibido (los representantes ocupan el lugar del
+        primer miembro de su clase).
+        """
+        exacto = self.modo == 'exacto'
+        if exacto and posiciones_importan:
+            return acciones
+
+        # Jugadas de la Abeja y nodos MIN que quedan en el horizonte
+        alcance = len(range(2, restante, self.PLIES_POR_TURNO))
+        hay_min = restante > self.PLIES_POR_TURNO
+
+        tablero = estado.tablero
+        pos_abeja = estado.pos_abeja
+        radio = estado.humanidad.radio_obstaculo
+        colmena = tablero.pos_colmena
+
+        reducidas = []
+        vistas = set()
+        cercanas = []
+        for accion in acciones:
+            tipo, pos = accion
+            if tipo != 'obstaculo':
+                reducidas.append(accion)
+                continue
+            if max(abs(pos[0] - pos_abeja[0]), abs(pos[1] - pos_abeja[1])) <= alcance:
+                clase = pos
+                if not exacto:
+                    cercanas.append(accion)
+                    continue
+            elif hay_min and (colmena is None or
+                              max(abs(pos[0] - colmena[0]), abs(pos[1] - colmena[1])) > radio):
+                clase = pos if exacto else 'anillo'
+            else:
+                clase = 'sin_efecto'
+            if clase not in vistas:
+                vistas.add(clase)
+                reducidas.append(accion)
+
+        if cercanas:
+            # Top-k de las celdas al alcance, devueltas en el orden recibido
+            cercanas.sort(key=lambda accion: self._estorbo(estado, accion[1]))
+            elegidas = set(reducidas)
+            elegidas.update(cercanas[:self.k])
+            reducidas = [accion for accion in acciones if accion in elegidas]
+
+        self.nodos += 1
+        self.jugadas += len(acciones)
+        self.representantes += len(reducidas)
+        return reducidas
+
+    @staticmethod
+    def _estorbo(estado, pos):
+        """Clave de orden (menor = estorba más): distancia de la celda al objetivo de la abeja."""
+        tablero = estado.tablero
+        abeja = estado.abeja
+        colmena = tablero.pos_colmena
+        distancia = None
+        # Mismo criterio que Heuristica._h_proximidad para elegir el objetivo
+        if abeja.nectar_cargado < abeja.capacidad_nectar * 0.6:
+            distancia = tablero.campos_distancia().distancia_flor_limpia(pos)
+        if distancia is None:
+            distancia = 0 if colmena is None else max(abs(pos[0] - colmena[0]), abs(pos[1] - colmena[1]))
+        pos_abeja = estado.pos_abeja
+        return distancia, max(abs(pos[0] - pos_abeja[0]), abs(pos[1] - pos_abeja[1])), pos
@@ -0,0 +1,329 @@
+"""
+Matriz de rutas entre la colmena y las flores, y planificación de recorridos de recolección.
+Distancias reales (esquivando obstáculos) que se reutilizan entre consultas en lugar de recalcular caminos.
+"""
+
+import heapq
+from collections import deque, namedtuple
+
+from .campos import TablaVecinos
+
+# Recorrido planificado: flores en orden de visita, movimientos (sin contar las
+# recolecciones), turnos hasta descargar en la colmena, energía y néctar esperado
+Recorrido = namedtuple('Recorrido', ['flores', 'movimientos', 'turnos', 'energia', 'nectar'])
+
+
+class MatrizRutas:
+    """
+    Distancias en movimientos (8 direcciones, esquivando obstáculos) desde cada
+    origen consultado (la colmena o una flor) a todas las celdas: un BFS por
+    origen, que se calcula la primera vez que se pide. En esta cuadrícula el
+    camino es simétrico, así que `distancia(origen, celda)` también es la
+    distancia de la celda al origen (por ejemplo, de la abeja a una flor).
+
+    El tablero avisa de cada obstáculo que se coloca o se retira (incluida la
+    retirada FIFO de la Humanidad y los deshacer de la búsqueda). Cada campo
+    recuerda los obstáculos con los que está calculado y, al consultarlo, se
+    corrige solo en la zona afectada por la diferencia neta: una jugada y su
+    deshacer no cuestan nada, y los campos que no se consultan no se tocan.
+    Solo se guardan `max_origenes` campos; al llenarse se vacía la caché.
+    """
+
+    def __init__(self, tablero, max_origenes=64):
+        self.filas = tablero.filas
+        self.columnas = tablero.columnas
+        self.max_origenes = max_origenes
+        self.tabla = TablaVecinos.para(tablero.filas, tablero.columnas)
+        self.bloqueadas = set(tablero.obstaculos)
+        self.version = 0  # Cambia con cada obstáculo colocado o retirado
+        self._campos = {}  # Origen -> [distancias, obstáculos con los que se calculó, versión]
+
+    def campo(self, origen):
+        """Lista de distancias desde `origen` indexada por f * columnas + c (-1 si no se llega)."""
+        entrada = self._campos.get(origen)
+        if entrada is None:
+            if len(self._campos) >= self.max_origenes:
+                self._campos.clear()
+            entrada = [self._bfs(origen), frozenset(self.bloqueadas), self.version]
+            self._campos[origen] = entrada
+        elif entrada[2] != self.version:
+            self._sincronizar(entrada)
+        return entrada[0]
+
+    def _sincronizar(self, entrada):
+        distancias, vistas, _ = entrada
+        if vistas != self.bloqueadas:
+            bloqueadas = set(vistas)
+            for pos in vistas - self.bloqueadas:
+                bloqueadas.discard(pos)
+                self._liberar(distancias, pos, bloqueadas)
+            for pos in self.bloqueadas - vistas:
+                bloqueadas.add(pos)
+                self._bloquear(distancias, pos, bloqueadas)
+            entrada[1] = frozenset(self.bloqueadas)
+        entrada[2] = self.version
+
+    def _bfs(self, origen):
+        columnas = self.columnas
+        bloqueadas = self.bloqueadas
+        vecinos = self.tabla.vecinos
+        distancias = [-1] * (self.filas * columnas)
+        distancias[origen[0] * columnas + origen[1]] = 0
+        cola = deque([origen])
+        while cola:
+            actual = cola.popleft()
+            d = distancias[actual[0] * columnas + actual[1]] + 1
+            for vecino in vecinos(actual):
+                i = vecino[0] * columnas + vecino[1]
+                if distancias[i] < 0 and vecino not in bloqueadas:
+                    distancias[i] = d
+                    cola.append(vecino)
+        return distancias
+
+    def distancia(self, origen, celda):
+        """Movimientos entre `origen` y `celda`, o None si no hay camino."""
+        d = self.campo(origen)[celda[0] * self.columnas + celda[1]]
+        return d if d >= 0 else None
+
+    def siguiente_paso(self, origen, celda):
+        """Celda vecina de `celda` un movimiento más cerca de `origen` (None si no hay camino o ya está)."""
+        distancias = self.campo(origen)
+        columnas = self.columnas
+        d = distancias[celda[0] * columnas + celda[1]]
+        if d <= 0:
+            return None
+        for vecino in self.tabla.vecinos(celda):
+            if distancias[vecino[0] * columnas + vecino[1]] == d - 1:
+                return vecino
+        return None
+
+    # === Actualización incremental (la llama el tablero) ===
+
+    def obstaculo(self, pos, presente):
+        """Notificación: se coloca (`presente`) o se retira un obstáculo en `pos`."""
+        if presente:
+            self.bloqueadas.add(pos)
+        else:
+            self.bloqueadas.discard(pos)
+        self.version += 1
+
+    def _bloquear(self, distancias, pos, bloqueadas):
+        """
+        Corrige un campo tras bloquear `pos`: se buscan por capas las celdas que
+        se quedan sin ningún vecino a distancia d - 1 (su camino pasaba por `pos`)
+        y solo esas se recalculan desde el borde de la zona afectada.
+        """
+        columnas = self.columnas
+        vecinos = self.tabla.vecinos
+        i = pos[0] * columnas + pos[1]
+        d_pos = distancias[i]
+        if d_pos < 0:
+            return
+        distancias[i] = -1
+
+        afectadas = set()
+        revisadas = {pos}
+        cola = deque()
+        for vecino in vecinos(pos):
+            if distancias[vecino[0] * columnas + vecino[1]] == d_pos + 1:
+                revisadas.add(vecino)
+                cola.append(vecino)
+        # Por capas: al revisar una celda ya se sabe qué celdas de la capa anterior se han perdido
+        while cola:
+            celda = cola.popleft()
+            d = distancias[celda[0] * columnas + celda[1]]
+            if any(distancias[v[0] * columnas + v[1]] == d - 1 and v not in afectadas
+                   for v in vecinos(celda)):
+                continue
+            afectadas.add(celda)
+            for vecino in vecinos(celda):
+                if vecino not in revisadas and distancias[vecino[0] * columnas + vecino[1]] == d + 1:
+                    revisadas.add(vecino)
+                    cola.append(vecino)
+
+        if not afectadas:
+            return
+        for celda in afectadas:
+            distancias[celda[0] * columnas + celda[1]] = -1
+        # Recalcular las afectadas desde sus vecinas no afectadas (Dijkstra de costes unitarios)
+        frontera = []
+        for celda in afectadas:
+            mejor = min((distancias[v[0] * columnas + v[1]] for v in vecinos(celda)
+                         if v not in afectadas and v not in bloqueadas
+                         and distancias[v[0] * columnas + v[1]] >= 0), default=-1)
+            if mejor >= 0:
+                frontera.append((mejor + 1, celda))
+        heapq.heapify(frontera)
+        while frontera:
+            d, celda = heapq.heappop(frontera)
+            j = celda[0] * columnas + celda[1]
+            if distancias[j] >= 0:
+                continue
+            distancias[j] = d
+            for vecino in vecinos(celda):
+                if vecino in afectadas and distancias[vecino[0] * columnas + vecino[1]] < 0:
+                    heapq.heappush(frontera, (d + 1, vecino))
+
+    def _liberar(self, distancias, pos, bloqueadas):
+        """Corrige un campo tras liberar `pos`: BFS desde `pos` solo por donde acorta distancias."""
+        columnas = self.columnas
+        vecinos = self.tabla.vecinos
+        mejor = min((distancias[v[0] * columnas + v[1]] for v in vecinos(pos)
+                     if distancias[v[0] * columnas + v[1]] >= 0), default=-1)
+        if mejor < 0:
+            return
+        distancias[pos[0] * columnas + pos[1]] = mejor + 1
+        cola = deque([pos])
+        while cola:
+            celda = cola.popleft()
+            d = distancias[celda[0] * columnas + celda[1]] + 1
+            for vecino in vecinos(celda):
+                j = vecino[0] * columnas + vecino[1]
+                if vecino not in bloqueadas and (distancias[j] < 0 or distancias[j] > d):
+                    distancias[j] = d
+                    cola.append(vecino)
+
+    def __deepcopy__(self, memo):
+        copia = MatrizRutas.__new__(MatrizRutas)
+        copia.filas = self.filas
+        copia.columnas = self.columnas
+        copia.max_origenes = self.max_origenes
+        copia.tabla = self.tabla
+        copia.bloqueadas = set(self.bloqueadas)
+        copia.version = self.version
+        copia._campos = {origen: [list(distancias), vistas, version]
+                         for origen, (distancias, vistas, version) in self._campos.items()}
+        memo[id(self)] = copia
+        return copia
+
+
+class PlanificadorRecorrido:
+    """
+    Elige el recorrido de recolección (abeja -> flores -> colmena) con más
+    néctar por turno que cabe en la mochila y en la energía de la abeja.
+
+    Con la semántica del motor, recoger mueve la abeja a la flor sin coste de
+    movimiento y el néctar se entrega con 'descargar' en la colmena, así que
+    con las distancias de la matriz el coste de un recorrido es exacto:
+        - llegar junto a una flor a distancia d: d - 1 movimientos (1 si ya está encima),
+        - recogerla: coste_recoleccion y un turno,
+        - volver desde la última flor: su distancia a la colmena y un turno para descargar.
+
+    Solo se combinan las `max_candidatas` flores vivas más cercanas y como mucho
+    `max_flores` por recorrido. El daño de pesticida acumulado debe dejar viva
+    a la abeja (el que recibe al cruzar otras flores no se cuenta).
+    """
+
+    def __init__(self, max_candidatas=8, max_flores=4):
+        self.max_candidatas = max_candidatas
+        self.max_flores = max_flores
+
+    @staticmethod
+    def _movimientos_hasta(d):
+        """Movimientos para quedar junto a una flor a distancia d."""
+        return d - 1 if d >= 1 else 1
+
+    def planificar(self, tablero, abeja, pos_abeja):
+        """Mejor Recorrido desde `pos_abeja`, o None si no hay ninguno posible."""
+        colmena = tablero.pos_colmena
+        hueco = abeja.capacidad_nectar - abeja.nectar_cargado
+        if colmena is None or hueco <= 0:
+            return None
+        matriz = tablero.matriz_rutas()
+
+        # Las más cercanas por distancia real; la Chebyshev es una cota inferior, así que
+        # solo se calculan campos de las flores que pueden entrar entre las candidatas
+        candidatas = []
+        for cota, pos, flor in sorted((max(abs(pos[0] - pos_abeja[0]), abs(pos[1] - pos_abeja[1])), pos, flor)
+                                      for pos, flor in tablero.get_flores_vivas()):
+            if len(candidatas) >= self.max_candidatas and self._movimientos_hasta(cota) > candidatas[-1][0]:
+                break
+            d = matriz.distancia(pos, pos_abeja)
+            vuelta = matriz.distancia(colmena, pos)
+            if d is None or vuelta is None:
+                continue
+            candidatas.append((self._movimientos_hasta(d), pos, flor.get_daño_pesticida(), vuelta))
+            candidatas.sort()
+            del candidatas[self.max_candidatas:]
+
+        max_flores = min(self.max_flores, -(-hueco // abeja.nectar_por_flor))
+        coste_movimiento, coste_recoleccion = abeja.coste_movimiento, abeja.coste_recoleccion
+        mejor_clave, mejor = None, None
+        # Pila de recorridos parciales: (última flor, flores, movimientos, daño)
+        pila = [(None, (), 0, 0)]
+        while pila:
+            ultima, flores, movimientos, daño = pila.pop()
+            n = len(flores) + 1
+            for primer_tramo, pos, daño_flor, vuelta in candidatas:
+                if pos in flores:
+                    continue
+                if ultima is None:
+                    tramo = primer_tramo
+                else:
+                    tramo = self._movimientos_hasta(matriz.distancia(pos, ultima))
+                hasta_flor = movimientos + tramo
+                # Con más flores o con la vuelta el coste solo crece
+                if hasta_flor * coste_movimiento + n * coste_recoleccion > abeja.energia:
+                    continue
+                if daño + daño_flor >= abeja.vida:
+                    continue
+                total = hasta_flor + vuelta
+                energia = total * coste_movimiento + n * coste_recoleccion
+                if energia <= abeja.energia:
+                    nectar = min(n * abeja.nectar_por_flor, hueco)
+                    turnos = total + n + 1
+                    clave = (nectar / turnos, nectar, -turnos)
+                    if mejor_clave is None or clave > mejor_clave:
+                        mejor_clave = clave
+                        mejor = Recorrido(flores + (pos,), total, turnos, energia, nectar)
+                if n < max_flores:
+                    pila.append((pos, flores + (pos,), hasta_flor, daño + daño_flor))
+        return mejor
+
+
+class PilotoAbeja:
+    """
+    Abeja automática: en cada turno vuelve a planificar el recorrido con la
+    matriz de rutas del tablero y da el primer paso (acciones con el formato
+    del motor: 'mover', 'recoger', 'descansar' y 'descargar').
+        - En la colmena con néctar: descarga.
+        - Con recorrido: recoge la primera flor si está al lado; si no, se acerca.
+        - Sin recorrido y con néctar: vuelve a la colmena.
+        - Si no: descansa.
+    """
+
+    def __init__(self, planificador=None):
+        self.planificador = planificador if planificador else PlanificadorRecorrido()
+        self.ultimo_recorrido = None
+
+    def siguiente_accion(self, estado):
+        tablero, abeja, pos = estado.tablero, estado.abeja, estado.pos_abeja
+        colmena = tablero.pos_colmena
+        if pos == colmena and abeja.nectar_cargado > 0:
+            return ('descargar', colmena)
+
+        matriz = tablero.matriz_rutas()
+        recorrido = self.planificador.planificar(tablero, abeja, pos)
+        self.ultimo_recorrido = recorrido
+        if recorrido is not None:
+            flor = recorrido.flores[0]
+            d = matriz.distancia(flor, pos)
+            if d == 1:
+                return ('recoger', flor)
+            if abeja.tiene_energia(abeja.coste_movimiento):
+                paso = matriz.siguiente_paso(flor, pos) if d > 1 else self._salir(tablero, matriz, pos)
+                if paso is not None:
+                    return ('mover', paso)
+        elif abeja.nectar_cargado > 0 and abeja.tiene_energia(abeja.coste_movimiento):
+            paso = matriz.siguiente_paso(colmena, pos)
+            if paso is not None:
+                return ('mover', paso)
+        return ('descansar', None)
+
+    @staticmethod
+    def _salir(tablero, matriz, pos):
+        """Una celda vecina transitable (para apartarse de la flor sobre la que está)."""
+        for vecino in matriz.tabla.vecinos(pos):
+            if tablero.es_transitable(vecino[0], vecino[1]):
+                return vecino
+        return None
@@ -0,0 +1,172 @@
+"""
+Hashing Zobrist y tabla de transposición para el algoritmo Expectimax.
+"""
+
+import random
+from .flower import Flower
+
+
+class ZobristHash:
+    """
+    Genera claves aleatorias de 64 bits para cada rasgo del estado y las combina con XOR.
+    Las claves se crean bajo demanda, así que no hace falta conocer de antemano
+    el tamaño del tablero ni los rangos de vida/energía.
+
+    Rasgos: contenido de cada celda (obstáculo o flor con sus flags de vida,
+    polinización y pesticida), estadísticas y posición de la abeja, clima,
+    néctar de la colmena y fase del turno en el ciclo de eventos de azar
+    (`frecuencia_clima`). El orden FIFO de los obstáculos no entra en el hash
+    incremental: `h_orden` lo codifica aparte para quien lo necesite (el mismo
+    conjunto colocado en otro orden retira otro obstáculo al llegar al máximo).
+
+    El clima solo se incluye si `incluir_clima` es True: cuando el modelo de
+    búsqueda no lo consulta (lo fija o lo sortea en cada nodo de azar), dos ramas climáticas con el
+    mismo tablero resultante son la misma posición.
+    """
+
+    def __init__(self, semilla=0, incluir_clima=True):
+        self._rng = random.Random(semilla)
+        self._claves = {}
+        self.incluir_clima = incluir_clima
+
+    def _clave(self, rasgo):
+        clave = self._claves.get(rasgo)
+        if clave is None:
+            clave = self._rng.getrandbits(64)
+            self._claves[rasgo] = clave
+        return clave
+
+    def h_celda(self, tablero, pos):
+        """Clave del contenido de una celda (0 si está vacía o es la colmena)."""
+        celda = tablero.get_celda(pos[0], pos[1])
+        if isinstance(celda, Flower):
+            return self._clave(('flor', pos, celda.viva, celda.es_polinizada, celda.pesticidas))
+        if celda == "OBSTACULO":
+            return self._clave(('obstaculo', pos))
+        return 0
+
+    def h_orden(self, tablero):
+        """Clave del orden de la cola FIFO de obstáculos (puesto de cada uno)."""
+        h = 0
+        for puesto, pos in enumerate(tablero.obstaculos):
+            h ^= self._clave(('orden', pos, puesto))
+        return h
+
+    def h_abeja(self, abeja, pos_abeja):
+        return (self._clave(('vida', abeja.vida)) ^
+                self._clave(('energia', abeja.energia)) ^
+                self._clave(('nectar', abeja.nectar_cargado)) ^
+                self._clave(('pos', pos_abeja)))
+
+    def h_clima(self, clima):
+        if not self.incluir_clima:
+            return 0
+        return self._clave(('clima', clima))
+
+    def h_colmena(self, nectar):
+        return self._clave(('colmena', nectar))
+
+    def h_turno(self, eventos_azar, turno):
+        """Fase del turno dentro del ciclo de eventos: decide en qué plies futuros hay azar."""
+        fase = turno % eventos_azar.frecuencia_clima if turno > 0 else None
+        return self._clave(('turno', fase))
+
+    def hash_completo(self, estado):
+        """Calcula el hash desde cero (se usa solo en la raíz de la búsqueda)."""
+        tablero = estado.tablero
+        h = self.h_abeja(estado.abeja, estado.pos_abeja)
+        h ^= self.h_clima(estado.eventos_azar.clima_actual)
+        h ^= self.h_colmena(tablero.nectar_en_colmena)
+        h ^= self.h_turno(estado.eventos_azar, estado.turno)
+        for pos, _ in tablero.flores:
+            h ^= self.h_celda(tablero, pos)
+        for pos in tablero.obstaculos:
+            h ^= self.h_celda(tablero, pos)
+        return h
+
+    def firma_parcial(self, estado, celdas=(), abeja=False, clima=False, colmena=False, turno=False):
+        """
+        XOR de los rasgos que una jugada puede modificar.
+        Se calcula antes y después de aplicar la jugada: h' = h ^ antes ^ después.
+        """
+        h = 0
+        for pos in celdas:
+            h ^= self.h_celda(estado.tablero, pos)
+        if abeja:
+            h ^= self.h_abeja(estado.abeja, estado.pos_abeja)
+        if clima:
+            h ^= self.h_clima(estado.eventos_azar.clima_actual)
+        if colmena:
+            h ^= self.h_colmena(estado.tablero.nectar_en_colmena)
+        if turno:
+            h ^= self.h_turno(estado.eventos_azar, estado.turno)
+        return h
+
+
+class TablaTransposicion:
+    """
+    Tabla de transposición acotada indexada por (hash, profundidad_restante, tipo_nodo).
+
+    Política de reemplazo de dos niveles por cubeta:
+        - Ranura 'profunda': conserva la entrada con mayor profundidad restante.
+        - Ranura 'reciente': siempre se sobrescribe.
+    Al desplazar una entrada profunda, ésta pasa a la ranura reciente.
+
+    Cada entrada guarda el tipo de cota del valor (exacto, inferior o superior)
+    para que la búsqueda con poda pueda reutilizar resultados de ventanas parciales.
+    """
+
+    EXACTO = 0
+    INFERIOR = 1
+    SUPERIOR = 2
+
+    def __init__(self, capacidad=1 << 16):
+        self.num_cubetas = max(1, capacidad // 2)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vacía la tabla y pone a cero los contadores."""
+        self._profundas = [None] * self.num_cubetas
+        self._recientes = [None] * self.num_cubetas
+        self.aciertos = 0
+        self.fallos = 0
+        self.reemplazos = 0
+
+    def buscar(self, clave):
+        """Retorna (valor, cota) almacenado para `clave` o None si no está."""
+        indice = clave[0] % self.num_cubetas
+        for ranura in (self._profundas, self._recientes):
+            entrada = ranura[indice]
+            if entrada is not None and entrada[0] == clave:
+                self.aciertos += 1
+                return entrada[1], entrada[2]
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor, cota=EXACTO):
+        indice = clave[0] % self.num_cubetas
+        entrada = (clave, valor, cota)
+        profunda = self._profundas[indice]
+
+        if profunda is None or profunda[0] == clave:
+            self._profundas[indice] = entrada
+        elif clave[1] >= profunda[0][1]:
+            # La nueva entrada es al menos igual de profunda: desplazamos la antigua
+            self._profundas[indice] = entrada
+            self._guardar_reciente(indice, profunda)
+        else:
+            self._guardar_reciente(indice, entrada)
+
+    def _guardar_reciente(self, indice, entrada):
+        anterior = self._recientes[indice]
+        if anterior is not None and anterior[0] != entrada[0]:
+            self.reemplazos += 1
+        self._recientes[indice] = entrada
+
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+    def __len__(self):
+        return sum(1 for e in self._profundas if e is not None) + \
+               sum(1 for e in self._recientes if e is not None)